@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick multi-pattern matcher
+
+Builds one automaton from a list of patterns and reports which of them occur
+in a text with a single left-to-right pass, instead of one substring search
+per pattern.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class AhoCorasick:
+    """Automaton that finds every pattern occurring in a text in one pass
+
+    Matches are reported as indices into the pattern list, so duplicate
+    patterns are each reported. With ``ignore_case`` both patterns and text
+    are compared lowercased, like ``pattern.lower() in text.lower()``.
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.patterns: List[str] = list(patterns)
+        # Node 0 is the root; each node has transitions, a failure link,
+        # the pattern indices ending there and a link to the next node on
+        # its failure chain that has outputs
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        self.output_link: List[int] = [-1]
+        # Empty patterns occur in every text
+        self.always: List[int] = []
+
+        for index, pattern in enumerate(self.patterns):
+            if ignore_case:
+                pattern = pattern.lower()
+            if not pattern:
+                self.always.append(index)
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.output_link.append(-1)
+                node = next_node
+            self.outputs[node].append(index)
+
+        self._build_links()
+
+    def _build_links(self) -> None:
+        """Compute failure and output links breadth-first"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                target = self.fail[child]
+                self.output_link[child] = target if self.outputs[target] else self.output_link[target]
+
+    def find(self, text: str) -> Set[int]:
+        """Return the indices of all patterns occurring in text"""
+        if self.ignore_case:
+            text = text.lower()
+        found = set(self.always)
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        output_link = self.output_link
+        visited = set()
+
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            # Each output chain only needs collecting once per text
+            match = node if outputs[node] else output_link[node]
+            while match > 0 and match not in visited:
+                visited.add(match)
+                found.update(outputs[match])
+                match = output_link[match]
+
+        return found
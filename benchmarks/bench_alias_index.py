@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Alias matching benchmark for IdentifierConnectionsBot
+
+Times find_alias_connections with the n-gram part indexes on synthetic
+identifiers, aliases and ADOT numbers, against the original loop over
+every identifier, alias and alias part. The original is run on a sample of
+identifiers and extrapolated; both must give the same connections on it.
+
+Usage:
+  python benchmarks/bench_alias_index.py                        # 100k identifiers, 10k aliases
+  python benchmarks/bench_alias_index.py -n 20000 --aliases 2000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from synthetic_identifiers import generate, NAME_WORDS  # noqa: E402
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def synthetic_aliases(count, seed):
+    """Three-word names, a few of them using the name words identifiers contain"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 8))) for _ in range(5000)]
+    aliases = []
+    for _ in range(count):
+        words = rng.sample(vocabulary, 3)
+        if rng.random() < 0.002:
+            words[rng.randrange(3)] = rng.choice(NAME_WORDS)
+        aliases.append(" ".join(words))
+    return aliases
+
+
+def legacy_alias_connections(bot, identifiers):
+    """Original find_alias_connections matching, kept as the baseline"""
+    matches = []
+    for identifier in identifiers:
+        for alias in bot.aliases:
+            if any(part.lower() in identifier.lower() for part in alias.split()):
+                matches.append((identifier, alias))
+        for adot in bot.adot_numbers:
+            if "ADOT" in identifier and any(part in identifier for part in adot.split("-")):
+                matches.append((identifier, adot))
+    return matches
+
+
+def match_pairs(connections):
+    return [(c["identifier"], c.get("alias", c.get("adot_number"))) for c in connections]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark n-gram indexed alias matching")
+    parser.add_argument("-n", "--identifiers", type=int, default=100_000, help="Number of identifiers")
+    parser.add_argument("--aliases", type=int, default=10_000, help="Number of trust aliases")
+    parser.add_argument("--adot", type=int, default=1000, help="Number of ADOT numbers")
+    parser.add_argument("--sample", type=int, default=200, help="Identifiers run through the original loop")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = list(generate(args.identifiers, seed=args.seed))
+    bot.aliases = synthetic_aliases(args.aliases, args.seed)
+    bot.adot_numbers = [f"AZC-{rng.randrange(10 ** 6):06d}" for _ in range(args.adot)]
+
+    start = time.perf_counter()
+    connections = bot.find_alias_connections()
+    indexed_time = time.perf_counter() - start
+
+    sample = [ident["identifier"] for ident in rng.sample(bot.identifiers, args.sample)]
+    start = time.perf_counter()
+    legacy = legacy_alias_connections(bot, sample)
+    legacy_time = (time.perf_counter() - start) * len(bot.identifiers) / len(sample)
+
+    indexed = []
+    for identifier in sample:
+        indexed.extend(match_pairs(bot.find_identifier_alias_connections(identifier)))
+
+    print(f"{len(bot.identifiers)} identifiers, {len(bot.aliases)} aliases, {len(bot.adot_numbers)} ADOT numbers")
+    print(f"  {len(connections)} alias connections")
+    print(f"  original loop:  {legacy_time:10.2f}s (extrapolated from {len(sample)} identifiers)")
+    print(f"  n-gram index:   {indexed_time:10.2f}s (including index build)")
+    if indexed != legacy:
+        print("MISMATCH: indexed alias connections differ from the original loop")
+        sys.exit(1)
+    print("  sampled connections match")
+
+
+if __name__ == "__main__":
+    main()
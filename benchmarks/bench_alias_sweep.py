@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+GLEIF alias sweep benchmark
+
+Runs gleif_alias_scan.run_sweep against a synthetic lei-records listing
+with simulated per-request latency, serially and with pages prefetched,
+then sweeps growing listings without latency under tracemalloc to show
+peak memory does not grow with the number of records. Every run must
+write the same number of matches per record swept.
+
+Usage:
+  python benchmarks/bench_alias_sweep.py                  # 50k records, 50 ms per page
+  python benchmarks/bench_alias_sweep.py -n 20k --latency 0.1 --prefetch 16
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gleif_alias_scan import DEFAULT_ALIASES, run_sweep  # noqa: E402
+from gleif_fixture import WORDS, SUFFIXES  # noqa: E402
+from synthetic_identifiers import parse_count  # noqa: E402
+
+# One record in MATCH_EVERY carries an alias in its legal name
+MATCH_EVERY = 997
+
+
+def synthetic_listing(total, latency):
+    """A get() answering lei-records pages of `total` synthetic records"""
+    def get(url, params=None, timeout=None):
+        time.sleep(latency)
+        size, number = int(params["page[size]"]), int(params["page[number]"])
+        records = []
+        for i in range((number - 1) * size, min(number * size, total)):
+            if i % MATCH_EVERY == 0:
+                name = f"{DEFAULT_ALIASES[i % len(DEFAULT_ALIASES)]} {SUFFIXES[i % len(SUFFIXES)]} {i}"
+            else:
+                name = f"{WORDS[i % len(WORDS)]} {WORDS[i // 7 % len(WORDS)]} {SUFFIXES[i % len(SUFFIXES)]} {i}"
+            records.append({"type": "lei-records", "id": f"SYN{i:017d}", "attributes": {
+                "entity": {"legalName": {"name": name}, "legalAddress": {"country": "US"}}}})
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({
+            "meta": {"pagination": {"currentPage": number, "perPage": size, "total": total,
+                                    "lastPage": max((total + size - 1) // size, 1)}},
+            "data": records
+        }).encode("utf-8")
+        return response
+    return get
+
+
+def sweep(tmp, total, latency, prefetch, page_size):
+    results = os.path.join(tmp, "gleif_results.xml")
+    checkpoint = os.path.join(tmp, "checkpoint.json")
+    start = time.perf_counter()
+    stats = run_sweep(synthetic_listing(total, latency), DEFAULT_ALIASES, results, checkpoint,
+                      page_size=page_size, prefetch=prefetch)
+    return stats, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the paginated GLEIF alias sweep")
+    parser.add_argument("-n", "--records", default="50k", help="Records in the timed listing (accepts 50k, 1m)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per page request")
+    parser.add_argument("--prefetch", type=int, default=8, help="Pages in flight for the prefetched sweep")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--memory-sizes", default="20k,200k", help="Listing sizes swept under tracemalloc")
+    args = parser.parse_args()
+
+    total = parse_count(args.records)
+    expected = None
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{total} records, {args.page_size} per page, {args.latency * 1000:.0f} ms per page request")
+        for prefetch in (1, args.prefetch):
+            stats, elapsed = sweep(tmp, total, args.latency, prefetch, args.page_size)
+            print(f"  prefetch {prefetch:3d}: {elapsed:8.2f}s ({stats['records'] / elapsed:,.0f} records/s, "
+                  f"{stats['matches']} matches)")
+            if expected is not None and stats["matches"] != expected:
+                print("MISMATCH: prefetched sweep found different matches")
+                sys.exit(1)
+            expected = stats["matches"]
+
+        print("  peak traced memory:")
+        for size in args.memory_sizes.split(","):
+            count = parse_count(size)
+            tracemalloc.start()
+            stats, elapsed = sweep(tmp, count, 0, args.prefetch, args.page_size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"    {count:9d} records: {peak / 1e6:6.2f} MB ({stats['matches']} matches, "
+                  f"{os.path.getsize(os.path.join(tmp, 'gleif_results.xml')) / 1e3:.0f} KB written)")
+
+
+if __name__ == "__main__":
+    main()
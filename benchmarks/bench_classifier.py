@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Classifier microbenchmark for STORM-BREAKER
+
+Compares identifiers/sec of the original three-pass analysis (one re.match per
+pattern, keyword scan, metadata if/elif chain) against the compiled
+StormBreaker.analyze_many engine, and checks both produce the same output.
+
+Usage:
+  python benchmarks/bench_classifier.py            # 100k identifiers
+  python benchmarks/bench_classifier.py -n 1000000
+"""
+import re
+import sys
+import time
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from storm_breaker import StormBreaker  # noqa: E402
+from synthetic_identifiers import generate  # noqa: E402
+
+def legacy_analyze_identifier(patterns, identifier):
+    """Original StormBreaker.analyze_identifier, kept as the benchmark baseline"""
+    analysis = {
+        'identifier': identifier,
+        'pattern_type': 'unknown',
+        'format_valid': False,
+        'confidence_score': 0.0,
+        'risk_level': 'unknown',
+        'metadata': {},
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    }
+
+    for pattern_name, pattern_regex in patterns.items():
+        if re.match(pattern_regex, identifier):
+            analysis['pattern_type'] = pattern_name
+            analysis['format_valid'] = True
+            analysis['confidence_score'] = 0.95
+            break
+
+    if analysis['format_valid']:
+        if any(keyword in identifier.upper() for keyword in ['SSN', 'BIRTH', 'ADOT']):
+            analysis['risk_level'] = 'medium'
+        else:
+            analysis['risk_level'] = 'low'
+
+    if 'EIN-' in identifier:
+        analysis['metadata']['type'] = 'Employer Identification Number'
+    elif 'SSN-' in identifier:
+        analysis['metadata']['type'] = 'Social Security Number'
+    elif 'IRS-TRACK-' in identifier:
+        analysis['metadata']['type'] = 'IRS Tracking Number'
+    elif 'CSE-CASE-' in identifier:
+        analysis['metadata']['type'] = 'Child Support Enforcement Case'
+    elif 'ADOT-CUST-' in identifier:
+        analysis['metadata']['type'] = 'Arizona DOT Customer ID'
+    elif 'ADDR-' in identifier:
+        analysis['metadata']['type'] = 'Address Record'
+    elif 'ENTITY-' in identifier:
+        analysis['metadata']['type'] = 'Entity Name'
+    elif 'BIRTH-REGISTRY' in identifier:
+        analysis['metadata']['type'] = 'Birth Registry Record'
+    elif 'DEED-DOC' in identifier:
+        analysis['metadata']['type'] = 'Property Deed Document'
+
+    return analysis
+
+
+def strip_timestamps(analyses):
+    return [{k: v for k, v in a.items() if k != 'timestamp'} for a in analyses]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STORM-BREAKER classifier microbenchmark")
+    parser.add_argument('-n', '--count', type=int, default=100_000,
+                        help='Number of identifiers to classify')
+    args = parser.parse_args()
+
+    identifiers = [record['identifier'] for record in generate(args.count)]
+    storm_breaker = StormBreaker()
+
+    start = time.perf_counter()
+    before = [legacy_analyze_identifier(storm_breaker.patterns, i) for i in identifiers]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = storm_breaker.analyze_many(identifiers)
+    compiled_seconds = time.perf_counter() - start
+
+    if strip_timestamps(before) != strip_timestamps(after):
+        print("❌ Compiled classifier output differs from the legacy analysis")
+        return 1
+
+    print(f"Identifiers: {args.count}")
+    print(f"  legacy   : {args.count / legacy_seconds:,.0f} identifiers/sec ({legacy_seconds:.3f}s)")
+    print(f"  compiled : {args.count / compiled_seconds:,.0f} identifiers/sec ({compiled_seconds:.3f}s)")
+    print(f"  speedup  : {legacy_seconds / compiled_seconds:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for STORM-BREAKER result containers
+
+Measures bytes per identifier held by a list of analysis dicts (the default
+run_scan result) and by ColumnarResults (--columnar), using tracemalloc.
+
+Usage:
+  python benchmarks/bench_columnar.py            # 100k identifiers
+  python benchmarks/bench_columnar.py -n 1000000
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storm_breaker import StormBreaker, ColumnarResults  # noqa: E402
+from synthetic_identifiers import generate  # noqa: E402
+
+
+def measure(build):
+    """Return (result, bytes still allocated, seconds) for build()"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STORM-BREAKER result memory benchmark")
+    parser.add_argument('-n', '--count', type=int, default=100_000,
+                        help='Number of identifiers to analyze')
+    args = parser.parse_args()
+
+    identifiers = [record['identifier'] for record in generate(args.count)]
+    storm_breaker = StormBreaker()
+
+    def build_dicts():
+        analyses = storm_breaker.analyze_many(identifiers)
+        for analysis in analyses:
+            analysis['source'] = 'Benchmark'
+        return analyses
+
+    def build_columnar():
+        results = ColumnarResults()
+        for start in range(0, len(identifiers), 4096):
+            for analysis in storm_breaker.analyze_many(identifiers[start:start + 4096]):
+                analysis['source'] = 'Benchmark'
+                results.append(analysis)
+        return results
+
+    # The identifier strings themselves are shared input, not result memory
+    dicts, dict_bytes, dict_seconds = measure(build_dicts)
+    dict_bytes -= sum(sys.getsizeof(i) for i in identifiers)
+    del dicts
+    columnar, columnar_bytes, columnar_seconds = measure(build_columnar)
+
+    print(f"Identifiers: {args.count}")
+    print(f"  list of dicts : {dict_bytes / args.count:7.1f} bytes/identifier ({dict_seconds:.3f}s)")
+    print(f"  columnar      : {columnar_bytes / args.count:7.1f} bytes/identifier ({columnar_seconds:.3f}s)")
+    print(f"  reduction     : {dict_bytes / columnar_bytes:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Connection store benchmark for IdentifierConnectionsBot
+
+Builds cross-identifier and alias connections for synthetic identifier
+groups, writes them both as identifier_connections.json and into a
+temporary ConnectionStore, then times single-node questions (neighbors,
+degree, connection records) answered by loading the JSON file against the
+store's indexed queries. Checks the store agrees with connection_graph.
+
+Usage:
+  python benchmarks/bench_connection_store.py             # 400 per source, ~1M edges
+  python benchmarks/bench_connection_store.py -n 100
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from connection_store import ConnectionStore  # noqa: E402
+from edge_store import dump_json_lazily  # noqa: E402
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from bench_edge_store import synthetic_identifiers  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def json_question(path, node):
+    """Neighbors and connection records for one node from the JSON output"""
+    with open(path) as f:
+        results = json.load(f)
+    neighbors = results["connection_graph"].get(node, [])
+    records = [c for c in results["connections"]
+               if node in (c.get("identifier_1"), c.get("identifier_2"), c.get("identifier"))]
+    return neighbors, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite connection store")
+    parser.add_argument("-n", "--per-source", type=int, default=400, help="Identifiers per source")
+    parser.add_argument("--queries", type=int, default=200, help="Single-node queries against the store")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = synthetic_identifiers(args.per_source)
+    bot.aliases = ["SYN", "Travis Ryle"]
+    bot.connections.extend(bot.find_cross_identifier_connections())
+    bot.connections.extend(bot.find_alias_connections())
+    bot.build_connection_graph()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "identifier_connections.json")
+        _, json_write = timed(lambda: dump_json_lazily(
+            {"connections": bot.connections, "connection_graph": bot.connection_graph},
+            open(json_path, "w")))
+
+        store = ConnectionStore(os.path.join(tmp, "connections.db"))
+        _, store_write = timed(store.save_scan, bot.identifiers, bot.aliases, bot.connections, bot.edge_store)
+        # A second save of the same scan only refreshes last_seen
+        _, store_rewrite = timed(store.save_scan, bot.identifiers, bot.aliases, bot.connections, bot.edge_store)
+        counts = store.stats()
+
+        rng = random.Random(args.seed)
+        nodes = [rng.choice(bot.identifiers)["identifier"] for _ in range(args.queries)]
+
+        (json_neighbors, json_records), json_query = timed(json_question, json_path, nodes[0])
+
+        results, neighbor_time = timed(lambda: [store.neighbors(node) for node in nodes])
+        degrees, degree_time = timed(lambda: [store.degree(node) for node in nodes])
+        records, record_time = timed(lambda: [store.connections_for(node) for node in nodes[:20]])
+
+        for node, neighbors, degree in zip(nodes, results, degrees):
+            expected = bot.connection_graph.get(node, [])
+            if set(neighbors) != set(expected) or degree != len(expected):
+                print(f"MISMATCH: store neighbors of {node} differ from connection_graph")
+                sys.exit(1)
+        if set(json_neighbors) != set(results[0]) or len(json_records) != len(records[0]):
+            print(f"MISMATCH: store answers for {nodes[0]} differ from the JSON output")
+            sys.exit(1)
+        store.close()
+
+    print(f"{len(bot.identifiers)} identifiers, {counts['connections']} connections, {counts['edges']} edges")
+    print(f"  write JSON:              {json_write:8.2f}s")
+    print(f"  write store:             {store_write:8.2f}s  (re-upsert {store_rewrite:.2f}s)")
+    print(f"  one node from JSON:      {json_query * 1000:8.1f}ms")
+    print(f"  store neighbors:         {neighbor_time / len(nodes) * 1000:8.2f}ms per node")
+    print(f"  store degree:            {degree_time / len(nodes) * 1000:8.2f}ms per node")
+    print(f"  store connection records:{record_time / 20 * 1000:8.2f}ms per node")
+    print("  store answers match connection_graph")
+
+
+if __name__ == "__main__":
+    main()
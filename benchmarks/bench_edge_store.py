@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cross-identifier edge benchmark for IdentifierConnectionsBot
+
+Builds the cross-identifier connections, connection graph and metrics for
+synthetic identifier groups twice: with the original one-dict-per-pair
+Cartesian product and set-based graph, and with the bot's EdgeStore. Reports
+peak traced memory and time for each and checks the graph nodes come out in
+the same order with the same degrees, so the most connected identifiers
+agree even when degrees tie. A small input where every group ties is always
+checked as well, including the bot's running metrics read before the graph
+is built. Finally one record per identifier is appended after the products,
+as the Reddit and alias scans do, timing the running degree updates.
+
+Usage:
+  python benchmarks/bench_edge_store.py                 # 300 identifiers per source
+  python benchmarks/bench_edge_store.py -n 1000
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+
+SOURCES = ["EIN", "EntityName", "SSN", "BirthRegNum", "Address", "PropertyRecord",
+           "ADOTCust", "CSECase", "IRSTrack"]
+
+CONNECTION_RULES = [
+    ("EIN", "EntityName", "Entity-Tax_ID_Relationship"),
+    ("SSN", "BirthRegNum", "Person-Birth_Record_Relationship"),
+    ("Address", "PropertyRecord", "Location-Property_Relationship"),
+    ("ADOTCust", "Address", "Customer-Location_Relationship"),
+    ("CSECase", "SSN", "Case-Person_Relationship"),
+    ("IRSTrack", "EIN", "Tax_Tracking-Entity_Relationship")
+]
+
+
+def synthetic_identifiers(per_source):
+    return [{"identifier": f"{source}-SYN-{i}", "source": source}
+            for source in SOURCES for i in range(per_source)]
+
+
+def legacy_cross_graph(identifiers):
+    """Original find_cross_identifier_connections + build_connection_graph, kept as the baseline"""
+    identifier_groups = {}
+    for ident in identifiers:
+        identifier_groups.setdefault(ident.get("source", "Unknown"), []).append(ident["identifier"])
+
+    connections = []
+    for source1, source2, relationship_type in CONNECTION_RULES:
+        if source1 in identifier_groups and source2 in identifier_groups:
+            for ident1 in identifier_groups[source1]:
+                for ident2 in identifier_groups[source2]:
+                    connections.append({
+                        "source": "Cross-Identifier_Analysis",
+                        "identifier_1": ident1,
+                        "identifier_2": ident2,
+                        "relationship_type": relationship_type,
+                        "confidence": "high",
+                        "timestamp": datetime.now(timezone.utc).isoformat()
+                    })
+
+    graph = {}
+    for connection in connections:
+        graph.setdefault(connection["identifier_1"], set()).add(connection["identifier_2"])
+        graph.setdefault(connection["identifier_2"], set()).add(connection["identifier_1"])
+    return len(connections), [(node, len(neighbors)) for node, neighbors in graph.items()]
+
+
+def store_cross_graph(identifiers):
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = identifiers
+    bot.connections.extend(bot.find_cross_identifier_connections())
+    bot.build_connection_graph()
+    return len(bot.connections), bot.edge_store.degrees()
+
+
+def top_five(degrees):
+    """The original most_connected_identifiers: a stable sort by degree over graph order"""
+    return sorted(degrees, key=lambda item: item[1], reverse=True)[:5]
+
+
+def running_top_five(identifiers):
+    """most_connected_identifiers read mid-scan, before build_connection_graph"""
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = identifiers
+    bot.connections.extend(bot.find_cross_identifier_connections())
+    return [(item["identifier"], item["connection_count"])
+            for item in bot.calculate_connection_metrics()["most_connected_identifiers"]]
+
+
+def append_per_identifier(identifiers):
+    """Append a post and an alias match per identifier after the cross-identifier products"""
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = identifiers
+    bot.connections.extend(bot.find_cross_identifier_connections())
+    start = time.perf_counter()
+    for ident in identifiers:
+        bot.connections.append({"source": "Reddit", "identifier": ident["identifier"], "post_title": "post"})
+        bot.connections.append({"source": "Alias_Analysis", "identifier": ident["identifier"],
+                                "alias": "SYNTHETIC TRUST", "match_type": "alias_mention"})
+    elapsed = time.perf_counter() - start
+    store = bot.edge_store
+    expected = [(store.nodes[node], len(store.neighbor_ids(node))) for node in store.graph_node_ids()]
+    return elapsed, store.degrees() == expected
+
+
+def check(legacy, store, label):
+    (legacy_count, legacy_degrees), (store_count, store_degrees) = legacy, store
+    if legacy_count != store_count or legacy_degrees != store_degrees:
+        print(f"MISMATCH: {label}: edge store connections, node order or degrees differ from the cartesian baseline")
+        sys.exit(1)
+    if top_five(legacy_degrees) != top_five(store_degrees):
+        print(f"MISMATCH: {label}: most connected identifiers differ from the cartesian baseline")
+        sys.exit(1)
+
+
+def measure(func, identifiers):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(identifiers)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cross-identifier edge store")
+    parser.add_argument("-n", "--per-source", type=int, default=300, help="Identifiers per source")
+    args = parser.parse_args()
+
+    identifiers = synthetic_identifiers(args.per_source)
+    (legacy_count, legacy_degrees), legacy_time, legacy_peak = measure(legacy_cross_graph, identifiers)
+    (store_count, store_degrees), store_time, store_peak = measure(store_cross_graph, identifiers)
+
+    print(f"{len(identifiers)} identifiers, {legacy_count} cross-identifier connections")
+    print(f"  cartesian:  {legacy_time:8.2f}s  peak {legacy_peak / 1e6:8.1f} MB")
+    print(f"  edge store: {store_time:8.2f}s  peak {store_peak / 1e6:8.1f} MB")
+
+    check((legacy_count, legacy_degrees), (store_count, store_degrees), f"{args.per_source} per source")
+    ties = synthetic_identifiers(3)
+    legacy_ties = legacy_cross_graph(ties)
+    check(legacy_ties, store_cross_graph(ties), "3 per source (tied degrees)")
+    if running_top_five(ties) != top_five(legacy_ties[1]):
+        print("MISMATCH: running metrics' most connected identifiers differ from the cartesian baseline")
+        sys.exit(1)
+    print("  connection counts, node order, degrees and most connected identifiers match")
+
+    elapsed, degrees_match = append_per_identifier(identifiers)
+    print(f"  {2 * len(identifiers)} appended records: {elapsed:8.2f}s")
+    if not degrees_match:
+        print("MISMATCH: degrees after appended records differ from the expanded neighbor counts")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Fetch engine benchmark for IdentifierConnectionsBot
+
+Runs the bot's Reddit and GLEIF lookups against the local stand-in server,
+first one identifier at a time as run_comprehensive_scan originally did and
+then through FetchEngine with GLEIF names batched, and checks both produce
+the same connections.
+
+Usage:
+  python benchmarks/bench_fetch_engine.py                     # 20 identifiers, 0.1s latency
+  python benchmarks/bench_fetch_engine.py -n 50 --latency 0.2 --per-host 8
+  python benchmarks/bench_fetch_engine.py --deadline 0.5      # show deadline handling
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from gleif_batch import DEFAULT_BATCH_SIZE  # noqa: E402
+from synthetic_identifiers import generate  # noqa: E402
+from stand_in_server import start_server, base_url  # noqa: E402
+
+
+def make_bot(url, identifiers, per_host, deadline, cache_path):
+    # A fresh response cache per run so every lookup reaches the server
+    bot = IdentifierConnectionsBot(verbose=False, per_host_limit=per_host, fetch_deadline=deadline,
+                                   response_cache=ResponseCache(path=cache_path), gleif_batch_size=DEFAULT_BATCH_SIZE)
+    bot.reddit_search_url = f"{url}/search.json"
+    bot.gleif_lei_records_url = f"{url}/api/v1/lei-records"
+    bot.identifiers = [{"identifier": i, "source": "synthetic"} for i in identifiers]
+    return bot
+
+
+def strip_volatile(connections):
+    return [{k: v for k, v in c.items() if k != "timestamp"} for c in connections]
+
+
+def serial_lookups(bot):
+    connections = []
+    for ident in bot.identifiers:
+        connections.extend(bot.find_reddit_connections(ident["identifier"]))
+    for ident in bot.identifiers:
+        connections.extend(bot.find_gleif_connections(ident["identifier"]))
+    return connections
+
+
+def concurrent_lookups(bot):
+    connections = []
+    reddit_results, gleif_results = bot.fetch_external_lookups()
+    for ident, fetched in zip(bot.identifiers, reddit_results):
+        connections.extend(bot.find_reddit_connections(ident["identifier"], fetched))
+    for ident, fetched in zip(bot.identifiers, gleif_results):
+        connections.extend(bot.find_gleif_connections(ident["identifier"], fetched))
+    return connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent external lookups")
+    parser.add_argument("-n", "--count", type=int, default=20, help="Number of identifiers")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in server latency in seconds")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument("--deadline", type=float, help="Global deadline for the concurrent run")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic identifier seed")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    url = base_url(server)
+    identifiers = [record["identifier"] for record in generate(args.count, seed=args.seed)]
+
+    cache_dir = tempfile.TemporaryDirectory()
+    bot = make_bot(url, identifiers, args.per_host, None, os.path.join(cache_dir.name, "serial.db"))
+    start = time.perf_counter()
+    serial = serial_lookups(bot)
+    serial_time = time.perf_counter() - start
+    serial_requests = server.requests
+
+    bot = make_bot(url, identifiers, args.per_host, args.deadline, os.path.join(cache_dir.name, "concurrent.db"))
+    start = time.perf_counter()
+    concurrent = concurrent_lookups(bot)
+    concurrent_time = time.perf_counter() - start
+    concurrent_requests = server.requests - serial_requests
+
+    server.shutdown()
+
+    print(f"{args.count} identifiers, {args.latency}s latency, {args.per_host} per host")
+    print(f"  serial:     {serial_time:8.2f}s  ({len(serial)} connections, {serial_requests} requests)")
+    print(f"  concurrent: {concurrent_time:8.2f}s  ({len(concurrent)} connections, {concurrent_requests} requests, "
+          f"GLEIF names batched {bot.gleif_batch_size} per request)")
+    print(f"  speedup:    {serial_time / concurrent_time:8.1f}x")
+
+    if args.deadline is None:
+        if strip_volatile(serial) != strip_volatile(concurrent):
+            print("MISMATCH: concurrent lookups produced different connections")
+            sys.exit(1)
+        print("  connections match")
+
+
+if __name__ == "__main__":
+    main()
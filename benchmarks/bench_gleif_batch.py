@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+GLEIF batch lookup benchmark
+
+Looks up N legal names and N LEIs against the local stand-in server, once
+with one lei-records request per lookup (FetchEngine, per-host limit) and
+once through gleif_batch.GleifBatcher, and reports the requests the server
+actually received for each. The batched run must cost about N / batch size
+requests and hand every lookup the same records as its own request did.
+
+Usage:
+  python benchmarks/bench_gleif_batch.py                  # 1000 names and LEIs, 50 ms latency
+  python benchmarks/bench_gleif_batch.py -n 5k --batch-size 50 --per-host 8
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fetch_engine import FetchEngine  # noqa: E402
+from gleif_batch import FILTERS, HEADERS, GleifBatcher, lookup_key, record_keys  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from stand_in_server import base_url, start_server  # noqa: E402
+from synthetic_identifiers import generate, parse_count  # noqa: E402
+
+
+def per_lookup(api, kind, values, per_host):
+    """Records per lookup key with one request per value"""
+    client = HttpClient(pool_size=per_host)
+    engine = FetchEngine(per_host, get=client.get)
+    requests = [{"url": f"{api}?{FILTERS[kind]}={quote(value, safe='')}", "key": value, "headers": HEADERS}
+                for value in values]
+    found = {}
+    for result in engine.fetch_all(requests):
+        if result["error"] is not None:
+            raise RuntimeError(f"{result['url']}: {result['error']}")
+        result["response"].raise_for_status()
+        key = lookup_key(kind, result["key"])
+        found[key] = [record for record in result["response"].json()["data"] if key in record_keys(kind, record)]
+    client.close()
+    return found
+
+
+def batched(api, kind, values, per_host, batch_size):
+    client = HttpClient(pool_size=per_host)
+    batcher = GleifBatcher(get=client.get, batch_size=batch_size, max_concurrent=per_host, api=api)
+    lookup = batcher.lookup_leis if kind == "lei" else batcher.lookup_names
+    found = {lookup_key(kind, value): future.result() for value, future in lookup(values).items()}
+    batcher.close()
+    client.close()
+    return found, batcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched GLEIF lookups")
+    parser.add_argument("-n", "--count", default="1000", help="Names and LEIs looked up (accepts 5k)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in server latency in seconds")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests for both runs")
+    parser.add_argument("--batch-size", type=int, default=100, help="Values per batched request")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic identifier seed")
+    args = parser.parse_args()
+
+    count = parse_count(args.count)
+    # Comma-free names, so every one can share a batch
+    names = list(dict.fromkeys(record["identifier"].replace(",", " ")
+                               for record in generate(count, seed=args.seed)))
+    leis = [f"BENCH{i:015d}" for i in range(count)]
+
+    server = start_server(latency=args.latency)
+    api = f"{base_url(server)}/api/v1/lei-records"
+    print(f"{count} lookups per kind, {args.latency * 1000:.0f} ms latency, {args.per_host} per host")
+    try:
+        for kind, values in (("name", names), ("lei", leis)):
+            before = server.requests
+            start = time.perf_counter()
+            single = per_lookup(api, kind, values, args.per_host)
+            single_time = time.perf_counter() - start
+            single_requests = server.requests - before
+
+            before = server.requests
+            start = time.perf_counter()
+            grouped, batcher = batched(api, kind, values, args.per_host, args.batch_size)
+            batch_time = time.perf_counter() - start
+            batch_requests = server.requests - before
+
+            print(f"  {kind}:")
+            print(f"    per lookup: {single_time:7.2f}s ({single_requests} requests)")
+            print(f"    batched:    {batch_time:7.2f}s ({batch_requests} requests; {batcher.summary()})")
+            if grouped != single:
+                print(f"MISMATCH: batched {kind} lookups returned different records")
+                sys.exit(1)
+    finally:
+        server.shutdown()
+    print("  records match")
+
+
+if __name__ == "__main__":
+    main()
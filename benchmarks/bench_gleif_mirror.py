@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+GLEIF mirror benchmark
+
+Writes a synthetic golden copy (benchmarks/gleif_fixture.py), streams it
+into a temporary GleifMirror and reports import throughput and peak
+memory, then times indexed lookups (LEI, exact name, name prefix, full
+text, children and API-shaped GETs) against the same lei-records query
+sent to the local stand-in API server over a pooled keep-alive session.
+
+Usage:
+  python benchmarks/bench_gleif_mirror.py                 # 200k entities
+  python benchmarks/bench_gleif_mirror.py -n 20k --latency 0.05 --format csv
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gleif_mirror import GleifMirror  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from gleif_fixture import generate, write_fixture  # noqa: E402
+from stand_in_server import base_url, start_server  # noqa: E402
+from synthetic_identifiers import parse_count  # noqa: E402
+
+API_URL = "https://api.gleif.org/api/v1/lei-records"
+
+
+def per_lookup(func, values):
+    """Average microseconds per call over the values"""
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local GLEIF golden copy mirror")
+    parser.add_argument("-n", "--count", default="200k", help="Number of entities (accepts 10k, 1m)")
+    parser.add_argument("--format", choices=["xml", "csv"], default="xml")
+    parser.add_argument("--lookups", type=int, default=2000, help="Lookups timed per query type")
+    parser.add_argument("--requests", type=int, default=50, help="Stand-in API requests timed")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in API latency in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    count = parse_count(args.count)
+    entities, _ = generate(count, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_fixture(os.path.join(tmp, "golden"), count, args.seed, args.format)
+        size = sum(os.path.getsize(path) for path in paths) / 1e6
+        print(f"{count} entities, {args.format} golden copy ({size:.1f} MB zipped)")
+
+        mirror = GleifMirror(os.path.join(tmp, "mirror.db"))
+        start = time.perf_counter()
+        for path in paths:
+            mirror.import_file(path)
+        elapsed = time.perf_counter() - start
+        stats = mirror.stats()
+        print(f"  import:         {elapsed:8.2f}s ({count / elapsed:,.0f} entities/s, "
+              f"{stats['relationships']} relationships)")
+
+        # Re-import into a fresh mirror to measure the streaming import's peak memory
+        probe = GleifMirror(os.path.join(tmp, "probe.db"))
+        tracemalloc.start()
+        for path in paths:
+            probe.import_file(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        probe.close()
+        print(f"  import peak:    {peak / 1e6:8.1f} MB traced")
+
+        rng = random.Random(args.seed)
+        sample = [entities[rng.randrange(count)] for _ in range(args.lookups)]
+        leis = [e["lei"] for e in sample]
+        names = [e["name"] for e in sample]
+        words = [" ".join(e["name"].split()[:2]) for e in sample]
+        print(f"  lookups (mean over {args.lookups}):")
+        for label, func, values in [
+            ("record(lei)", mirror.record, leis),
+            ("find_by_name", mirror.find_by_name, names),
+            ("name_prefix", mirror.name_prefix, [name[:8] for name in names]),
+            ("search", mirror.search, words),
+            ("children", mirror.children, leis),
+            ("get(legalName)", mirror.get, [f"{API_URL}?filter[entity.legalName]={quote(n)}" for n in names]),
+            ("get(lei)", mirror.get, [f"{API_URL}/{lei}" for lei in leis]),
+        ]:
+            print(f"    {label:16s} {per_lookup(func, values):8.1f} µs")
+
+        server = start_server(latency=args.latency)
+        client = HttpClient()
+        try:
+            url = f"{base_url(server)}/api/v1/lei-records?filter[entity.legalName]="
+            remote = per_lookup(client.get, [url + quote(name) for name in names[:args.requests]])
+        finally:
+            client.close()
+            server.shutdown()
+        local = per_lookup(mirror.get, [f"{API_URL}?filter[entity.legalName]={quote(n)}"
+                                        for n in names[:args.requests]])
+        print(f"  stand-in API ({args.latency * 1000:.0f} ms latency): {remote / 1000:8.2f} ms per lookup, "
+              f"mirror {local / 1000:.3f} ms ({remote / local:,.0f}x)")
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+CSR graph engine benchmark
+
+Builds a synthetic undirected graph (1M edges by default) both as the
+dict-of-sets connection_graph the bot used to build and as a CSRGraph,
+then times neighbor lookups, 2-hop expansion, BFS shortest paths and
+connected components on each. Reports build time, retained memory and
+checks both structures give the same answers. It also checks the bot's
+exported connection_graph JSON against the original dict-of-sets export
+for a scan where every degree ties: keys in the same order with the same
+neighbors. Row order is not compared; the original rows were unordered
+sets.
+
+Usage:
+  python benchmarks/bench_graph_engine.py                    # 1M edges over 200k nodes
+  python benchmarks/bench_graph_engine.py --edges 100000 --nodes 50000
+"""
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edge_store import dump_json_lazily  # noqa: E402
+from graph_engine import CSRGraph  # noqa: E402
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+
+
+def synthetic_pairs(edges, nodes, seed):
+    rng = random.Random(seed)
+    return [(f"ID-{rng.randrange(nodes)}", f"ID-{rng.randrange(nodes)}") for _ in range(edges)]
+
+
+def build_dict_of_sets(pairs):
+    """Original build_connection_graph structure, kept as the baseline"""
+    graph = {}
+    for a, b in pairs:
+        graph.setdefault(a, set()).add(b)
+        graph.setdefault(b, set()).add(a)
+    return graph
+
+
+def dict_k_hop(graph, start, k):
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        u = queue.popleft()
+        if seen[u] >= k:
+            continue
+        for v in graph.get(u, ()):
+            if v not in seen:
+                seen[v] = seen[u] + 1
+                queue.append(v)
+    return set(seen) - {start}
+
+
+def dict_path_length(graph, source, target):
+    seen = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if u == target:
+            return seen[u]
+        for v in graph.get(u, ()):
+            if v not in seen:
+                seen[v] = seen[u] + 1
+                queue.append(v)
+    return None
+
+
+def dict_components(graph):
+    seen = set()
+    sizes = []
+    for start in graph:
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        size = 0
+        while queue:
+            u = queue.popleft()
+            size += 1
+            for v in graph[u]:
+                if v not in seen:
+                    seen.add(v)
+                    queue.append(v)
+        sizes.append(size)
+    return sorted(sizes, reverse=True)
+
+
+def legacy_export(connections):
+    """Original build_connection_graph and connection_graph export, kept as the baseline"""
+    graph = {}
+    for connection in connections:
+        if "identifier_1" in connection and "identifier_2" in connection:
+            graph.setdefault(connection["identifier_1"], set()).add(connection["identifier_2"])
+            graph.setdefault(connection["identifier_2"], set()).add(connection["identifier_1"])
+        elif "identifier" in connection:
+            graph.setdefault(connection["identifier"], set())
+            if "alias" in connection:
+                graph[connection["identifier"]].add(connection["alias"])
+    return {node: list(neighbors) for node, neighbors in graph.items()}
+
+
+def check_export(per_source=3):
+    """The bot's exported connection_graph against the original, with every degree tied"""
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = [{"identifier": f"{source}-SYN-{i}", "source": source}
+                       for source in ("IRSTrack", "EIN", "EntityName", "SSN", "BirthRegNum") for i in range(per_source)]
+    bot.load_connection_rules()
+    bot.connections.extend(bot.find_cross_identifier_connections())
+    for i in range(per_source):
+        bot.connections.append({"source": "Alias_Analysis", "identifier": f"SSN-SYN-{i}",
+                                "alias": "SYN ALIAS", "match_type": "name_component"})
+    bot.connections.append({"source": "ADOT_Reference", "identifier": "ADOT-SYN-0"})
+    bot.build_connection_graph()
+
+    buffer = io.StringIO()
+    dump_json_lazily({"connection_graph": bot.connection_graph}, buffer)
+    exported = json.loads(buffer.getvalue())["connection_graph"]
+    expected = legacy_export(list(bot.connections))
+    return list(exported) == list(expected) and all(set(exported[n]) == set(expected[n]) for n in expected)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def built(build, pairs):
+    # Time an untraced build, then rebuild under tracemalloc for retained size
+    graph, elapsed = timed(build, pairs)
+    tracemalloc.start()
+    traced = build(pairs)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    return graph, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSRGraph against dict-of-sets")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Number of synthetic edges")
+    parser.add_argument("--nodes", type=int, default=200_000, help="Number of distinct nodes")
+    parser.add_argument("--queries", type=int, default=200, help="Neighbor/k-hop/path queries")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    pairs = synthetic_pairs(args.edges, args.nodes, args.seed)
+    rng = random.Random(args.seed + 1)
+    sample = [pairs[rng.randrange(len(pairs))][0] for _ in range(args.queries)]
+    targets = [pairs[rng.randrange(len(pairs))][1] for _ in range(args.queries)]
+
+    legacy, legacy_build, legacy_bytes = built(build_dict_of_sets, pairs)
+    csr, csr_build, csr_bytes = built(CSRGraph.from_pairs, pairs)
+
+    rows = []
+    legacy_neighbors, t1 = timed(lambda: [legacy[n] for n in sample])
+    csr_neighbors, t2 = timed(lambda: [csr[n] for n in sample])
+    rows.append(("neighbor lookup", t1, t2))
+    assert all(a == set(b) and len(b) == len(a) for a, b in zip(legacy_neighbors, csr_neighbors))
+
+    legacy_hops, t1 = timed(lambda: [dict_k_hop(legacy, n, 2) for n in sample[:20]])
+    csr_hops, t2 = timed(lambda: [csr.k_hop(n, 2) for n in sample[:20]])
+    rows.append(("2-hop expansion x20", t1, t2))
+    assert all(a == set(b) for a, b in zip(legacy_hops, csr_hops))
+
+    legacy_paths, t1 = timed(lambda: [dict_path_length(legacy, s, t) for s, t in zip(sample[:20], targets)])
+    csr_paths, t2 = timed(lambda: [csr.shortest_path(s, t) for s, t in zip(sample[:20], targets)])
+    rows.append(("shortest path x20", t1, t2))
+    assert legacy_paths == [len(p) - 1 if p else None for p in csr_paths]
+
+    legacy_sizes, t1 = timed(dict_components, legacy)
+    csr_components, t2 = timed(csr.connected_components)
+    rows.append(("connected components", t1, t2))
+    assert legacy_sizes == [len(c) for c in csr_components]
+
+    print(f"{args.edges} edges over {len(csr)} nodes")
+    print(f"  {'':<22}{'dict-of-sets':>14}{'CSR':>14}")
+    print(f"  {'build':<22}{legacy_build:>13.2f}s{csr_build:>13.2f}s")
+    print(f"  {'retained memory':<22}{legacy_bytes / 1e6:>12.1f}MB{csr_bytes / 1e6:>12.1f}MB")
+    for name, t1, t2 in rows:
+        print(f"  {name:<22}{t1:>13.3f}s{t2:>13.3f}s")
+    print("  results match")
+
+    if not check_export():
+        print("MISMATCH: exported connection_graph differs from the original dict-of-sets export")
+        sys.exit(1)
+    print("  exported connection_graph matches the original (tied degrees)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+HTTP client benchmark against the keep-alive stand-in server
+
+Issues the same GLEIF and Reddit lookups with bare requests.get, as the
+scanners originally did, and through the pooled HttpClient, then reports
+how many connections the server accepted and p50/p99 request latency.
+
+Usage:
+  python benchmarks/bench_http_client.py                      # 200 requests, no added latency
+  python benchmarks/bench_http_client.py -n 1000 --latency 0.01
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_client import HttpClient, percentile  # noqa: E402
+from stand_in_server import start_server, base_url  # noqa: E402
+
+
+def lookup_urls(url, count):
+    urls = []
+    for i in range(count):
+        if i % 2:
+            urls.append(f"{url}/search.json?q=ID-{i}&limit=20")
+        else:
+            urls.append(f"{url}/api/v1/lei-records?filter[entity.legalName]=ID-{i}")
+    return urls
+
+
+def run(server, urls, get):
+    with server.lock:
+        server.connections = 0
+    latencies = []
+    for url in urls:
+        start = time.perf_counter()
+        response = get(url, timeout=10)
+        response.content
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return server.connections, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled HTTP client vs bare requests.get")
+    parser.add_argument("-n", "--count", type=int, default=200, help="Number of requests")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in server latency in seconds")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    urls = lookup_urls(base_url(server), args.count)
+
+    client = HttpClient()
+    results = {
+        "requests.get": run(server, urls, requests.get),
+        "HttpClient": run(server, urls, client.get)
+    }
+    client.close()
+    server.shutdown()
+
+    print(f"{args.count} requests, {args.latency}s server latency")
+    print(f"  {'client':<14}{'connections':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, (connections, p50, p99) in results.items():
+        print(f"  {name:<14}{connections:>12}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Incremental scan benchmark for IdentifierConnectionsBot
+
+Runs full scans against the local stand-in server to seed a scan snapshot,
+then adds one identifier and removes another and times incremental runs
+against full rescans of the same inputs. Reports the lookups each run sent
+and checks incremental and full runs produce the same connections (up to
+timestamps).
+
+Usage:
+  python benchmarks/bench_incremental_scan.py                 # 2000 identifiers, 0.01s latency
+  python benchmarks/bench_incremental_scan.py -n 500 --latency 0.05
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from edge_store import dump_json_lazily  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from scan_snapshot import ScanSnapshot  # noqa: E402
+from stand_in_server import start_server, base_url  # noqa: E402
+
+SOURCES = ["EIN", "SSN", "ADOTCust", "Address"]
+
+
+def make_bot(url, identifiers, per_host, tmp):
+    # A response cache that never serves fresh hits, so every lookup reaches the server
+    cache = ResponseCache(path=os.path.join(tmp, f"cache-{time.perf_counter_ns()}.db"), default_ttl=0,
+                          ttls={url.split("//", 1)[1]: 0})
+    bot = IdentifierConnectionsBot(verbose=False, per_host_limit=per_host, response_cache=cache)
+    bot.reddit_search_url = f"{url}/search.json"
+    bot.gleif_lei_records_url = f"{url}/api/v1/lei-records"
+    bot.load_identifiers = lambda: setattr(bot, "identifiers", list(identifiers))
+    bot.load_aliases = lambda: (setattr(bot, "aliases", ["SYN TRUST"]),
+                                setattr(bot, "adot_numbers", ["ADOT-7"]))
+    return bot
+
+
+def scan(url, identifiers, per_host, tmp, snapshot=None):
+    bot = make_bot(url, identifiers, per_host, tmp)
+    start = time.perf_counter()
+    results = bot.run_comprehensive_scan(snapshot=snapshot)
+    if snapshot is not None:
+        snapshot.commit(bot.checkpoint)
+    elapsed = time.perf_counter() - start
+
+    buf = io.StringIO()
+    dump_json_lazily(results["connections"], buf)
+    connections = [{k: v for k, v in c.items() if k != "timestamp"} for c in json.loads(buf.getvalue())]
+    return connections, elapsed, bot.response_cache.stats()["network_requests"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental connection discovery")
+    parser.add_argument("-n", "--identifiers", type=int, default=2000, help="Identifiers in the base set")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stand-in server latency in seconds")
+    parser.add_argument("--per-host", type=int, default=8, help="Concurrent requests per host")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    url = base_url(server)
+    base = [{"identifier": f"{SOURCES[i % len(SOURCES)]}-SYN-{i}", "source": SOURCES[i % len(SOURCES)]}
+            for i in range(args.identifiers)]
+    added = base + [{"identifier": "EIN-SYN-NEW", "source": "EIN"}]
+    # EIN-SYN-4 is mentioned in the posts found for EIN-SYN-40 and friends
+    removed = [ident for ident in added if ident["identifier"] != "EIN-SYN-4"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = ScanSnapshot(os.path.join(tmp, "snapshot.db"))
+        _, seed_time, seed_requests = scan(url, base, args.per_host, tmp, snapshot)
+        print(f"{len(base)} identifiers, seeding snapshot: {seed_time:.2f}s, {seed_requests} lookups")
+
+        for label, identifiers in (("add one identifier", added), ("remove one identifier", removed)):
+            full, full_time, full_requests = scan(url, identifiers, args.per_host, tmp)
+            incremental, inc_time, inc_requests = scan(url, identifiers, args.per_host, tmp, snapshot)
+            print(f"  {label}:")
+            print(f"    full scan:        {full_time:8.2f}s  {full_requests:6d} lookups")
+            print(f"    incremental scan: {inc_time:8.2f}s  {inc_requests:6d} lookups  ({snapshot.summary()})")
+            if incremental != full:
+                print("MISMATCH: incremental connections differ from a full scan")
+                sys.exit(1)
+        snapshot.close()
+
+    server.shutdown()
+    print("  incremental and full scans match")
+
+
+if __name__ == "__main__":
+    main()
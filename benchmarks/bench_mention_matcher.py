@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Mention matcher benchmark for IdentifierConnectionsBot
+
+Compares the original per-identifier/per-alias substring loops used by
+find_reddit_connections with the Aho-Corasick matchers behind
+IdentifierConnectionsBot.find_mentions on a synthetic post corpus, and checks
+both report the same mentions.
+
+Usage:
+  python benchmarks/bench_mention_matcher.py                  # 10k identifiers, 200 posts
+  python benchmarks/bench_mention_matcher.py -n 50000 --posts 1000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from synthetic_identifiers import generate  # noqa: E402
+
+FILLER = ("trust records estate registry filing county notice bank private review "
+          "surveillance report vehicle policy claim court hearing").split()
+
+
+def legacy_find_mentions(bot, identifier, title, selftext):
+    """Original find_reddit_connections matching loops, kept as the baseline"""
+    mentioned_identifiers = []
+    for other_ident in bot.identifiers:
+        other_id = other_ident["identifier"]
+        if other_id != identifier and (other_id in title or other_id in selftext):
+            mentioned_identifiers.append(other_id)
+
+    mentioned_aliases = []
+    for alias in bot.aliases:
+        if alias.lower() in title.lower() or alias.lower() in selftext.lower():
+            mentioned_aliases.append(alias)
+
+    return mentioned_identifiers, mentioned_aliases
+
+
+def build_posts(rng, identifiers, aliases, count, words):
+    """Posts of filler text that mention a few identifiers and aliases"""
+    posts = []
+    for _ in range(count):
+        body = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 3)):
+            body.insert(rng.randrange(len(body)), rng.choice(identifiers))
+        if rng.random() < 0.5:
+            body.insert(rng.randrange(len(body)), rng.choice(aliases).lower())
+        title = " ".join(rng.choice(FILLER) for _ in range(8))
+        posts.append((title, " ".join(body)))
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mention matcher benchmark")
+    parser.add_argument('-n', '--identifiers', type=int, default=10_000,
+                        help='Number of identifiers')
+    parser.add_argument('--aliases', type=int, default=500, help='Number of aliases')
+    parser.add_argument('--posts', type=int, default=200, help='Number of posts')
+    parser.add_argument('--words', type=int, default=300, help='Words per post body')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    bot = IdentifierConnectionsBot(verbose=False)
+    bot.identifiers = list(generate(args.identifiers))
+    bot.aliases = [f"TRAVIS RYLE TRUST {i}" for i in range(args.aliases)]
+    identifiers = [ident["identifier"] for ident in bot.identifiers]
+    posts = build_posts(rng, identifiers, bot.aliases, args.posts, args.words)
+    queried = identifiers[0]
+
+    start = time.perf_counter()
+    expected = [legacy_find_mentions(bot, queried, title, body) for title, body in posts]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bot.build_mention_matchers()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [bot.find_mentions(queried, title, body) for title, body in posts]
+    matcher_seconds = time.perf_counter() - start
+
+    if actual != expected:
+        print("❌ Matcher results differ from the original loops")
+        return 1
+
+    print(f"Identifiers: {args.identifiers}, aliases: {args.aliases}, posts: {args.posts}")
+    print(f"  substring loops : {legacy_seconds:.3f}s ({legacy_seconds / args.posts * 1000:.2f} ms/post)")
+    print(f"  matcher build   : {build_seconds:.3f}s (once per scan)")
+    print(f"  matcher scan    : {matcher_seconds:.3f}s ({matcher_seconds / args.posts * 1000:.2f} ms/post)")
+    print(f"  speedup per scan: {legacy_seconds / matcher_seconds:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Ownership tree traversal benchmark
+
+Generates one synthetic corporate group (benchmarks/gleif_fixture.py
+--hierarchy, 100k entities by default, with a few injected ownership
+cycles), imports it into a temporary GleifMirror and serves it from the
+stand-in server as a fake GLEIF API with simulated latency. The traversal
+from the group's top entity is timed with one request at a time and with
+a per-host limit, checked against a BFS over the generated rows, and
+repeated to show memoized expansions cost no requests. A traversal of the
+whole group through the mirror directly must reach every entity and
+report every injected cycle.
+
+Usage:
+  python benchmarks/bench_ownership_tree.py                 # 100k entities, depth 2 over HTTP
+  python benchmarks/bench_ownership_tree.py -n 20k --depth 4 --latency 0.01 --per-host 32
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gleif_mirror import GleifMirror  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from ownership_tree import DEFAULT_RELATIONS, OwnershipTraversal  # noqa: E402
+from gleif_fixture import generate_hierarchy, write_records  # noqa: E402
+from stand_in_server import base_url, start_server  # noqa: E402
+from synthetic_identifiers import parse_count  # noqa: E402
+
+
+def expected_nodes(entities, relationships, root, depth):
+    """LEIs within `depth` hops of root over the default relations, by plain BFS"""
+    neighbors = {}
+    for child, parent, kind in relationships:
+        neighbors.setdefault(child, set()).add(parent)
+        if kind == "IS_DIRECTLY_CONSOLIDATED_BY":
+            neighbors.setdefault(parent, set()).add(child)
+    seen, frontier = {root}, [root]
+    for _ in range(depth):
+        frontier = [other for lei in frontier for other in neighbors.get(lei, ()) if other not in seen
+                    and not seen.add(other)]
+    return seen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark breadth-first GLEIF ownership traversal")
+    parser.add_argument("-n", "--count", default="100k", help="Entities in the corporate group (accepts 100k, 1m)")
+    parser.add_argument("--depth", type=int, default=2, help="Levels traversed over HTTP")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake GLEIF server latency in seconds")
+    parser.add_argument("--per-host", type=int, default=16, help="Concurrent requests for the parallel run")
+    parser.add_argument("--cycles", type=int, default=3, help="Ownership cycles injected into the group")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    count = parse_count(args.count)
+    entities, relationships = generate_hierarchy(count, args.seed, cycles=args.cycles)
+    root = entities[0]["lei"]
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = GleifMirror(os.path.join(tmp, "mirror.db"))
+        start = time.perf_counter()
+        for kind in ("lei2", "rr"):
+            path = os.path.join(tmp, f"golden-copy-{kind}.csv")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                write_records(f, "csv", kind, entities, relationships)
+            mirror.import_file(path)
+        print(f"{count} entities, {len(relationships)} relationships imported in "
+              f"{time.perf_counter() - start:.1f}s")
+
+        expected = expected_nodes(entities, relationships, root, args.depth)
+        server = start_server(latency=args.latency, gleif_mirror=mirror)
+        api = f"{base_url(server)}/api/v1/lei-records"
+        print(f"  fake GLEIF server, {args.latency * 1000:.0f} ms latency, depth {args.depth} from the top entity:")
+        try:
+            for per_host in (1, args.per_host):
+                client = HttpClient(pool_size=max(per_host, 1))
+                traversal = OwnershipTraversal(get=client.get, per_host_limit=per_host, api=api)
+                start = time.perf_counter()
+                tree = traversal.traverse([root], args.depth)
+                elapsed = time.perf_counter() - start
+                stats = tree["stats"]
+                print(f"    per-host {per_host:3d}: {elapsed:7.2f}s ({stats['nodes']} nodes, {stats['edges']} edges, "
+                      f"{stats['requests']} requests, {len(tree['errors'])} errors)")
+                if set(tree["nodes"]) != expected:
+                    print("MISMATCH: traversal nodes differ from a BFS over the generated rows")
+                    sys.exit(1)
+                start = time.perf_counter()
+                again = traversal.traverse([root], args.depth)
+                print(f"      repeated: {time.perf_counter() - start:7.2f}s ({again['stats']['requests']} requests)")
+                client.close()
+        finally:
+            server.shutdown()
+
+        traversal = OwnershipTraversal(get=mirror.get, per_host_limit=args.per_host,
+                                       relations=DEFAULT_RELATIONS)
+        start = time.perf_counter()
+        tree = traversal.traverse([root], count)
+        elapsed = time.perf_counter() - start
+        print(f"  whole group through the mirror: {elapsed:.1f}s, {tree['stats']['nodes']} of {count} nodes, "
+              f"{len(tree['cycles'])} cycles, {tree['stats']['requests']} requests")
+        if tree["stats"]["nodes"] != count or len(tree["cycles"]) < min(args.cycles, 1):
+            print("MISMATCH: the full traversal missed entities or cycles")
+            sys.exit(1)
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Query planner benchmark for IdentifierConnectionsBot
+
+Runs the bot's comprehensive scan of the repo's identifiers.json against the
+local stand-in server, looking every identifier up in every source and then
+routing each only to the sources its type can match (query_planner.py).
+Reports the requests the server received, with GLEIF names sent one per
+request and batched.
+
+Usage:
+  python benchmarks/bench_query_planner.py                 # 0.1s latency
+  python benchmarks/bench_query_planner.py --latency 0.5 --per-host 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gleif_batch import DEFAULT_BATCH_SIZE  # noqa: E402
+from identifier_connections_bot import IdentifierConnectionsBot  # noqa: E402
+from query_planner import QueryPlanner  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from scan_checkpoint import ScanCheckpoint  # noqa: E402
+from stand_in_server import base_url, start_server  # noqa: E402
+
+
+def scan(server, planner, batch_size, per_host, cache_path):
+    # A fresh response cache per run so every lookup reaches the server
+    bot = IdentifierConnectionsBot(verbose=False, per_host_limit=per_host, gleif_batch_size=batch_size,
+                                   response_cache=ResponseCache(path=cache_path), query_planner=planner)
+    bot.reddit_search_url = f"{base_url(server)}/search.json"
+    bot.gleif_lei_records_url = f"{base_url(server)}/api/v1/lei-records"
+    before = server.requests
+    start = time.perf_counter()
+    results = bot.run_comprehensive_scan(ScanCheckpoint(path=None))
+    return results, time.perf_counter() - start, server.requests - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark classification-aware lookup planning")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in server latency in seconds")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    planner = QueryPlanner()
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in (1, DEFAULT_BATCH_SIZE):
+            print(f"GLEIF batch size {batch_size}, {args.latency}s latency, {args.per_host} per host")
+            for label, run_planner in (("every source", None), ("planned", planner)):
+                cache_path = os.path.join(tmp, f"{batch_size}-{label}.db")
+                results, elapsed, requests = scan(server, run_planner, batch_size, args.per_host, cache_path)
+                sources = results["metrics"]["connection_sources"]
+                print(f"  {label:12s}: {elapsed:6.2f}s, {requests:3d} requests "
+                      f"({sources.get('Reddit', 0)} Reddit, {sources.get('GLEIF', 0)} GLEIF connections)")
+                plan = results["scan_metadata"]["query_plan"]
+                if plan is not None:
+                    print(f"                {plan['requests_avoided']} lookups avoided: {plan['avoided']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
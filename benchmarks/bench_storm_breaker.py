@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+STORM-BREAKER benchmark suite
+
+Runs analyze_identifier, run_scan and save_results against synthetic identifier
+sets (see synthetic_identifiers.py) and reports throughput, latency per 1k
+identifiers, peak memory and overlay write time. Each case runs in a fresh
+child process inside a scratch directory, so peak RSS is per case and overlay
+files never touch the repository.
+
+Usage:
+  python benchmarks/bench_storm_breaker.py                      # 1k,10k,100k
+  python benchmarks/bench_storm_breaker.py --sizes 1k,1m,10m --cases run_scan
+  python benchmarks/bench_storm_breaker.py --save-baseline      # re-record storm_breaker_baseline.json
+  python benchmarks/bench_storm_breaker.py --compare            # fail on regressions
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from storm_breaker import StormBreaker  # noqa: E402
+from synthetic_identifiers import generate, parse_count, write_file  # noqa: E402
+
+CASES = ['analyze_identifier', 'analyze_many', 'run_scan', 'save_results']
+DEFAULT_SIZES = '1k,10k,100k'
+DEFAULT_BASELINE = BENCH_DIR / 'storm_breaker_baseline.json'
+
+# Relative throughput drop / memory growth tolerated by --compare
+DEFAULT_TOLERANCE = 0.20
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (ru_maxrss is KiB on Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case: str, size: int, seed: int) -> Dict[str, Any]:
+    """Run one benchmark case in the current process and return its metrics"""
+    storm_breaker = StormBreaker()
+    overlay_seconds = 0.0
+
+    if case in ('analyze_identifier', 'analyze_many'):
+        identifiers = [record['identifier'] for record in generate(size, seed)]
+        start = time.perf_counter()
+        if case == 'analyze_identifier':
+            for identifier in identifiers:
+                storm_breaker.analyze_identifier(identifier)
+        else:
+            storm_breaker.analyze_many(identifiers)
+        seconds = time.perf_counter() - start
+    else:
+        write_file('identifiers.json', size, seed, fmt='json')
+
+        # Time overlay writes separately from classification
+        save_overlay = storm_breaker.save_overlay
+
+        def timed_save_overlay(identifier, analysis):
+            nonlocal overlay_seconds
+            overlay_start = time.perf_counter()
+            written = save_overlay(identifier, analysis)
+            overlay_seconds += time.perf_counter() - overlay_start
+            return written
+
+        storm_breaker.save_overlay = timed_save_overlay
+
+        start = time.perf_counter()
+        storm_breaker.run_scan('identifiers.json')
+        seconds = time.perf_counter() - start
+
+        if case == 'save_results':
+            start = time.perf_counter()
+            storm_breaker.save_results('bench_results.json')
+            seconds = time.perf_counter() - start
+
+    return {
+        'case': case,
+        'size': size,
+        'seconds': round(seconds, 6),
+        'identifiers_per_sec': round(size / seconds, 1) if seconds else None,
+        'ms_per_1k': round(seconds / size * 1000 * 1000, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'overlay_write_seconds': round(overlay_seconds, 6) if case == 'run_scan' else None
+    }
+
+
+def run_in_child(case: str, size: int, seed: int) -> Dict[str, Any]:
+    """Run a case in a fresh interpreter inside a scratch directory"""
+    with tempfile.TemporaryDirectory(prefix='storm_breaker_bench_') as scratch:
+        completed = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--child', case, str(size), '--seed', str(seed)],
+            cwd=scratch, capture_output=True, text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{case} @ {size} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return regression messages for results that fall outside the tolerance"""
+    previous = {(entry['case'], entry['size']): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        base = previous.get((entry['case'], entry['size']))
+        if not base:
+            continue
+        if base['identifiers_per_sec'] and entry['identifiers_per_sec'] < base['identifiers_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{entry['case']} @ {entry['size']}: throughput {entry['identifiers_per_sec']:,.0f}/s "
+                f"vs baseline {base['identifiers_per_sec']:,.0f}/s"
+            )
+        if entry['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{entry['case']} @ {entry['size']}: peak memory {entry['peak_rss_mb']} MiB "
+                f"vs baseline {base['peak_rss_mb']} MiB"
+            )
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'case':<20}{'size':>10}{'ids/sec':>14}{'ms/1k':>10}{'peak MiB':>10}{'overlay s':>11}")
+    for entry in results:
+        overlay = entry['overlay_write_seconds']
+        print(f"{entry['case']:<20}{entry['size']:>10}{entry['identifiers_per_sec']:>14,.0f}"
+              f"{entry['ms_per_1k']:>10.2f}{entry['peak_rss_mb']:>10.1f}"
+              f"{'' if overlay is None else f'{overlay:.3f}':>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STORM-BREAKER benchmark suite")
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES,
+                        help='Comma-separated identifier counts, 1k up to 10m')
+    parser.add_argument('--cases', type=str, default=','.join(CASES),
+                        help=f"Comma-separated cases from: {', '.join(CASES)}")
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Runs per case; the fastest run is reported')
+    parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE),
+                        help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='Compare against the baseline and exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative regression for --compare')
+    parser.add_argument('--child', nargs=2, metavar=('CASE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child[0], int(args.child[1]), args.seed)))
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    sizes = [parse_count(size) for size in args.sizes.split(',') if size.strip()]
+
+    results = []
+    for size in sizes:
+        for case in cases:
+            print(f"Running {case} @ {size}...", file=sys.stderr)
+            runs = [run_in_child(case, size, args.seed) for _ in range(max(1, args.repeat))]
+            results.append(min(runs, key=lambda entry: entry['seconds']))
+
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nNo regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Synthetic GLEIF golden copy files for gleif_mirror benchmarks
+
+Writes deterministic LEI-CDF (entities) and RR-CDF (relationships) files
+shaped like the GLEIF bulk downloads, as XML or CSV and optionally zipped.
+LEIs carry valid ISO 17442 check digits; about a third of the entities
+have a direct parent among the earlier ones, forming ownership trees with
+ultimate parents, and a few names use the trust alias words. --hierarchy
+instead makes every entity part of one corporate group.
+
+Usage:
+  python benchmarks/gleif_fixture.py -n 100k -o output/gleif_fixture
+  python benchmarks/gleif_fixture.py -n 10k -o output/gleif_fixture --format csv --no-zip
+  python benchmarks/gleif_fixture.py -n 100k -o output/gleif_hierarchy --hierarchy
+"""
+import io
+import os
+import csv
+import sys
+import random
+import zipfile
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_identifiers import NAME_WORDS, parse_count  # noqa: E402
+
+LEI_NAMESPACE = "http://www.gleif.org/data/schema/leidata/2016"
+RR_NAMESPACE = "http://www.gleif.org/data/schema/rr/2016"
+ALPHANUMERIC = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+WORDS = ["ATLAS", "BOREAL", "CASCADE", "DELTA", "EMBER", "FJORD", "GRANITE", "HARBOR", "IRON", "JUNIPER",
+         "KESTREL", "LUMEN", "MERIDIAN", "NORTHWIND", "ORCHARD", "PINNACLE", "QUARRY", "RIVERSTONE",
+         "SUMMIT", "TIMBER", "UNION", "VANTAGE", "WILLOW", "ZENITH", "ÉTOILE", "MÜNCHEN"]
+SUFFIXES = ["HOLDINGS LLC", "INC.", "CAPITAL LP", "S.À R.L.", "GMBH", "TRUST COMPANY", "BANK N.A.", "LIMITED"]
+JURISDICTIONS = [("US-DE", "US"), ("US-GA", "US"), ("US-AZ", "US"), ("LU", "LU"), ("DE", "DE"), ("GB", "GB")]
+
+
+def lei_code(rng: random.Random) -> str:
+    """A random LEI with valid ISO 17442 (ISO 7064 MOD 97-10) check digits"""
+    base = "".join(rng.choice(ALPHANUMERIC) for _ in range(18))
+    number = int("".join(str(ALPHANUMERIC.index(c)) for c in base + "00"))
+    return f"{base}{98 - number % 97:02d}"
+
+
+def make_entity(rng: random.Random, n: int) -> Dict[str, Any]:
+    if rng.random() < 0.001:
+        words = rng.sample(NAME_WORDS, 3)
+    else:
+        words = rng.sample(WORDS, 2)
+    jurisdiction, country = rng.choice(JURISDICTIONS)
+    return {
+        "lei": lei_code(rng),
+        "name": f"{' '.join(words)} {rng.choice(SUFFIXES)} {n}",
+        "jurisdiction": jurisdiction,
+        "country": country,
+        "status": "ACTIVE" if rng.random() < 0.95 else "INACTIVE",
+        "legal_form": "".join(rng.choice(ALPHANUMERIC[10:]) for _ in range(4)),
+    }
+
+
+def generate(count: int, seed: int = 0) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str, str]]]:
+    """Entities and (child LEI, parent LEI, relationship type) rows"""
+    rng = random.Random(seed)
+    entities, relationships, roots = [], [], []
+    for n in range(count):
+        entity = make_entity(rng, n)
+        root = n
+        if entities and rng.random() < 0.35:
+            parent = rng.randrange(max(0, n - 1000), n)
+            root = roots[parent]
+            relationships.append((entity["lei"], entities[parent]["lei"], "IS_DIRECTLY_CONSOLIDATED_BY"))
+            relationships.append((entity["lei"], entities[root]["lei"], "IS_ULTIMATELY_CONSOLIDATED_BY"))
+        entities.append(entity)
+        roots.append(root)
+    return entities, relationships
+
+
+def generate_hierarchy(count: int, seed: int = 0, fanout: int = 8,
+                       cycles: int = 0) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str, str]]]:
+    """One corporate group of `count` entities under entity 0
+
+    Entity n's direct parent is drawn from the first n // fanout entities,
+    giving about `fanout` subsidiaries per parent; every entity is also
+    ultimately consolidated by entity 0. `cycles` extra rows make an
+    entity the direct child of one of its own descendants.
+    """
+    rng = random.Random(seed)
+    entities = [make_entity(rng, n) for n in range(count)]
+    parents = [-1] + [rng.randrange(max(n // fanout, 1)) for n in range(1, count)]
+    relationships = []
+    for n in range(1, count):
+        relationships.append((entities[n]["lei"], entities[parents[n]]["lei"], "IS_DIRECTLY_CONSOLIDATED_BY"))
+        relationships.append((entities[n]["lei"], entities[0]["lei"], "IS_ULTIMATELY_CONSOLIDATED_BY"))
+    for _ in range(cycles):
+        descendant = rng.randrange(count // 2, count)
+        ancestor = parents[descendant]
+        while ancestor > 0 and rng.random() < 0.5:
+            ancestor = parents[ancestor]
+        relationships.append((entities[ancestor]["lei"], entities[descendant]["lei"], "IS_DIRECTLY_CONSOLIDATED_BY"))
+    return entities, relationships
+
+
+def lei_xml(entities: List[Dict[str, Any]]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<lei:LEIData xmlns:lei="{LEI_NAMESPACE}">\n'
+    yield f"<lei:Header><lei:RecordCount>{len(entities)}</lei:RecordCount></lei:Header>\n<lei:LEIRecords>\n"
+    for e in entities:
+        yield (f"<lei:LEIRecord><lei:LEI>{e['lei']}</lei:LEI><lei:Entity>"
+               f'<lei:LegalName xml:lang="en">{escape(e["name"])}</lei:LegalName>'
+               f"<lei:LegalAddress><lei:FirstAddressLine>1 MAIN ST</lei:FirstAddressLine>"
+               f"<lei:Country>{e['country']}</lei:Country></lei:LegalAddress>"
+               f"<lei:LegalJurisdiction>{e['jurisdiction']}</lei:LegalJurisdiction>"
+               f"<lei:LegalForm><lei:EntityLegalFormCode>{e['legal_form']}</lei:EntityLegalFormCode></lei:LegalForm>"
+               f"<lei:EntityStatus>{e['status']}</lei:EntityStatus></lei:Entity>"
+               f"<lei:Registration><lei:RegistrationStatus>ISSUED</lei:RegistrationStatus></lei:Registration>"
+               f"</lei:LEIRecord>\n")
+    yield "</lei:LEIRecords>\n</lei:LEIData>\n"
+
+
+def rr_xml(relationships: List[Tuple[str, str, str]]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<rr:RelationshipData xmlns:rr="{RR_NAMESPACE}">\n'
+    yield "<rr:RelationshipRecords>\n"
+    for child, parent, kind in relationships:
+        yield (f"<rr:RelationshipRecord><rr:Relationship>"
+               f"<rr:StartNode><rr:NodeID>{child}</rr:NodeID><rr:NodeIDType>LEI</rr:NodeIDType></rr:StartNode>"
+               f"<rr:EndNode><rr:NodeID>{parent}</rr:NodeID><rr:NodeIDType>LEI</rr:NodeIDType></rr:EndNode>"
+               f"<rr:RelationshipType>{kind}</rr:RelationshipType>"
+               f"<rr:RelationshipStatus>ACTIVE</rr:RelationshipStatus></rr:Relationship>"
+               f"<rr:Registration><rr:RegistrationStatus>PUBLISHED</rr:RegistrationStatus></rr:Registration>"
+               f"</rr:RelationshipRecord>\n")
+    yield "</rr:RelationshipRecords>\n</rr:RelationshipData>\n"
+
+
+def write_records(f, fmt: str, kind: str, entities: List[Dict[str, Any]],
+                  relationships: List[Tuple[str, str, str]]) -> None:
+    """Write the "lei2" (entities) or "rr" (relationships) file to a text stream"""
+    if fmt == "xml":
+        f.writelines(lei_xml(entities) if kind == "lei2" else rr_xml(relationships))
+        return
+    writer = csv.writer(f)
+    if kind == "lei2":
+        writer.writerow(["LEI", "Entity.LegalName", "Entity.LegalAddress.Country", "Entity.LegalJurisdiction",
+                         "Entity.EntityStatus", "Entity.LegalForm.EntityLegalFormCode",
+                         "Registration.RegistrationStatus"])
+        writer.writerows([e["lei"], e["name"], e["country"], e["jurisdiction"], e["status"], e["legal_form"],
+                          "ISSUED"] for e in entities)
+    else:
+        writer.writerow(["Relationship.StartNode.NodeID", "Relationship.EndNode.NodeID",
+                         "Relationship.RelationshipType", "Relationship.RelationshipStatus"])
+        writer.writerows([child, parent, relationship, "ACTIVE"] for child, parent, relationship in relationships)
+
+
+def write_fixture(directory: str, count: int, seed: int = 0, fmt: str = "xml", zipped: bool = True,
+                  hierarchy: bool = False) -> List[str]:
+    """Write the entity and relationship files; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    entities, relationships = (generate_hierarchy if hierarchy else generate)(count, seed)
+    paths = []
+    for kind in ("lei2", "rr"):
+        name = f"golden-copy-{kind}.{fmt}"
+        if zipped:
+            path = os.path.join(directory, name + ".zip")
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive, archive.open(name, "w") as raw:
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                    write_records(f, fmt, kind, entities, relationships)
+        else:
+            path = os.path.join(directory, name)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                write_records(f, fmt, kind, entities, relationships)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic GLEIF golden copy files")
+    parser.add_argument("-n", "--count", default="10k", help="Number of entities (accepts 10k, 1m)")
+    parser.add_argument("-o", "--output", default="output/gleif_fixture", help="Output directory")
+    parser.add_argument("--format", choices=["xml", "csv"], default="xml")
+    parser.add_argument("--no-zip", action="store_true", help="Write plain files instead of zip archives")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--hierarchy", action="store_true", help="Generate one corporate group under entity 0")
+    args = parser.parse_args()
+
+    for path in write_fixture(args.output, parse_count(args.count), args.seed, args.format, not args.no_zip,
+                              args.hierarchy):
+        print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
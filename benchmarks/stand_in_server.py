@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Reddit and GLEIF APIs with simulated latency
+
+Serves ``/search.json`` (Reddit search) and ``/api/v1/lei-records`` (GLEIF)
+with small canned payloads after a fixed delay (GLEIF answers one record
+per value of a comma-separated name or LEI filter), so the connections bot's
+fetch path can be exercised and timed without network access. Responses
+carry an ETag and a matching If-None-Match gets a 304, for exercising
+response cache revalidation. Connections are kept alive (HTTP/1.1) and
+counted, as are requests, so clients can be compared by how many
+handshakes and requests they cause.
+
+Given a GleifMirror, every ``/api/v1/lei-records`` path (filters, single
+records, parents and paged children) is answered from the mirror instead,
+making a fake GLEIF server over any generated corporate hierarchy.
+
+Usage:
+  python benchmarks/stand_in_server.py --port 8765 --latency 0.2
+  python benchmarks/stand_in_server.py --gleif-mirror output/gleif_mirror.db
+
+  bot.reddit_search_url = "http://127.0.0.1:8765/search.json"
+  bot.gleif_lei_records_url = "http://127.0.0.1:8765/api/v1/lei-records"
+"""
+import sys
+import json
+import time
+import zlib
+import socket
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer Reddit search and GLEIF lookups after the server's latency"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        with self.server.lock:
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        if self.server.gleif_mirror is not None and parts.path.startswith("/api/v1/lei-records"):
+            response = self.server.gleif_mirror.get(self.path)
+            if response.status_code != 200:
+                self.send_error(response.status_code)
+                return
+            payload = response.json()
+        elif parts.path == "/search.json":
+            term = query.get("q", [""])[0]
+            payload = {"data": {"children": [{"data": {
+                "title": f"Discussion of {term}",
+                "selftext": f"{term} appeared in a county filing",
+                "permalink": f"/r/standin/comments/{zlib.crc32(term.encode()) % 100000}",
+                "subreddit": "standin"
+            }}]}}
+        elif parts.path == "/api/v1/lei-records":
+            # One record per name, or per LEI; both filters take comma-separated lists
+            if "filter[lei]" in query:
+                records = [(lei, f"STAND-IN ENTITY {lei}") for lei in query["filter[lei]"][0].split(",")]
+            else:
+                names = query.get("filter[entity.legalName]", [""])[0].split(",")
+                records = [(f"STANDIN{zlib.crc32(name.encode()) % 10**12:012d}", name) for name in names]
+            payload = {"data": [{
+                "id": lei,
+                "attributes": {"lei": lei, "entity": {
+                    "legalName": {"name": name},
+                    "legalAddress": {"country": "US"},
+                    "status": "ACTIVE"
+                }}
+            } for lei, name in records]}
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port: int = 0, latency: float = 0.2, gleif_mirror=None) -> ThreadingHTTPServer:
+    """Create the stand-in server without starting it"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.gleif_mirror = gleif_mirror
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    return server
+
+
+def start_server(port: int = 0, latency: float = 0.2, gleif_mirror=None) -> ThreadingHTTPServer:
+    """Start the stand-in server on a daemon thread and return it"""
+    server = make_server(port, latency, gleif_mirror)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Reddit/GLEIF API server")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds to delay each response")
+    parser.add_argument("--gleif-mirror", help="Answer GLEIF lei-records paths from this mirror database")
+    args = parser.parse_args()
+
+    mirror = None
+    if args.gleif_mirror:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from gleif_mirror import GleifMirror
+        mirror = GleifMirror(args.gleif_mirror)
+    server = make_server(args.port, args.latency, mirror)
+    print(f"Serving stand-in APIs on {base_url(server)} (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Synthetic identifier generator for STORM-BREAKER benchmarks
+
+Produces deterministic identifier records covering every family in
+StormBreaker.patterns plus unknown families seen in identifiers.json
+(EMAIL-, PHONE-, LEXID-, VIN-, LN-, VIOLATION-, SURVEILLANCE-).
+
+Usage:
+  python benchmarks/synthetic_identifiers.py -n 1000000 -o output/synthetic.ndjson
+  python benchmarks/synthetic_identifiers.py -n 10k -o output/synthetic.json --format json
+"""
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+CITIES = ["GOLDENVALLEY-AZ", "OXNARD-CA", "TEMPLECITY-CA", "HUNTSVILLE-AL", "KINGMAN-AZ"]
+STREETS = ["TONTO", "RURAL-RD", "NAUTILUS", "DACOTAH", "PACIFIC"]
+NAME_WORDS = ["TRAVIS", "STEVEN", "RYLE", "PRIVATE", "BANK", "ESTATE", "TRUST", "MARKETING", "GRP"]
+COUNTIES = ["LACOUNTY", "MOHAVE", "VENTURA", "MADISON"]
+MAIL_DOMAINS = ["GMAIL.COM", "YAHOO.COM", "OUTLOOK.COM"]
+
+
+def _digits(rng: random.Random, width: int) -> str:
+    return f"{rng.randrange(10 ** width):0{width}d}"
+
+
+# (family, source, builder) -- builders take the rng and a unique sequence number;
+# fixed-width families spell out all of n, so records stay unique below 10**9
+FAMILIES: List[Tuple[str, str, Callable[[random.Random, int], str]]] = [
+    ('employer_identification', 'IRS',
+     lambda rng, n: f"EIN-{n // 10 ** 7 % 100:02d}-{n % 10 ** 7:07d}"),
+    ('social_security', 'LexisNexis',
+     lambda rng, n: f"SSN-{n // 10 ** 6 % 1000:03d}-{n // 10 ** 4 % 100:02d}-{n % 10 ** 4:04d}"),
+    ('irs_tracking', 'IRS',
+     lambda rng, n: f"IRS-TRACK-{n % 10 ** 12:012d}"),
+    ('child_support_enforcement', 'CSE',
+     lambda rng, n: f"CSE-CASE-{2 * 10 ** 14 + n}"),
+    ('arizona_dot_customer', 'ADOT',
+     lambda rng, n: f"ADOT-CUST-{10 ** 7 + n}"),
+    ('address', 'LexisNexis',
+     lambda rng, n: f"ADDR-{rng.choice(CITIES)}-{n}-{rng.choice(STREETS)}"),
+    ('entity_name', 'Accurint',
+     lambda rng, n: f"ENTITY-{'-'.join(rng.sample(NAME_WORDS, 3))}-{n}"),
+    ('birth_registry', 'County Vital Records',
+     lambda rng, n: f"{rng.choice(COUNTIES)}-BIRTH-REGISTRY-{n}"),
+    ('property_record', 'PropertyRecord',
+     lambda rng, n: f"{rng.choice(COUNTIES)}-DEED-DOC-{n}"),
+    ('unknown', 'LexisNexis',
+     lambda rng, n: f"EMAIL-USER{n}@{rng.choice(MAIL_DOMAINS)}"),
+    ('unknown', 'TransUnion',
+     lambda rng, n: f"PHONE-{9 * 10 ** 9 + n % 10 ** 9}"),
+    ('unknown', 'LexisNexis',
+     lambda rng, n: f"LEXID-XXXXXX{n % 10 ** 4:04d}-{n}"),
+    ('unknown', 'LexisNexis C.L.U.E.',
+     lambda rng, n: f"VIN-4T1B{_digits(rng, 2)}AK{n}"),
+    ('unknown', 'LexisNexis',
+     lambda rng, n: f"LN-CASE-{n}"),
+    ('unknown', 'Kingman Court',
+     lambda rng, n: f"VIOLATION-NOREG-KINGMAN-{2000 + n % 25}-{n}"),
+    ('unknown', 'Progressive Insurance',
+     lambda rng, n: f"SURVEILLANCE-PROGRESSIVE-REVIEW-{n}"),
+]
+
+
+def parse_count(text: str) -> int:
+    """Parse counts such as 1000, 10k or 1m"""
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+def generate(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` unique identifier records, cycling through every family"""
+    rng = random.Random(seed)
+    for n in range(count):
+        _, source, build = FAMILIES[n % len(FAMILIES)]
+        yield {"identifier": build(rng, n), "source": source}
+
+
+def write_file(path: str, count: int, seed: int = 0, fmt: str = 'ndjson') -> str:
+    """Write synthetic records as NDJSON or a JSON array without holding them in memory"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        if fmt == 'json':
+            f.write('[\n')
+        for index, record in enumerate(generate(count, seed)):
+            if fmt == 'json':
+                f.write(',\n' if index else '')
+                f.write('  ' + json.dumps(record))
+            else:
+                f.write(json.dumps(record) + '\n')
+        if fmt == 'json':
+            f.write('\n]\n')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic STORM-BREAKER identifiers")
+    parser.add_argument('-n', '--count', type=str, default='10k',
+                        help='Number of identifiers (e.g. 1000, 10k, 1m, 10m)')
+    parser.add_argument('-o', '--output', type=str, default='output/synthetic_identifiers.ndjson',
+                        help='Output file')
+    parser.add_argument('--format', choices=['ndjson', 'json'], default='ndjson',
+                        help='NDJSON (default) or a JSON array like identifiers.json')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    count = parse_count(args.count)
+    write_file(args.output, count, args.seed, args.format)
+    print(f"Wrote {count} synthetic identifiers to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,24 +7,34 @@ sources and platforms, creating a comprehensive relationship map.
 """
 import os
 import json
+import sys
 import yaml
 import requests
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Set, Optional
+from typing import Dict, List, Any, Set, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aho_corasick import AhoCorasick  # noqa: E402
+from response_cache import ResponseCache, default_cache  # noqa: E402
+from http_client import default_client  # noqa: E402
 
 
 class IdentifierConnectionsBot:
     """Advanced bot for discovering all connections between identifiers"""
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, response_cache: Optional[ResponseCache] = None):
         self.verbose = verbose
+        self.response_cache = response_cache or default_cache()
         self.identifiers: List[Dict[str, Any]] = []
         self.connections: List[Dict[str, Any]] = []
         self.connection_graph: Dict[str, Set[str]] = {}
         self.aliases: List[str] = []
         self.adot_numbers: List[str] = []
+        self.identifier_matcher: Optional[AhoCorasick] = None
+        self.alias_matcher: Optional[AhoCorasick] = None
         
     def log(self, message: str, level: str = "INFO") -> None:
         """Log message with timestamp"""
@@ -35,6 +45,7 @@ class IdentifierConnectionsBot:
     
     def load_identifiers(self) -> bool:
         """Load identifiers from JSON file"""
+        self.identifier_matcher = None
         try:
             identifiers_file = Path(__file__).parent / "identifiers.json"
             with open(identifiers_file, 'r') as f:
@@ -55,6 +66,7 @@ class IdentifierConnectionsBot:
     
     def load_aliases(self) -> bool:
         """Load trust aliases and ADOT numbers from YAML file"""
+        self.alias_matcher = None
         try:
             yaml_file = Path(__file__).parent / "identifiers.yaml"
             with open(yaml_file, 'r') as f:
@@ -72,6 +84,26 @@ class IdentifierConnectionsBot:
             self.log(f"Error loading aliases: {e}", "ERROR")
             return False
     
+    def build_mention_matchers(self) -> None:
+        """Build the identifier and alias matchers used to scan post text"""
+        self.identifier_matcher = AhoCorasick(ident["identifier"] for ident in self.identifiers)
+        self.alias_matcher = AhoCorasick(self.aliases, ignore_case=True)
+    
+    def find_mentions(self, identifier: str, title: str, selftext: str) -> Tuple[List[str], List[str]]:
+        """Return (other identifiers, aliases) mentioned in a post's title or selftext"""
+        if self.identifier_matcher is None or self.alias_matcher is None:
+            self.build_mention_matchers()
+        
+        identifier_hits = self.identifier_matcher.find(title) | self.identifier_matcher.find(selftext)
+        alias_hits = self.alias_matcher.find(title) | self.alias_matcher.find(selftext)
+        
+        mentioned_identifiers = [
+            self.identifiers[index]["identifier"] for index in sorted(identifier_hits)
+            if self.identifiers[index]["identifier"] != identifier
+        ]
+        mentioned_aliases = [self.aliases[index] for index in sorted(alias_hits)]
+        return mentioned_identifiers, mentioned_aliases
+    
     def find_reddit_connections(self, identifier: str) -> List[Dict[str, Any]]:
         """Search Reddit for mentions that might indicate connections"""
         connections = []
@@ -79,7 +111,7 @@ class IdentifierConnectionsBot:
             headers = {"User-Agent": "IdentifierConnectionsBot/1.0"}
             url = f"https://www.reddit.com/search.json?q={identifier}&limit=20"
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.response_cache.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 posts = data.get("data", {}).get("children", [])
@@ -89,18 +121,8 @@ class IdentifierConnectionsBot:
                     title = post_data.get("title", "")
                     selftext = post_data.get("selftext", "")
                     
-                    # Check if any other identifiers are mentioned
-                    mentioned_identifiers = []
-                    for other_ident in self.identifiers:
-                        other_id = other_ident["identifier"]
-                        if other_id != identifier and (other_id in title or other_id in selftext):
-                            mentioned_identifiers.append(other_id)
-                    
-                    # Check if any aliases are mentioned
-                    mentioned_aliases = []
-                    for alias in self.aliases:
-                        if alias.lower() in title.lower() or alias.lower() in selftext.lower():
-                            mentioned_aliases.append(alias)
+                    # Check if any other identifiers or aliases are mentioned
+                    mentioned_identifiers, mentioned_aliases = self.find_mentions(identifier, title, selftext)
                     
                     if mentioned_identifiers or mentioned_aliases:
                         connections.append({
@@ -142,7 +164,7 @@ class IdentifierConnectionsBot:
             # Try searching by identifier
             url = f"https://api.gleif.org/api/v1/lei-records?filter[entity.legalName]={identifier}"
             
-            response = requests.get(url, timeout=10)
+            response = self.response_cache.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 records = data.get("data", [])
@@ -324,6 +346,7 @@ class IdentifierConnectionsBot:
         self.load_aliases()
         
         # Find connections from all sources
+        self.build_mention_matchers()
         self.log("Searching for Reddit connections...", "INFO")
         for ident in self.identifiers:
             identifier = ident["identifier"]
@@ -358,7 +381,10 @@ class IdentifierConnectionsBot:
                 "version": "1.0",
                 "scan_timestamp": datetime.now(timezone.utc).isoformat(),
                 "total_identifiers_scanned": len(self.identifiers),
-                "total_connections_found": len(self.connections)
+                "total_connections_found": len(self.connections),
+                "response_cache": self.response_cache.stats(),
+                "http_client": default_client().stats(),
+                "host_health": default_client().health.state()
             },
             "identifiers": [ident["identifier"] for ident in self.identifiers],
             "aliases": self.aliases,
@@ -395,6 +421,9 @@ class IdentifierConnectionsBot:
         metadata = results["scan_metadata"]
         print(f"\n🔍 Scanned {metadata['total_identifiers_scanned']} identifiers")
         print(f"🔗 Found {metadata['total_connections_found']} total connections")
+        print(f"🗄️ Response cache: {self.response_cache.summary()}")
+        print(f"🌐 HTTP client: {default_client().summary()}")
+        print(f"🩺 Host health: {default_client().health.summary()}")
         
         metrics = results["metrics"]
         print(f"\n📊 CONNECTION SOURCES:")
@@ -4,10 +4,16 @@ Reddit Trace Bot - Comprehensive Reddit profiler for trust identifiers
 """
 import os
 import json
+import sys
 import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from response_cache import default_cache  # noqa: E402
+from http_client import default_client  # noqa: E402
+
 # Load identifiers
 try:
     with open('identifiers.json', 'r') as f:
@@ -26,7 +32,7 @@ def query_reddit_with_risk_profile(identifier):
         headers = {"User-Agent": "RedditTraceBot/1.0"}
         url = f"https://www.reddit.com/search.json?q={identifier}&limit=10"
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = default_cache().get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             data = response.json()
             posts = [post["data"]["title"] for post in data["data"]["children"]]
@@ -95,3 +101,6 @@ medium_risk = sum(1 for p in reddit_profiles if p["reddit_profile"]["risk_level"
 low_risk = sum(1 for p in reddit_profiles if p["reddit_profile"]["risk_level"] == "LOW")
 
 print(f"🎯 Risk Summary: {high_risk} HIGH, {medium_risk} MEDIUM, {low_risk} LOW")
+print(f"🗄️ Response cache: {default_cache().summary()}")
+print(f"🌐 HTTP client: {default_client().summary()}")
+print(f"🩺 Host health: {default_client().health.summary()}")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Connection metrics - incremental aggregator for IdentifierConnectionsBot
+
+Counts connections by source and relationship type as they are added and
+keeps the most connected nodes in a bounded top-k set, so the metrics
+block can be read at any point of a scan without another pass over the
+connections or a sort of every node's degree. edge_store.ConnectionList
+reports the degree of every node a connection touches as it is added.
+Ties in degree go to the node reported first. Nodes are reported in
+first-seen order, so this matches a stable sort over the connection
+graph's nodes.
+
+Partial aggregators from parallel workers combine with merge(). Counts
+add up; a node reported by both sides gets the sum of its degrees, which
+is exact when the workers' edges are disjoint.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_TOP_K = 5
+
+
+class ConnectionMetrics:
+    """Running connection counts and top-k node degrees"""
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.top_k = top_k
+        self.total_connections = 0
+        self.connection_sources: Dict[str, int] = {}
+        self.relationship_types: Dict[str, int] = {}
+
+        # node -> (degree, first-report order); top holds at most top_k of them
+        self.degrees: Dict[str, Tuple[int, int]] = {}
+        self.top: List[str] = []
+        self.top_dirty = False
+
+    def add(self, connection: Dict[str, Any]) -> None:
+        """Count one connection record"""
+        self.add_many(connection.get("source", "Unknown"), connection.get("relationship_type"), 1)
+
+    def add_many(self, source: str, relationship_type: Optional[str], count: int) -> None:
+        """Count `count` connections sharing a source and relationship type"""
+        self.total_connections += count
+        self.connection_sources[source] = self.connection_sources.get(source, 0) + count
+        if relationship_type is not None:
+            self.relationship_types[relationship_type] = self.relationship_types.get(relationship_type, 0) + count
+
+    def _rank(self, node: str) -> Tuple[int, int]:
+        degree, order = self.degrees[node]
+        return degree, -order
+
+    def reset_degrees(self) -> None:
+        """Forget recorded degrees, e.g. before reporting a rebuilt graph"""
+        self.degrees = {}
+        self.top = []
+        self.top_dirty = False
+
+    def update_degree(self, node: str, degree: int) -> None:
+        """Record a node's current degree and keep the top-k set current"""
+        previous = self.degrees.get(node)
+        order = previous[1] if previous is not None else len(self.degrees)
+        self.degrees[node] = (degree, order)
+
+        if node in self.top:
+            if previous is not None and degree < previous[0]:
+                # A drop can let an outside node back in; rebuild on next read
+                self.top_dirty = True
+            return
+        if len(self.top) < self.top_k:
+            self.top.append(node)
+            return
+        weakest = min(self.top, key=self._rank)
+        if self._rank(node) > self._rank(weakest):
+            self.top[self.top.index(weakest)] = node
+
+    def most_connected(self) -> List[Tuple[str, int]]:
+        """(node, degree) for the top-k nodes, highest degree first"""
+        if self.top_dirty:
+            self.top = sorted(self.degrees, key=self._rank, reverse=True)[:self.top_k]
+            self.top_dirty = False
+        ranked = sorted(self.top, key=self._rank, reverse=True)
+        return [(node, self.degrees[node][0]) for node in ranked]
+
+    def merge(self, other: 'ConnectionMetrics') -> None:
+        """Fold another aggregator's counts and degrees into this one"""
+        self.total_connections += other.total_connections
+        for source, count in other.connection_sources.items():
+            self.connection_sources[source] = self.connection_sources.get(source, 0) + count
+        for rel_type, count in other.relationship_types.items():
+            self.relationship_types[rel_type] = self.relationship_types.get(rel_type, 0) + count
+
+        for node, (degree, _) in sorted(other.degrees.items(), key=lambda item: item[1][1]):
+            previous = self.degrees.get(node)
+            self.update_degree(node, degree + (previous[0] if previous is not None else 0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Metrics in the bot's results format"""
+        return {
+            "total_connections": self.total_connections,
+            "connection_types": {},
+            "most_connected_identifiers": [
+                {"identifier": node, "connection_count": count}
+                for node, count in self.most_connected()
+            ],
+            "connection_sources": dict(self.connection_sources),
+            "relationship_types": dict(self.relationship_types)
+        }
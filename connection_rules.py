@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Connection rules - declarative cross-identifier rules for IdentifierConnectionsBot
+
+Rules live in connection_rules.yaml next to identifiers.yaml. Each names two
+identifier source types and a relationship; without a key every identifier
+of the first source is connected to every identifier of the second. A key
+(such as a shared EIN digit suffix or a shared address token) restricts the
+rule to pairs whose extracted keys intersect.
+
+RulePlanner compiles rules into hash joins over a source-type index built
+once per identifier load: the second source is hashed by key, the first is
+grouped by its set of keys, and each group joins the union of its keys'
+buckets. Every group is one edge-store product, so a keyed rule is stored
+as compactly as an unkeyed one, and edge counts for a dry run come from
+the group sizes without expanding any pair.
+"""
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+DEFAULT_RULES_PATH = str(Path(__file__).parent / "connection_rules.yaml")
+
+DIGITS = re.compile(r"[0-9]")
+LETTER_RUN = re.compile(r"[A-Za-z]+")
+
+# Identifiers grouped by their set of keys, and identifier positions by key
+KeyIndex = Tuple[Dict[Tuple[str, ...], List[str]], Dict[str, List[int]]]
+
+
+def digit_suffix_keys(identifier: str, length: int = 4) -> List[str]:
+    """The last `length` digits of the identifier, or none if it has fewer"""
+    digits = "".join(DIGITS.findall(identifier))
+    return [digits[-length:]] if len(digits) >= length else []
+
+
+def shared_token_keys(identifier: str, min_length: int = 3, ignore: Iterable[str] = ()) -> List[str]:
+    """Letter runs of at least min_length letters (uppercased), minus ignored tokens"""
+    ignored = {token.upper() for token in ignore}
+    tokens = []
+    for token in LETTER_RUN.findall(identifier):
+        token = token.upper()
+        if len(token) >= min_length and token not in ignored and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+KEY_EXTRACTORS: Dict[str, Callable[..., List[str]]] = {
+    "digit_suffix": digit_suffix_keys,
+    "shared_token": shared_token_keys,
+}
+
+
+class ConnectionRule:
+    """Connect identifiers of two source types under a relationship, optionally by key"""
+
+    def __init__(self, source_1: str, source_2: str, relationship_type: str,
+                 key_type: Optional[str] = None, key_options: Optional[Dict[str, Any]] = None):
+        if source_1 == source_2:
+            raise ValueError(f"rule {relationship_type!r} must connect two different source types")
+        if key_type is not None and key_type not in KEY_EXTRACTORS:
+            raise ValueError(f"rule {relationship_type!r} has unknown key type {key_type!r} "
+                             f"(expected one of {', '.join(KEY_EXTRACTORS)})")
+        self.source_1 = source_1
+        self.source_2 = source_2
+        self.relationship_type = relationship_type
+        self.key_type = key_type
+        self.key_options = dict(key_options or {})
+        if key_type is not None:
+            try:
+                self.keys("")
+            except TypeError as e:
+                raise ValueError(f"rule {relationship_type!r} has invalid {key_type} options: {e}") from None
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'ConnectionRule':
+        """Build a rule from one entry of connection_rules.yaml"""
+        sources = entry.get("sources")
+        relationship = entry.get("relationship")
+        if not isinstance(sources, list) or len(sources) != 2 or not relationship:
+            raise ValueError(f"connection rule needs two sources and a relationship: {entry!r}")
+        key = entry.get("key")
+        if key is None:
+            return cls(str(sources[0]), str(sources[1]), str(relationship))
+        if not isinstance(key, dict) or "type" not in key:
+            raise ValueError(f"rule {relationship!r} key must be a mapping with a type: {key!r}")
+        options = {name: value for name, value in key.items() if name != "type"}
+        return cls(str(sources[0]), str(sources[1]), str(relationship), key["type"], options)
+
+    def keys(self, identifier: str) -> List[str]:
+        """Join keys of one identifier (only meaningful for keyed rules)"""
+        return KEY_EXTRACTORS[self.key_type](identifier, **self.key_options)
+
+    def key_signature(self) -> Tuple[Any, ...]:
+        """Hashable description of the key, shared by rules that extract the same keys"""
+        return (self.key_type, tuple(sorted((k, repr(v)) for k, v in self.key_options.items())))
+
+    def describe(self) -> str:
+        if self.key_type is None:
+            return f"{self.source_1} x {self.source_2}"
+        options = ", ".join(f"{k}={v}" for k, v in self.key_options.items())
+        return f"{self.source_1} x {self.source_2} on {self.key_type}({options})"
+
+
+DEFAULT_RULES = [
+    ConnectionRule("EIN", "EntityName", "Entity-Tax_ID_Relationship"),
+    ConnectionRule("SSN", "BirthRegNum", "Person-Birth_Record_Relationship"),
+    ConnectionRule("Address", "PropertyRecord", "Location-Property_Relationship"),
+    ConnectionRule("ADOTCust", "Address", "Customer-Location_Relationship"),
+    ConnectionRule("CSECase", "SSN", "Case-Person_Relationship"),
+    ConnectionRule("IRSTrack", "EIN", "Tax_Tracking-Entity_Relationship"),
+]
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> List[ConnectionRule]:
+    """Parse connection_rules.yaml; raises FileNotFoundError or ValueError"""
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f) or {}
+    entries = data.get("connection_rules")
+    if not isinstance(entries, list):
+        raise ValueError(f"{path} has no connection_rules list")
+    return [ConnectionRule.from_dict(entry) for entry in entries]
+
+
+class JoinPlan:
+    """The member blocks one rule connects, each block a full product"""
+
+    def __init__(self, rule: ConnectionRule, blocks: List[Tuple[List[str], List[str]]]):
+        self.rule = rule
+        self.blocks = blocks
+        self.edge_count = sum(len(left) * len(right) for left, right in blocks)
+
+
+class RulePlanner:
+    """Compiles connection rules into hash joins over identifiers indexed by source type
+
+    `members` maps each source type to its identifiers in load order and
+    `groups` to the edge-store group already registered for it; unkeyed
+    rules reuse those groups directly.
+    """
+
+    def __init__(self, members: Dict[str, List[str]], groups: Dict[str, int]):
+        self.members = members
+        self.groups = groups
+        # (source, key signature) -> key index, shared by rules extracting the same keys
+        self.indexes: Dict[Tuple[str, Tuple[Any, ...]], KeyIndex] = {}
+
+    def index(self, source: str, rule: ConnectionRule) -> KeyIndex:
+        """Identifiers of a source grouped by their set of keys, and positions by key
+
+        Built once per source and key; groups and buckets keep load order.
+        """
+        cache_key = (source, rule.key_signature())
+        index = self.indexes.get(cache_key)
+        if index is None:
+            partition: Dict[Tuple[str, ...], List[str]] = {}
+            table: Dict[str, List[int]] = {}
+            for position, member in enumerate(self.members.get(source, ())):
+                keys = tuple(sorted(set(rule.keys(member))))
+                if keys:
+                    partition.setdefault(keys, []).append(member)
+                    for key in keys:
+                        table.setdefault(key, []).append(position)
+            index = self.indexes[cache_key] = (partition, table)
+        return index
+
+    def plan(self, rule: ConnectionRule) -> JoinPlan:
+        """Blocks of identifiers the rule connects, without touching the edge store"""
+        left, right = self.members.get(rule.source_1), self.members.get(rule.source_2)
+        if left is None or right is None:
+            return JoinPlan(rule, [])
+        if rule.key_type is None:
+            return JoinPlan(rule, [(left, right)])
+
+        # Build on the second source, probe with each key set of the first
+        partition, _ = self.index(rule.source_1, rule)
+        _, table = self.index(rule.source_2, rule)
+        partner_lists: Dict[Tuple[str, ...], List[str]] = {}
+        blocks = []
+        for keys, members in partition.items():
+            matched = tuple(key for key in keys if key in table)
+            if not matched:
+                continue
+            partners = partner_lists.get(matched)
+            if partners is None:
+                positions = table[matched[0]] if len(matched) == 1 else sorted(set().union(*map(table.get, matched)))
+                partners = partner_lists[matched] = [right[position] for position in positions]
+            blocks.append((members, partners))
+        return JoinPlan(rule, blocks)
+
+    def plan_all(self, rules: Iterable[ConnectionRule]) -> List[JoinPlan]:
+        return [self.plan(rule) for rule in rules]
+
+    def materialize(self, edge_store, plan: JoinPlan, **meta: Any) -> List[int]:
+        """Add a plan's blocks to the edge store as products; returns the product ids"""
+        rule = plan.rule
+        if rule.key_type is None:
+            if not plan.blocks:
+                return []
+            return [edge_store.add_product(self.groups[rule.source_1], self.groups[rule.source_2],
+                                           rule.relationship_type, **meta)]
+
+        # Blocks sharing a partner bucket share its edge-store group
+        registered: Dict[int, int] = {}
+
+        def group_of(source: str, members: List[str]) -> int:
+            group = registered.get(id(members))
+            if group is None:
+                group = registered[id(members)] = edge_store.add_group(source, members)
+            return group
+
+        return [edge_store.add_product(group_of(rule.source_1, left), group_of(rule.source_2, right),
+                                       rule.relationship_type, join_key=rule.key_type, **meta)
+                for left, right in plan.blocks]
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Connection store - persistent SQLite connection graph for IdentifierConnectionsBot
+
+Keeps every scan's identifiers, aliases, connection records and graph edges
+in one SQLite file so consumers can ask about a single node with an indexed
+query instead of loading the full identifier_connections.json.
+
+Repeated scans upsert into the same tables: a connection is keyed by a hash
+of its record without the volatile timestamp, so finding it again only
+bumps last_seen and seen_count. Undirected edges are stored once with their
+endpoints in sorted order; directed edges (identifier -> alias) keep their
+direction, and neighbors() follows the same rules as the bot's
+connection_graph.
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_STORE_PATH = str(Path(__file__).parent / "output" / "connections.db")
+
+STORE_CACHE_KIB = 64 * 1024
+
+# Record fields left out of the dedupe key (kept in their own column)
+VOLATILE_FIELDS = ("timestamp",)
+
+
+def stable_record(record: Dict[str, Any]) -> Tuple[str, bytes]:
+    """(JSON without volatile fields, its digest) for a connection record
+
+    The digest is the record's dedupe key; records from the bot's finders
+    always list their fields in the same order.
+    """
+    encoded = json.dumps({k: v for k, v in record.items() if k not in VOLATILE_FIELDS})
+    return encoded, hashlib.sha1(encoded.encode()).digest()
+
+
+def connection_endpoints(record: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """The two nodes a connection record links (either may be None)"""
+    first = record.get("identifier_1", record.get("identifier"))
+    second = record.get("identifier_2", record.get("alias", record.get("adot_number")))
+    return first, second
+
+
+class ConnectionStore:
+    """SQLite tables of identifiers, aliases, connections and edges with indexed lookups"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute(f"PRAGMA cache_size=-{STORE_CACHE_KIB}")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS identifiers (
+                identifier TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS identifiers_source ON identifiers (source);
+
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS connections (
+                connection_key BLOB NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                relationship_type TEXT,
+                endpoint_1 TEXT,
+                endpoint_2 TEXT,
+                record TEXT NOT NULL,
+                timestamp TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                seen_count INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS connections_source ON connections (source);
+            CREATE INDEX IF NOT EXISTS connections_relationship ON connections (relationship_type);
+            CREATE INDEX IF NOT EXISTS connections_endpoint_1 ON connections (endpoint_1);
+            CREATE INDEX IF NOT EXISTS connections_endpoint_2 ON connections (endpoint_2);
+
+            CREATE TABLE IF NOT EXISTS edges (
+                src TEXT NOT NULL,
+                dst TEXT NOT NULL,
+                relationship_type TEXT NOT NULL,
+                directed INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (src, dst, relationship_type)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS edges_dst ON edges (dst, src);
+            CREATE INDEX IF NOT EXISTS edges_relationship ON edges (relationship_type);
+        """)
+        self.conn.commit()
+
+    def upsert_identifiers(self, identifiers: Iterable[Dict[str, Any]], seen_at: float) -> None:
+        self.conn.executemany(
+            "INSERT INTO identifiers VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (identifier) DO UPDATE SET source = excluded.source, last_seen = excluded.last_seen",
+            ((ident["identifier"], ident.get("source", "Unknown"), seen_at, seen_at) for ident in identifiers)
+        )
+
+    def upsert_aliases(self, aliases: Iterable[str], seen_at: float) -> None:
+        self.conn.executemany(
+            "INSERT INTO aliases VALUES (?, ?, ?) "
+            "ON CONFLICT (alias) DO UPDATE SET last_seen = excluded.last_seen",
+            ((alias, seen_at, seen_at) for alias in aliases)
+        )
+
+    def upsert_connections(self, connections: Iterable[Dict[str, Any]], seen_at: float) -> None:
+        def rows():
+            for record in connections:
+                first, second = connection_endpoints(record)
+                encoded, key = stable_record(record)
+                yield (key, record.get("source", "Unknown"), record.get("relationship_type"),
+                       first, second, encoded, record.get("timestamp"), seen_at, seen_at)
+
+        self.conn.executemany(
+            "INSERT INTO connections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT (connection_key) DO UPDATE SET timestamp = excluded.timestamp, "
+            "last_seen = excluded.last_seen, seen_count = seen_count + 1",
+            rows()
+        )
+
+    def upsert_edges(self, edges: Iterable[Tuple[str, str, str, bool]], seen_at: float) -> None:
+        """Store (src, dst, relationship type, directed) edges"""
+        def rows():
+            for src, dst, rule, directed in edges:
+                if not directed and dst < src:
+                    src, dst = dst, src
+                yield src, dst, rule, int(directed), seen_at, seen_at
+
+        self.conn.executemany(
+            "INSERT INTO edges VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (src, dst, relationship_type) DO UPDATE SET last_seen = excluded.last_seen",
+            rows()
+        )
+
+    def save_scan(self, identifiers: Iterable[Dict[str, Any]], aliases: Iterable[str],
+                  connections: Iterable[Dict[str, Any]], edge_store, seen_at: Optional[float] = None) -> None:
+        """Upsert one scan's identifiers, aliases, connections and graph edges in a transaction
+
+        Edges come from the bot's EdgeStore: its explicit edges plus every pair
+        its rule products imply.
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        store = edge_store
+
+        def edges():
+            for src, dst, rule in zip(store.edge_src, store.edge_dst, store.edge_rule):
+                yield store.nodes[src], store.nodes[dst], store.rules[rule], store.rule_directed[rule]
+            for product in range(len(store.product_meta)):
+                rule = store.rules[store.product_rule[product]]
+                for a, b in store.product_edges(product):
+                    yield store.nodes[a], store.nodes[b], rule, False
+
+        with self.conn:
+            self.upsert_identifiers(identifiers, seen_at)
+            self.upsert_aliases(aliases, seen_at)
+            self.upsert_connections(connections, seen_at)
+            self.upsert_edges(edges(), seen_at)
+
+    @staticmethod
+    def _record(encoded: str, timestamp: Optional[str]) -> Dict[str, Any]:
+        record = json.loads(encoded)
+        if timestamp is not None:
+            record["timestamp"] = timestamp
+        return record
+
+    def neighbors(self, node: str, relationship_type: Optional[str] = None) -> List[str]:
+        """Distinct neighbors of a node, following directed edges outward only"""
+        if relationship_type is None:
+            rows = self.conn.execute(
+                "SELECT dst FROM edges WHERE src = ? "
+                "UNION SELECT src FROM edges WHERE dst = ? AND directed = 0",
+                (node, node))
+        else:
+            rows = self.conn.execute(
+                "SELECT dst FROM edges WHERE src = ? AND relationship_type = ? "
+                "UNION SELECT src FROM edges WHERE dst = ? AND directed = 0 AND relationship_type = ?",
+                (node, relationship_type, node, relationship_type))
+        return [row[0] for row in rows]
+
+    def degree(self, node: str) -> int:
+        """Distinct neighbor count, matching the bot's connection_graph"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM (SELECT dst FROM edges WHERE src = ? "
+            "UNION SELECT src FROM edges WHERE dst = ? AND directed = 0)",
+            (node, node)).fetchone()[0]
+
+    def edges_by_type(self, relationship_type: str, limit: Optional[int] = None) -> Iterator[Tuple[str, str, bool]]:
+        """(src, dst, directed) for every edge of one relationship type"""
+        rows = self.conn.execute(
+            "SELECT src, dst, directed FROM edges WHERE relationship_type = ? LIMIT ?",
+            (relationship_type, -1 if limit is None else limit))
+        for src, dst, directed in rows:
+            yield src, dst, bool(directed)
+
+    def connections_for(self, node: str) -> List[Dict[str, Any]]:
+        """Stored connection records naming a node at either end"""
+        rows = self.conn.execute(
+            "SELECT record, timestamp FROM connections WHERE endpoint_1 = ? "
+            "UNION ALL SELECT record, timestamp FROM connections WHERE endpoint_2 = ? AND endpoint_1 IS NOT ?",
+            (node, node, node))
+        return [self._record(record, timestamp) for record, timestamp in rows]
+
+    def connections(self, source: Optional[str] = None, relationship_type: Optional[str] = None,
+                    limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stored connection records filtered by source and/or relationship type"""
+        clauses, params = [], []
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if relationship_type is not None:
+            clauses.append("relationship_type = ?")
+            params.append(relationship_type)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(-1 if limit is None else limit)
+        for record, timestamp in self.conn.execute(
+                f"SELECT record, timestamp FROM connections {where}LIMIT ?", params):
+            yield self._record(record, timestamp)
+
+    def stats(self) -> Dict[str, int]:
+        """Row counts per table"""
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("identifiers", "aliases", "connections", "edges")}
+
+    def summary(self) -> str:
+        counts = self.stats()
+        return (f"{counts['identifiers']} identifiers, {counts['aliases']} aliases, "
+                f"{counts['connections']} connections, {counts['edges']} edges in {self.path}")
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Edge store - compact connection graph for IdentifierConnectionsBot
+
+Nodes are interned to integer ids and relationship types to rule ids.
+Individual edges (identifier-alias matches and the like) are kept in
+parallel arrays of endpoints and rules. Group-to-group rules such as
+EIN x EntityName are stored once as a product of two member groups and
+only expanded when a caller iterates them, so memory grows with nodes
+and rules rather than with the number of pairs a rule implies.
+
+ConnectionList and ProductConnections present the store as the connection
+list the bot has always produced, and dump_json_lazily writes it without
+materializing the expansion. graph_engine.CSRGraph builds the adjacency
+from the store.
+"""
+import json
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class EdgeStore:
+    """Interned nodes and rules with explicit edges and implicit group products"""
+
+    def __init__(self):
+        self.nodes: List[str] = []
+        self.node_ids: Dict[str, int] = {}
+        self.rules: List[str] = []
+        self.rule_ids: Dict[str, int] = {}
+        self.rule_directed: List[bool] = []
+
+        # Member groups and group-to-group products (one row per rule application)
+        self.groups: List[array] = []
+        self.group_names: List[str] = []
+        self.product_a = array('I')
+        self.product_b = array('I')
+        self.product_rule = array('I')
+        self.product_meta: List[Dict[str, Any]] = []
+
+        # Explicit edges, and graph nodes in the order connections first reached them
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_rule = array('I')
+        self.graph_nodes = array('I')
+        self.graph_node_set: Set[int] = set()
+
+        self._memberships: Optional[Dict[int, List[int]]] = None
+        self._adjacency: Optional[Dict[int, List[int]]] = None
+        # Partner group signature -> union of those groups' members, node -> its union, and
+        # node -> distinct explicit neighbors outside it; kept until groups or products change
+        self._unions: Dict[Tuple[int, ...], Set[int]] = {}
+        self._node_unions: Dict[int, Set[int]] = {}
+        self._outside: Dict[int, Set[int]] = {}
+
+    def node_id(self, name: str) -> int:
+        """Integer id for a node name, interned on first use"""
+        node = self.node_ids.get(name)
+        if node is None:
+            node = len(self.nodes)
+            self.node_ids[name] = node
+            self.nodes.append(name)
+        return node
+
+    def rule_id(self, name: str, directed: bool = False) -> int:
+        """Integer id for a relationship type, interned on first use"""
+        rule = self.rule_ids.get(name)
+        if rule is None:
+            rule = len(self.rules)
+            self.rule_ids[name] = rule
+            self.rules.append(name)
+            self.rule_directed.append(directed)
+        return rule
+
+    def add_group(self, name: str, members: Iterable[str]) -> int:
+        """Register a group of member nodes and return its id"""
+        self.groups.append(array('I', (self.node_id(member) for member in members)))
+        self.group_names.append(name)
+        self._memberships = None
+        self._unions = {}
+        self._node_unions = {}
+        self._outside = {}
+        return len(self.groups) - 1
+
+    def add_product(self, group_a: int, group_b: int, rule: str, **meta: Any) -> int:
+        """Connect every member of group_a to every member of group_b under rule
+
+        Keyword arguments are carried into each expanded connection record.
+        """
+        self.product_a.append(group_a)
+        self.product_b.append(group_b)
+        self.product_rule.append(self.rule_id(rule))
+        self.product_meta.append(meta)
+        self._memberships = None
+        self._unions = {}
+        self._node_unions = {}
+        self._outside = {}
+        return len(self.product_meta) - 1
+
+    def add_edge(self, src: str, dst: str, rule: str, directed: bool = False) -> List[int]:
+        """Add one explicit edge; directed edges only appear in src's adjacency
+
+        Returns the graph nodes whose neighbors may have changed.
+        """
+        source = self.add_node(src)
+        target = self.node_id(dst) if directed else self.add_node(dst)
+        rule_id = self.rule_id(rule, directed)
+        self.edge_src.append(source)
+        self.edge_dst.append(target)
+        self.edge_rule.append(rule_id)
+        if self._adjacency is not None:
+            # Keep a built index current rather than rebuilding it per edge
+            self._adjacency.setdefault(source, []).append(target)
+            if not self.rule_directed[rule_id]:
+                self._adjacency.setdefault(target, []).append(source)
+        self._add_outside(source, target)
+        if not self.rule_directed[rule_id]:
+            self._add_outside(target, source)
+        return [source] if self.rule_directed[rule_id] else [source, target]
+
+    def _add_outside(self, node: int, other: int) -> None:
+        # Keep a node's cached degree current when it gains an explicit neighbor
+        union = self._node_unions.get(node)
+        if union is not None and other not in union:
+            self._outside.setdefault(node, set()).add(other)
+
+    def add_node(self, name: str) -> int:
+        """Make a node part of the graph even if it has no edges"""
+        node = self.node_id(name)
+        if node not in self.graph_node_set:
+            self.graph_node_set.add(node)
+            self.graph_nodes.append(node)
+        return node
+
+    def add_connection(self, connection: Dict[str, Any]) -> List[int]:
+        """Add one connection record's nodes and edges; returns the graph nodes it touched
+
+        Identifier pairs become undirected edges and alias matches edges
+        from the identifier to the alias; other records naming an
+        identifier make it a node.
+        """
+        if "identifier_1" in connection and "identifier_2" in connection:
+            return self.add_edge(connection["identifier_1"], connection["identifier_2"],
+                                 connection.get("relationship_type", "related"))
+        if "identifier" in connection:
+            if "alias" in connection:
+                return self.add_edge(connection["identifier"], connection["alias"],
+                                     connection.get("match_type", "alias"), directed=True)
+            return [self.add_node(connection["identifier"])]
+        return []
+
+    def add_product_nodes(self, product: int) -> List[int]:
+        """Make a product's members graph nodes in the order its expansion first reaches them
+
+        The first pair brings in a[0] and b[0], the rest of its row the other
+        members of b, and each later row its member of a. Returns the
+        members in that order.
+        """
+        members_a = self.groups[self.product_a[product]]
+        members_b = self.groups[self.product_b[product]]
+        if not members_a or not members_b:
+            return []
+        touched = list(dict.fromkeys((members_a[0], *members_b, *members_a[1:])))
+        for node in touched:
+            if node not in self.graph_node_set:
+                self.graph_node_set.add(node)
+                self.graph_nodes.append(node)
+        return touched
+
+    def clear_edges(self) -> None:
+        """Drop explicit edges and the graph node order, keeping groups and products"""
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_rule = array('I')
+        self.graph_nodes = array('I')
+        self.graph_node_set = set()
+        self._adjacency = None
+        self._node_unions = {}
+        self._outside = {}
+
+    def product_size(self, product: int) -> int:
+        return len(self.groups[self.product_a[product]]) * len(self.groups[self.product_b[product]])
+
+    def product_edges(self, product: int) -> Iterator[Tuple[int, int]]:
+        """Expand one product into (node_a, node_b) pairs"""
+        members_b = self.groups[self.product_b[product]]
+        for a in self.groups[self.product_a[product]]:
+            for b in members_b:
+                yield a, b
+
+    def product_connections(self, products: Iterable[int]) -> 'ProductConnections':
+        return ProductConnections(self, list(products))
+
+    def edge_count(self) -> int:
+        """Total edges, counting each pair a product implies"""
+        return len(self.edge_src) + sum(self.product_size(p) for p in range(len(self.product_meta)))
+
+    def _member_index(self) -> Dict[int, List[int]]:
+        # node -> partner groups across all products, in product order
+        if self._memberships is None:
+            memberships: Dict[int, List[int]] = {}
+            for product in range(len(self.product_meta)):
+                group_a, group_b = self.product_a[product], self.product_b[product]
+                if not self.groups[group_a] or not self.groups[group_b]:
+                    continue
+                for node in self.groups[group_a]:
+                    partners = memberships.setdefault(node, [])
+                    if group_b not in partners:
+                        partners.append(group_b)
+                for node in self.groups[group_b]:
+                    partners = memberships.setdefault(node, [])
+                    if group_a not in partners:
+                        partners.append(group_a)
+            self._memberships = memberships
+        return self._memberships
+
+    def _edge_index(self) -> Dict[int, List[int]]:
+        # node -> explicit neighbors, honouring directed rules
+        if self._adjacency is None:
+            adjacency: Dict[int, List[int]] = {}
+            for src, dst, rule in zip(self.edge_src, self.edge_dst, self.edge_rule):
+                adjacency.setdefault(src, []).append(dst)
+                if not self.rule_directed[rule]:
+                    adjacency.setdefault(dst, []).append(src)
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def graph_node_ids(self) -> List[int]:
+        """Nodes with an adjacency entry, in the order connections first reached them
+
+        This is the key order of the dict the bot used to build one connection
+        at a time. Members of products never passed to add_product_nodes
+        follow, in product order. Targets of directed edges (aliases) only get
+        an entry of their own if they are graph nodes for another reason.
+        """
+        ordered = list(self.graph_nodes)
+        seen = set(self.graph_node_set)
+        memberships = self._member_index()
+        for product in range(len(self.product_meta)):
+            for group in (self.product_a[product], self.product_b[product]):
+                for node in self.groups[group]:
+                    if node in memberships and node not in seen:
+                        seen.add(node)
+                        ordered.append(node)
+        return ordered
+
+    def neighbor_ids(self, node: int) -> List[int]:
+        """Distinct neighbors of a node, expanding its products"""
+        seen: Set[int] = set()
+        neighbors = []
+        for group in self._member_index().get(node, ()):
+            for other in self.groups[group]:
+                if other not in seen:
+                    seen.add(other)
+                    neighbors.append(other)
+        for other in self._edge_index().get(node, ()):
+            if other not in seen:
+                seen.add(other)
+                neighbors.append(other)
+        return neighbors
+
+    def degrees(self) -> List[Tuple[str, int]]:
+        """(node, distinct neighbor count) for every graph node, in graph order"""
+        return self.degrees_of(self.graph_node_ids())
+
+    def degrees_of(self, nodes: Iterable[int]) -> List[Tuple[str, int]]:
+        """(node, distinct neighbor count) for the given node ids
+
+        Nodes sharing the same partner groups share one union set, and each
+        node keeps the explicit neighbors outside it, which add_edge extends.
+        Both last until groups or products change, so once a node's degree
+        has been computed, reporting it again after each new connection is
+        constant time rather than a re-union of its groups.
+        """
+        memberships = self._member_index()
+        adjacency = self._edge_index()
+        unions = self._unions
+        result = []
+        for node in nodes:
+            union = self._node_unions.get(node)
+            if union is None:
+                signature = tuple(sorted(memberships.get(node, ())))
+                union = unions.get(signature)
+                if union is None:
+                    union = set()
+                    for group in signature:
+                        union.update(self.groups[group])
+                    unions[signature] = union
+                self._node_unions[node] = union
+                outside = {other for other in adjacency.get(node, ()) if other not in union}
+                if outside:
+                    self._outside[node] = outside
+            result.append((self.nodes[node], len(union) + len(self._outside.get(node, ()))))
+        return result
+
+    def nbytes(self) -> int:
+        """Bytes held in the store's arrays (excluding node name strings)"""
+        arrays = [self.product_a, self.product_b, self.product_rule,
+                  self.edge_src, self.edge_dst, self.edge_rule, self.graph_nodes] + self.groups
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class ProductConnections(Sequence):
+    """Connection records for a set of products, expanded on access"""
+
+    def __init__(self, store: EdgeStore, products: List[int]):
+        self.store = store
+        self.products = products
+        self.offsets = [0]
+        for product in products:
+            self.offsets.append(self.offsets[-1] + store.product_size(product))
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    def record(self, product: int, a: int, b: int) -> Dict[str, Any]:
+        meta = self.store.product_meta[product]
+        record = {"source": meta.get("source")}
+        record["identifier_1"] = self.store.nodes[a]
+        record["identifier_2"] = self.store.nodes[b]
+        record["relationship_type"] = self.store.rules[self.store.product_rule[product]]
+        record.update((k, v) for k, v in meta.items() if k != "source")
+        return record
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("connection index out of range")
+        position = bisect_right(self.offsets, index) - 1
+        product = self.products[position]
+        offset = index - self.offsets[position]
+        members_b = self.store.groups[self.store.product_b[product]]
+        a = self.store.groups[self.store.product_a[product]][offset // len(members_b)]
+        return self.record(product, a, members_b[offset % len(members_b)])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for product in self.products:
+            for a, b in self.store.product_edges(product):
+                yield self.record(product, a, b)
+
+    def counts(self) -> Iterator[Tuple[Dict[str, Any], str, int]]:
+        """(meta, relationship type, edge count) per product, without expanding"""
+        for product in self.products:
+            yield (self.store.product_meta[product], self.store.rules[self.store.product_rule[product]],
+                   self.store.product_size(product))
+
+
+class ConnectionList(Sequence):
+    """Ordered connection records mixing plain dicts with lazy product segments
+
+    With an edge store, each record's nodes and edges are added to it as the
+    record is added, so the store's graph is current (and in first-seen
+    order) at any point. An optional metrics aggregator (see
+    connection_metrics) is updated at the same time: counts per record,
+    product segments without expanding, and the degree of every node the
+    record touched.
+    """
+
+    def __init__(self, metrics=None, edge_store: Optional[EdgeStore] = None):
+        self.segments: List[Any] = []
+        self.metrics = metrics
+        self.edge_store = edge_store
+
+    def append(self, connection: Dict[str, Any]) -> None:
+        if not self.segments or not isinstance(self.segments[-1], list):
+            self.segments.append([])
+        self.segments[-1].append(connection)
+        touched = self.edge_store.add_connection(connection) if self.edge_store is not None else []
+        if self.metrics is not None:
+            self.metrics.add(connection)
+            self._report_degrees(touched)
+
+    def extend(self, connections: Iterable[Dict[str, Any]]) -> None:
+        if isinstance(connections, ProductConnections):
+            self.segments.append(connections)
+            touched: List[int] = []
+            if self.edge_store is not None:
+                for product in connections.products:
+                    touched.extend(self.edge_store.add_product_nodes(product))
+            if self.metrics is not None:
+                for meta, rel_type, count in connections.counts():
+                    self.metrics.add_many(meta.get("source", "Unknown"), rel_type, count)
+                self._report_degrees(list(dict.fromkeys(touched)))
+        else:
+            for connection in connections:
+                self.append(connection)
+
+    def _report_degrees(self, nodes: List[int]) -> None:
+        # Nodes arrive in first-seen order, which is how the metrics break degree ties
+        if nodes:
+            for node, degree in self.edge_store.degrees_of(nodes):
+                self.metrics.update_degree(node, degree)
+
+    def explicit(self) -> Iterator[Dict[str, Any]]:
+        """Connections stored as plain dicts, skipping lazy product segments"""
+        for segment in self.segments:
+            if isinstance(segment, list):
+                yield from segment
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for segment in self.segments:
+            yield from segment
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        for segment in self.segments:
+            if index < len(segment):
+                return segment[index]
+            index -= len(segment)
+        raise IndexError("connection index out of range")
+
+
+def _is_lazy(value: Any) -> bool:
+    return (isinstance(value, (Mapping, Sequence))
+            and not isinstance(value, (dict, list, tuple, str, bytes)))
+
+
+def dump_json_lazily(value: Any, f, indent: int = 2, _level: int = 0) -> None:
+    """json.dump(value, f, indent=indent) that walks lazy Mappings and Sequences
+
+    Other Mapping and Sequence types (such as CSRGraph and ConnectionList)
+    are iterated element by element so they are never materialized; plain
+    values without lazy members are encoded by json directly.
+    """
+    is_mapping = isinstance(value, Mapping)
+    if not _is_lazy(value) and not (isinstance(value, dict) and any(map(_is_lazy, value.values()))):
+        text = json.dumps(value, indent=indent)
+        f.write(text.replace('\n', '\n' + ' ' * (indent * _level)) if _level else text)
+        return
+
+    opener, closer = ('{', '}') if is_mapping else ('[', ']')
+    pad = '\n' + ' ' * (indent * (_level + 1))
+    f.write(opener)
+    empty = True
+    for item in (value.items() if is_mapping else value):
+        f.write(pad if empty else ',' + pad)
+        empty = False
+        if is_mapping:
+            key, item = item
+            f.write(json.dumps(key) + ': ')
+        dump_json_lazily(item, f, indent, _level + 1)
+    f.write(closer if empty else '\n' + ' ' * (indent * _level) + closer)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrent fetch engine - asyncio scheduling for blocking HTTP lookups
+
+Runs many GET requests concurrently with a per-host concurrency limit and an
+optional global deadline, returning results in the order the requests were
+given. Requests are executed through the shared HttpClient on a thread pool,
+so callers receive ordinary ``requests.Response`` objects and exceptions.
+"""
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from http_client import default_client
+
+# Concurrent requests allowed per host unless overridden
+DEFAULT_PER_HOST_LIMIT = 4
+
+# Per-request timeout in seconds, matching the scanners' requests.get calls
+DEFAULT_TIMEOUT = 10
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised for requests still pending when the global deadline passes"""
+
+
+class FetchEngine:
+    """Fetch a batch of URLs concurrently with per-host limits and a deadline
+
+    Each request is a dict with ``url`` and optional ``headers``/``key``;
+    each result is a dict with the same ``key`` and ``url`` plus either a
+    ``response`` or an ``error``, and the ``elapsed`` seconds.
+    """
+
+    def __init__(self, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 timeout: float = DEFAULT_TIMEOUT, deadline: Optional[float] = None,
+                 get: Optional[Callable[..., Any]] = None):
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.deadline = deadline
+        self.get = get or default_client().get
+
+    def fetch_all(self, fetch_requests: List[Dict[str, Any]],
+                  on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Run all requests and return their results in request order
+
+        ``on_result(index, result)`` is called as each request finishes, so
+        callers can act on results before the whole batch is done.
+        """
+        if not fetch_requests:
+            return []
+        return asyncio.run(self._fetch_all(fetch_requests, on_result))
+
+    async def _fetch_all(self, fetch_requests: List[Dict[str, Any]],
+                         on_result: Optional[Callable[[int, Dict[str, Any]], None]]) -> List[Dict[str, Any]]:
+        hosts = {urlsplit(request['url']).netloc for request in fetch_requests}
+        semaphores = {host: asyncio.Semaphore(self.per_host_limit) for host in hosts}
+        executor = ThreadPoolExecutor(max_workers=self.per_host_limit * len(hosts))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(fetch_requests)
+
+        tasks = [
+            asyncio.ensure_future(self._fetch_one(index, request, semaphores, executor, results, on_result))
+            for index, request in enumerate(fetch_requests)
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            # Threads blocked in a request cannot be interrupted; drop queued work
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Request errors are results; anything else came from on_result
+        for task in done:
+            task.result()
+
+        for index, request in enumerate(fetch_requests):
+            if results[index] is None:
+                results[index] = self._result(
+                    request, error=DeadlineExceeded(f"Deadline of {self.deadline}s exceeded"), elapsed=0.0
+                )
+                if on_result is not None:
+                    on_result(index, results[index])
+        return results
+
+    async def _fetch_one(self, index: int, request: Dict[str, Any], semaphores: Dict[str, asyncio.Semaphore],
+                         executor: ThreadPoolExecutor, results: List[Optional[Dict[str, Any]]],
+                         on_result: Optional[Callable[[int, Dict[str, Any]], None]]) -> None:
+        loop = asyncio.get_running_loop()
+        async with semaphores[urlsplit(request['url']).netloc]:
+            start = time.perf_counter()
+            call = functools.partial(self.get, request['url'], headers=request.get('headers'),
+                                     timeout=self.timeout)
+            try:
+                response = await loop.run_in_executor(executor, call)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[index] = self._result(request, error=e, elapsed=time.perf_counter() - start)
+            else:
+                results[index] = self._result(request, response=response, elapsed=time.perf_counter() - start)
+            if on_result is not None:
+                on_result(index, results[index])
+
+    @staticmethod
+    def _result(request: Dict[str, Any], response: Any = None, error: Optional[BaseException] = None,
+                elapsed: float = 0.0) -> Dict[str, Any]:
+        return {
+            'key': request.get('key'),
+            'url': request['url'],
+            'response': response,
+            'error': error,
+            'elapsed': elapsed
+        }
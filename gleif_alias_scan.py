@@ -1,3 +1,25 @@
+"""
+GLEIF alias sweep
+
+Walks every page of the GLEIF lei-records listing and records the entities
+whose legal name contains one of the trust aliases in gleif_results.xml.
+Pages are fetched in order with a bounded number prefetched concurrently,
+matched against all aliases at once with an Aho-Corasick automaton and
+dropped; matches are appended to the XML as they are found, so memory does
+not grow with the number of records swept.
+
+After each page the next page number and the size of the XML written so
+far are saved to output/gleif_alias_scan_checkpoint.json. --resume
+truncates the XML back to that point and carries on from the next page;
+the checkpoint is removed once the sweep completes. The daily workflow
+runs --resume --max-pages 500 and carries the checkpoint and XML between
+runs in the Actions cache, finishing a sweep over several days.
+
+Usage:
+  python gleif_alias_scan.py
+  python gleif_alias_scan.py --resume --prefetch 8
+  python gleif_alias_scan.py --max-pages 50
+"""
 import sys
 # Try to ensure stdout can emit UTF-8 on Windows runners; ignore if not supported
 try:
@@ -5,114 +27,297 @@ try:
 except Exception:
     pass
 
+import os
+import json
+import hashlib
+import argparse
 import requests
 import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import hashlib
+from pathlib import Path
 import yaml
-import os
+from aho_corasick import AhoCorasick
+from http_client import default_client
+from gleif_mirror import default_mirror
+from scan_checkpoint import scan_fingerprint
 
-# Load aliases
-try:
-    with open("identifiers.yaml", "r", encoding="utf-8") as f:
-        aliases = yaml.safe_load(f).get("trust_aliases", [])
-        if not aliases:
-            aliases = ["TRAVIS RYLE", "RYLE PRIVATE BANK", "TRAVIS RYLE TRUST"]
-except FileNotFoundError:
-    print("Warning: identifiers.yaml not found, using default aliases")
-    aliases = ["TRAVIS RYLE", "RYLE PRIVATE BANK", "TRAVIS RYLE TRUST"]
-except Exception as e:
-    print(f"Warning: could not read identifiers.yaml: {e}")
-    aliases = ["TRAVIS RYLE", "RYLE PRIVATE BANK", "TRAVIS RYLE TRUST"]
-
-# Pull GLEIF data with error handling
-gleif_base = "https://api.gleif.org/api/v1/lei-records"
-params = {"page[size]": 1000}
-data = None
+GLEIF_BASE = "https://api.gleif.org/api/v1/lei-records"
+DEFAULT_ALIASES = ["TRAVIS RYLE", "RYLE PRIVATE BANK", "TRAVIS RYLE TRUST"]
+RESULTS_PATH = "gleif_results.xml"
+CHECKPOINT_PATH = str(Path(__file__).parent / "output" / "gleif_alias_scan_checkpoint.json")
 
-try:
-    response = requests.get(gleif_base, params=params, timeout=10)
-    # If status is error, raise to go to exception handling
+# The API's largest page size
+PAGE_SIZE = 200
+# Page requests in flight ahead of the page being matched
+DEFAULT_PREFETCH = 4
+
+MOCK_DATA = {
+    "data": [
+        {
+            "id": "MOCK-LEI-RYLE-001",
+            "attributes": {
+                "entity": {
+                    "legalName": "Travis Ryle Private Bank Holdings LLC (Mock)",
+                    "legalAddress": {"country": "US"},
+                }
+            },
+        }
+    ]
+}
+
+
+def load_aliases(path="identifiers.yaml"):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            aliases = yaml.safe_load(f).get("trust_aliases", [])
+            return aliases or list(DEFAULT_ALIASES)
+    except FileNotFoundError:
+        print("Warning: identifiers.yaml not found, using default aliases")
+    except Exception as e:
+        print(f"Warning: could not read identifiers.yaml: {e}")
+    return list(DEFAULT_ALIASES)
+
+
+def legal_name_of(entity):
+    """Legal name as a string; api.gleif.org and the mirror nest it as {"name": ...}"""
+    legal_name = entity.get("legalName", "")
+    return legal_name.get("name", "") if isinstance(legal_name, dict) else legal_name
+
+
+def fetch_page(get, number, page_size):
+    """One page of the lei-records listing as parsed JSON; raises on HTTP errors"""
+    params = {"page[size]": page_size, "page[number]": number}
+    response = get(GLEIF_BASE, params=params, timeout=10)
     response.raise_for_status()
-    # Parse JSON safely
-    data = response.json()
-    print("Successfully fetched GLEIF data")
-except requests.exceptions.HTTPError as e:
-    # Log status code and body for debugging, then fall back
+    return response.json()
+
+
+def sweep_pages(get, first_page=1, page_size=PAGE_SIZE, prefetch=DEFAULT_PREFETCH, max_pages=None):
+    """Yield (page number, records) in page order, keeping up to `prefetch` pages in flight
+
+    The end of the listing comes from the first page's lastPage, or from
+    the first short page when the response has no pagination meta. A
+    failed page raises once every page before it has been yielded.
+    """
+    stop = first_page + max_pages if max_pages is not None else None
+    last_page = None
+    next_number = first_page
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as pool:
+        def top_up(limit):
+            nonlocal next_number
+            while (len(pending) < limit and (last_page is None or next_number <= last_page)
+                   and (stop is None or next_number < stop)):
+                pending.append((next_number, pool.submit(fetch_page, get, next_number, page_size)))
+                next_number += 1
+
+        # Until a page reports where the listing ends, only one is in flight
+        top_up(1)
+        try:
+            while pending:
+                number, future = pending.popleft()
+                if last_page is not None and number > last_page:
+                    future.cancel()
+                    continue
+                payload = future.result()
+                records = payload.get("data") or []
+                pagination = payload.get("meta", {}).get("pagination", {})
+                if pagination.get("lastPage"):
+                    last_page = int(pagination["lastPage"])
+                elif len(records) < page_size:
+                    last_page = number
+                top_up(max(prefetch, 1))
+                yield number, records
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+class ResultsWriter:
+    """gleif_results.xml written one Match at a time
+
+    offset() is the file size before the closing tags; a resumed sweep
+    truncates to a saved offset and appends from there.
+    """
+
+    FOOTER = b"</Matches></GLEIFResults>"
+
+    def __init__(self, path, resume_offset=None):
+        self.path = path
+        if resume_offset is None:
+            self.file = open(path, "wb")
+            timestamp = ET.Element("Timestamp")
+            timestamp.text = datetime.now().isoformat()
+            self.file.write(b"<?xml version='1.0' encoding='utf-8'?>\n<GLEIFResults>"
+                            + ET.tostring(timestamp) + b"<Matches>")
+        else:
+            self.file = open(path, "r+b")
+            self.file.truncate(resume_offset)
+            self.file.seek(resume_offset)
+
+    def write_match(self, record):
+        entity = record.get("attributes", {}).get("entity", {})
+        match_el = ET.Element("Match")
+        ET.SubElement(match_el, "LegalName").text = legal_name_of(entity) or "N/A"
+        ET.SubElement(match_el, "Country").text = entity.get("legalAddress", {}).get("country", "N/A")
+        ET.SubElement(match_el, "LEI").text = record.get("id", "N/A")
+        self.file.write(ET.tostring(match_el, encoding="utf-8", xml_declaration=False))
+
+    def offset(self):
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        """Write the closing tags, leaving a complete document even mid-sweep"""
+        offset = self.offset()
+        self.file.write(self.FOOTER)
+        self.file.close()
+        return offset
+
+
+def load_checkpoint(path, fingerprint, results_path):
+    """The saved cursor if it belongs to this sweep and its XML is still there"""
     try:
-        body = response.text
-    except Exception:
-        body = "<unavailable response body>"
-    print(f"Network HTTP error: {response.status_code} - {e}")
-    print(f"Response body: {body}")
-except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
-    print(f"Network error: {e}")
-except Exception as e:
-    print(f"Unexpected error while fetching GLEIF data: {e}")
-
-# If fetch failed, use mock/offline data
-if not data:
-    print("Running in offline mode with mock data...")
-    data = {
-        "data": [
-            {
-                "id": "MOCK-LEI-RYLE-001",
-                "attributes": {
-                    "entity": {
-                        "legalName": "Travis Ryle Private Bank Holdings LLC (Mock)",
-                        "legalAddress": {"country": "US"},
-                    }
-                },
-            }
-        ]
-    }
-
-# Match aliases
-matches_found = []
-for record in data.get("data", []):
-    legal_name = record.get("attributes", {}).get("entity", {}).get("legalName", "")
-    for alias in aliases:
-        if alias.lower() in legal_name.lower():
-            matches_found.append(record)
-
-# Log to XML
-root = ET.Element("GLEIFResults")
-timestamp = ET.SubElement(root, "Timestamp")
-timestamp.text = datetime.now().isoformat()
-matches = ET.SubElement(root, "Matches")
-
-for match in matches_found:
-    entity = match.get("attributes", {}).get("entity", {})
-    match_el = ET.SubElement(matches, "Match")
-    ET.SubElement(match_el, "LegalName").text = entity.get("legalName", "N/A")
-    ET.SubElement(match_el, "Country").text = entity.get("legalAddress", {}).get("country", "N/A")
-    ET.SubElement(match_el, "LEI").text = match.get("id", "N/A")
-
-tree = ET.ElementTree(root)
-tree.write("gleif_results.xml", encoding="utf-8", xml_declaration=True)
-
-# Inject overlay hash
-try:
-    if os.path.exists("trust_overlay.xml"):
-        with open("trust_overlay.xml", "rb") as f:
-            overlay = f.read()
-        hash_value = hashlib.sha256(overlay).hexdigest()
-        tree_overlay = ET.parse("trust_overlay.xml")
-        root_overlay = tree_overlay.getroot()
-
-        tech_trace = root_overlay.find("TechnicalTrace")
-        if tech_trace is None:
-            tech_trace = ET.SubElement(root_overlay, "TechnicalTrace")
-
-        overlay_hash = tech_trace.find("OverlayHash")
-        if overlay_hash is None:
-            overlay_hash = ET.SubElement(tech_trace, "OverlayHash")
-
-        overlay_hash.text = hash_value
-        root_overlay.set("timestamp", datetime.now().isoformat())
-        tree_overlay.write("trust_overlay.xml", encoding="utf-8", xml_declaration=True)
-        print("Overlay updated.")
+        with open(path, "r", encoding="utf-8") as f:
+            cursor = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if cursor.get("fingerprint") != fingerprint:
+        return None
+    if not os.path.exists(results_path) or os.path.getsize(results_path) < cursor.get("offset", 0):
+        return None
+    return cursor
+
+
+def save_checkpoint(path, cursor):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(cursor, f)
+    os.replace(temporary, path)
+
+
+def match_records(matcher, records, writer):
+    """Write one Match per alias found in each record's legal name; returns the count"""
+    count = 0
+    for record in records:
+        legal_name = legal_name_of(record.get("attributes", {}).get("entity", {}))
+        for _ in matcher.find(legal_name):
+            writer.write_match(record)
+            count += 1
+    return count
+
+
+def run_sweep(get, aliases, results_path=RESULTS_PATH, checkpoint_path=CHECKPOINT_PATH,
+              page_size=PAGE_SIZE, prefetch=DEFAULT_PREFETCH, resume=False, max_pages=None):
+    """Sweep the listing into results_path; returns the sweep's counters"""
+    matcher = AhoCorasick(aliases, ignore_case=True)
+    fingerprint = scan_fingerprint(GLEIF_BASE, page_size, aliases)
+    cursor = load_checkpoint(checkpoint_path, fingerprint, results_path) if resume else None
+    if cursor is not None:
+        print(f"Resuming GLEIF sweep at page {cursor['next_page']} "
+              f"({cursor['records']} records, {cursor['matches']} matches so far)")
+    else:
+        cursor = {"fingerprint": fingerprint, "next_page": 1, "offset": None, "records": 0, "matches": 0}
+    writer = ResultsWriter(results_path, cursor["offset"])
+    pages = 0
+    complete = False
+
+    try:
+        for number, records in sweep_pages(get, cursor["next_page"], page_size, prefetch, max_pages):
+            cursor["matches"] += match_records(matcher, records, writer)
+            cursor["records"] += len(records)
+            cursor["next_page"] = number + 1
+            cursor["offset"] = writer.offset()
+            save_checkpoint(checkpoint_path, cursor)
+            pages += 1
+        complete = max_pages is None or pages < max_pages
+    except requests.exceptions.HTTPError as e:
+        # Log status code and body for debugging
+        try:
+            body = e.response.text
+        except Exception:
+            body = "<unavailable response body>"
+        print(f"Network HTTP error: {e.response.status_code} - {e}")
+        print(f"Response body: {body}")
+    except requests.exceptions.RequestException as e:
+        print(f"Network error: {e}")
+    except Exception as e:
+        print(f"Unexpected error while fetching GLEIF data: {e}")
+
+    if not complete and cursor["records"] == 0 and cursor["next_page"] == 1:
+        # Nothing could be fetched: match the mock data instead
+        print("Running in offline mode with mock data...")
+        cursor["matches"] += match_records(matcher, MOCK_DATA["data"], writer)
+        complete = True
+    writer.close()
+
+    if complete:
+        try:
+            os.unlink(checkpoint_path)
+        except FileNotFoundError:
+            pass
     else:
-        print("trust_overlay.xml not found, skipping overlay injection")
-except Exception as e:
-    print(f"Overlay injection skipped: {e}")
+        print(f"GLEIF sweep stopped before page {cursor['next_page']}; rerun with --resume to continue")
+    return {"pages": pages, "records": cursor["records"], "matches": cursor["matches"], "complete": complete}
+
+
+def inject_overlay_hash():
+    try:
+        if os.path.exists("trust_overlay.xml"):
+            with open("trust_overlay.xml", "rb") as f:
+                overlay = f.read()
+            hash_value = hashlib.sha256(overlay).hexdigest()
+            tree_overlay = ET.parse("trust_overlay.xml")
+            root_overlay = tree_overlay.getroot()
+
+            tech_trace = root_overlay.find("TechnicalTrace")
+            if tech_trace is None:
+                tech_trace = ET.SubElement(root_overlay, "TechnicalTrace")
+
+            overlay_hash = tech_trace.find("OverlayHash")
+            if overlay_hash is None:
+                overlay_hash = ET.SubElement(tech_trace, "OverlayHash")
+
+            overlay_hash.text = hash_value
+            root_overlay.set("timestamp", datetime.now().isoformat())
+            tree_overlay.write("trust_overlay.xml", encoding="utf-8", xml_declaration=True)
+            print("Overlay updated.")
+        else:
+            print("trust_overlay.xml not found, skipping overlay injection")
+    except Exception as e:
+        print(f"Overlay injection skipped: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep GLEIF lei-records for trust aliases")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted sweep from its checkpoint")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, help="Pages fetched ahead concurrently")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Records per page request")
+    parser.add_argument("--max-pages", type=int, help="Stop after this many pages (resumable)")
+    args = parser.parse_args()
+
+    aliases = load_aliases()
+    # GLEIF_MIRROR_PATH answers the listing from the local mirror instead
+    mirror = default_mirror()
+    get = mirror.get if mirror is not None else default_client().get
+    stats = run_sweep(get, aliases, page_size=args.page_size, prefetch=args.prefetch,
+                      resume=args.resume, max_pages=args.max_pages)
+    print(f"Swept {stats['records']} GLEIF records in {stats['pages']} pages: "
+          f"{stats['matches']} alias matches written to {RESULTS_PATH}")
+
+    inject_overlay_hash()
+
+    print(f"HTTP client: {default_client().summary()}")
+
+    print(f"Host health: {default_client().health.summary()}")
+    if mirror is not None:
+        print(f"GLEIF mirror: {mirror.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+GLEIF batch lookups - coalesce LEI and legal-name lookups into few requests
+
+The lei-records API takes comma-separated values in its filters, so many
+lookups of the same kind can share one request:
+
+    lei-records?filter[lei]=LEI1,LEI2,...&page[size]=200
+
+GleifBatcher queues lookups and returns a Future for each. A queue is sent
+as one request when it reaches batch_size distinct values, when its oldest
+lookup has waited `window` seconds, or on flush(); up to max_concurrent
+batches are in flight at once. The records that come back (every page of
+them) are fanned out to the waiting lookups by LEI, or by normalized legal
+name, so N lookups cost about N / batch_size requests. Identical pending
+lookups share a slot. A legal name containing a comma cannot be told apart
+from a list, so it is sent on its own.
+
+A batch request that fails on the network fails every lookup in it with
+the same exception. One answered with an HTTP error status on any page
+fails them with a requests HTTPError carrying that response, and the
+status is kept in `errors`. A 4xx on a batch of several values may mean
+the API refused the list itself, so each value is retried on its own and
+only the lookups whose own request fails are failed.
+"""
+import json
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from gleif_mirror import MAX_PAGE_SIZE, gleif_get, normalize_name
+
+GLEIF_API = "https://api.gleif.org/api/v1/lei-records"
+
+# Distinct values per request; keeps batched URLs a few KB long
+DEFAULT_BATCH_SIZE = 100
+
+# Legal names per request for callers that look names up: api.gleif.org is not
+# confirmed to accept a list for filter[entity.legalName], so names go one at a time
+NAME_BATCH_SIZE = 1
+
+# Seconds the oldest queued lookup waits for others to join its batch
+DEFAULT_WINDOW = 0.02
+
+DEFAULT_MAX_CONCURRENT = 4
+
+HEADERS = {"Accept": "application/vnd.api+json"}
+
+FILTERS = {"lei": "filter[lei]", "name": "filter[entity.legalName]"}
+
+
+def record_keys(kind: str, record: Dict[str, Any]) -> List[str]:
+    """The lookup keys a lei-records entry answers"""
+    attributes = record.get("attributes", {})
+    if kind == "lei":
+        lei = attributes.get("lei") or record.get("id") or ""
+        return [lei.upper()] if lei else []
+    legal_name = attributes.get("entity", {}).get("legalName", "")
+    if isinstance(legal_name, dict):
+        legal_name = legal_name.get("name", "")
+    return [normalize_name(legal_name)] if legal_name else []
+
+
+def lookup_key(kind: str, value: str) -> str:
+    return value.strip().upper() if kind == "lei" else normalize_name(value)
+
+
+def records_response(url: str, records: List[Dict[str, Any]]) -> requests.Response:
+    """A lei-records list response holding records, for callers that expect one per lookup"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/vnd.api+json"})
+    response._content = json.dumps({"data": records}).encode("utf-8")
+    response.url = url
+    return response
+
+
+class GleifBatcher:
+    """Queue LEI and legal-name lookups and send each queue as one multi-valued request"""
+
+    def __init__(self, get: Optional[Callable[..., Any]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 window: float = DEFAULT_WINDOW, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 api: str = GLEIF_API, timeout: float = 10):
+        self.get = get or gleif_get
+        self.batch_size = max(batch_size, 1)
+        self.window = window
+        self.api = api.rstrip("/")
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        # kind -> lookup key -> (value sent, futures waiting on it)
+        self.pending: Dict[str, Dict[str, Any]] = {kind: {} for kind in FILTERS}
+        # kind -> monotonic time the oldest pending lookup was queued
+        self.oldest: Dict[str, Optional[float]] = {kind: None for kind in FILTERS}
+        self.executor = ThreadPoolExecutor(max_workers=max(max_concurrent, 1))
+        self.dispatcher: Optional[threading.Thread] = None
+        self.closed = False
+        self.counters = {"lookups": 0, "batches": 0, "requests": 0}
+        # {url, error} for requests answered with an HTTP error status
+        self.errors: List[Dict[str, str]] = []
+
+    # -- queueing ---------------------------------------------------------------
+
+    def lookup_lei(self, lei: str) -> 'Future[List[Dict[str, Any]]]':
+        """Future for the lei-records entry of one LEI (an empty list if unknown)"""
+        return self._submit("lei", lei)
+
+    def lookup_name(self, name: str) -> 'Future[List[Dict[str, Any]]]':
+        """Future for the lei-records entries whose legal name matches name"""
+        return self._submit("name", name)
+
+    def lookup_leis(self, leis: Iterable[str]) -> Dict[str, 'Future[List[Dict[str, Any]]]']:
+        """Futures for many LEIs, sent without waiting for the window"""
+        futures = {lei: self.lookup_lei(lei) for lei in leis}
+        self.flush()
+        return futures
+
+    def lookup_names(self, names: Iterable[str]) -> Dict[str, 'Future[List[Dict[str, Any]]]']:
+        """Futures for many legal names, sent without waiting for the window"""
+        futures = {name: self.lookup_name(name) for name in names}
+        self.flush()
+        return futures
+
+    def _submit(self, kind: str, value: str) -> 'Future[List[Dict[str, Any]]]':
+        future: 'Future[List[Dict[str, Any]]]' = Future()
+        key = lookup_key(kind, value)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("GleifBatcher is closed")
+            self.counters["lookups"] += 1
+            if kind == "name" and "," in value:
+                self._send(kind, {key: (value, [future])})
+                return future
+            waiting = self.pending[kind]
+            if not waiting:
+                self.oldest[kind] = time.monotonic()
+            waiting.setdefault(key, (value, []))[1].append(future)
+            if len(waiting) >= self.batch_size:
+                self._dispatch(kind)
+            else:
+                if self.dispatcher is None:
+                    self.dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+                    self.dispatcher.start()
+                self.condition.notify()
+        return future
+
+    def flush(self) -> None:
+        """Send every queued lookup now"""
+        with self.condition:
+            for kind in FILTERS:
+                if self.pending[kind]:
+                    self._dispatch(kind)
+
+    def _dispatch(self, kind: str) -> None:
+        # Called with the condition held
+        batch = self.pending[kind]
+        self.pending[kind] = {}
+        self.oldest[kind] = None
+        self._send(kind, batch)
+
+    def _send(self, kind: str, batch: Dict[str, Any]) -> None:
+        self.counters["batches"] += 1
+        self.executor.submit(self._run, kind, batch)
+
+    def _dispatch_loop(self) -> None:
+        """Send each queue once its oldest lookup has waited out the window"""
+        with self.condition:
+            while not self.closed:
+                queued = [oldest for oldest in self.oldest.values() if oldest is not None]
+                if not queued:
+                    self.condition.wait()
+                    continue
+                delay = min(queued) + self.window - time.monotonic()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                for kind, oldest in self.oldest.items():
+                    if oldest is not None and oldest + self.window <= time.monotonic():
+                        self._dispatch(kind)
+
+    # -- requests ---------------------------------------------------------------
+
+    def batch_url(self, kind: str, values: List[str], page: int = 1) -> str:
+        joined = ",".join(quote(value, safe="") for value in values)
+        return f"{self.api}?{FILTERS[kind]}={joined}&page[size]={MAX_PAGE_SIZE}&page[number]={page}"
+
+    def _run(self, kind: str, batch: Dict[str, Any]) -> None:
+        try:
+            records = self._fetch(kind, [value for value, _ in batch.values()])
+        except requests.exceptions.HTTPError as e:
+            if len(batch) > 1 and 400 <= e.response.status_code < 500:
+                for key, entry in batch.items():
+                    self._run(kind, {key: entry})
+            else:
+                self._fail(batch, e)
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        found: Dict[str, List[Dict[str, Any]]] = {key: [] for key in batch}
+        for record in records:
+            for key in record_keys(kind, record):
+                if key in found:
+                    found[key].append(record)
+        for key, (_, futures) in batch.items():
+            for future in futures:
+                future.set_result(list(found[key]))
+
+    @staticmethod
+    def _fail(batch: Dict[str, Any], error: Exception) -> None:
+        for _, futures in batch.values():
+            for future in futures:
+                future.set_exception(error)
+
+    def _fetch(self, kind: str, values: List[str]) -> List[Dict[str, Any]]:
+        """Every page of one multi-valued request's records, raising HTTPError if any page fails"""
+        records: List[Dict[str, Any]] = []
+        page, last_page = 1, 1
+        while page <= last_page:
+            with self.condition:
+                self.counters["requests"] += 1
+            url = self.batch_url(kind, values, page)
+            response = self.get(url, headers=HEADERS, timeout=self.timeout)
+            if response.status_code != 200:
+                with self.condition:
+                    self.errors.append({"url": url, "error": f"HTTP {response.status_code}"})
+                raise requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+            payload = response.json()
+            data = payload.get("data") or []
+            records.extend(data if isinstance(data, list) else [data])
+            last_page = int(payload.get("meta", {}).get("pagination", {}).get("lastPage") or 1)
+            page += 1
+        return records
+
+    # -- lifecycle --------------------------------------------------------------
+
+    def close(self, wait: bool = True) -> None:
+        """Send what is queued and stop the dispatcher, waiting for in-flight batches unless told not to"""
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self.condition:
+            return dict(self.counters)
+
+    def summary(self) -> str:
+        stats = self.stats()
+        summary = f"{stats['lookups']} lookups in {stats['requests']} requests ({stats['batches']} batches)"
+        with self.condition:
+            errors = len(self.errors)
+        return summary + (f", {errors} HTTP errors" if errors else "")
@@ -1,13 +1,14 @@
 import requests, xml.etree.ElementTree as ET
 from datetime import datetime
 import sys
+from http_client import default_client
 
 print("🔧 Starting GLEIF echo test...")
 
 # Pull GLEIF data with error handling
 gleif_url = "https://api.gleif.org/api/v1/lei-records?page[size]=5"
 try:
-    response = requests.get(gleif_url, timeout=10)
+    response = default_client().get(gleif_url, timeout=10)
     response.raise_for_status()
     data = response.json()
     print("✅ Successfully fetched GLEIF data")
@@ -58,3 +59,5 @@ for record in data.get("data", []):
 tree = ET.ElementTree(root)
 tree.write("gleif_echo.xml", encoding="utf-8", xml_declaration=True)
 print("✅ Echo file saved as gleif_echo.xml")
+print(f"🌐 HTTP client: {default_client().summary()}")
+print(f"🩺 Host health: {default_client().health.summary()}")
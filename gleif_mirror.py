@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+GLEIF mirror - local indexed copy of the GLEIF golden copy files
+
+Imports the bulk LEI-CDF (entity) and RR-CDF (relationship) files GLEIF
+publishes, as XML or CSV and optionally zipped, into a SQLite file. Files
+are streamed: XML records are dropped from the parse tree as soon as they
+are read and rows are written in batches, so memory stays flat however
+large the golden copy is.
+
+Entities are indexed by LEI, by normalized legal name (exact and prefix
+lookups, plus an FTS5 full-text index when SQLite has it) and by
+jurisdiction; relationships by child and by parent LEI.
+
+GleifMirror.get answers the api.gleif.org ``lei-records`` URLs the scripts
+already build (legal-name, full-text, LEI and jurisdiction filters, paging,
+single records and direct/ultimate parent and children) with the same
+JSON:API payloads, as a requests.Response. Set GLEIF_MIRROR_PATH and
+gleif_get() sends every GLEIF lookup to the mirror instead of HTTP.
+
+Usage:
+  python gleif_mirror.py import golden-copy-lei2.xml.zip golden-copy-rr.csv.zip
+  python gleif_mirror.py search "travis ryle"
+  python gleif_mirror.py lei 5493004MCF8JDC86VS77
+"""
+import io
+import os
+import re
+import csv
+import json
+import sqlite3
+import argparse
+import threading
+import unicodedata
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from response_cache import default_cache
+
+DEFAULT_MIRROR_PATH = str(Path(__file__).parent / "output" / "gleif_mirror.db")
+
+# Rows written per transaction while importing
+BATCH_SIZE = 10_000
+
+# The API's default and largest page sizes
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 200
+
+NON_ALNUM = re.compile(r"[^0-9A-Za-z]+")
+
+DIRECT_PARENT = "IS_DIRECTLY_CONSOLIDATED_BY"
+ULTIMATE_PARENT = "IS_ULTIMATELY_CONSOLIDATED_BY"
+
+ENTITY_COLUMNS = ("lei", "legal_name", "normalized_name", "jurisdiction", "country",
+                  "entity_status", "legal_form", "registration_status")
+
+# Golden copy CSV headers for the columns after lei, legal_name and normalized_name
+ENTITY_CSV_FIELDS = ("Entity.LegalJurisdiction", "Entity.LegalAddress.Country", "Entity.EntityStatus",
+                     "Entity.LegalForm.EntityLegalFormCode", "Registration.RegistrationStatus")
+RELATIONSHIP_CSV_FIELDS = ("Relationship.StartNode.NodeID", "Relationship.EndNode.NodeID",
+                           "Relationship.RelationshipType", "Relationship.RelationshipStatus")
+
+
+def normalize_name(name: str) -> str:
+    """Uppercase, accent-free legal name with punctuation collapsed to single spaces"""
+    if name.isascii():
+        return " ".join(NON_ALNUM.sub(" ", name).upper().split())
+    decomposed = unicodedata.normalize("NFKD", name)
+    letters = "".join(c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c))
+    return " ".join(letters.upper().split())
+
+
+# Namespaced tag -> local name; a golden copy uses a few dozen distinct tags
+_local_names: Dict[str, str] = {}
+
+
+def _local(tag: str) -> str:
+    name = _local_names.get(tag)
+    if name is None:
+        name = _local_names[tag] = tag.rsplit("}", 1)[-1]
+    return name
+
+
+def _child_text(element: ET.Element, *path: str) -> Optional[str]:
+    """Text of the descendant reached by local tag names, ignoring namespaces"""
+    for name in path:
+        for child in element:
+            if _local(child.tag) == name:
+                element = child
+                break
+        else:
+            return None
+    return (element.text or "").strip() or None
+
+
+def _entity_row(record: ET.Element) -> Optional[Tuple[Any, ...]]:
+    lei = _child_text(record, "LEI")
+    name = _child_text(record, "Entity", "LegalName")
+    if not lei or not name:
+        return None
+    return (lei, name, normalize_name(name),
+            _child_text(record, "Entity", "LegalJurisdiction"),
+            _child_text(record, "Entity", "LegalAddress", "Country"),
+            _child_text(record, "Entity", "EntityStatus"),
+            _child_text(record, "Entity", "LegalForm", "EntityLegalFormCode"),
+            _child_text(record, "Registration", "RegistrationStatus"))
+
+
+def _relationship_row(record: ET.Element) -> Optional[Tuple[Any, ...]]:
+    child = _child_text(record, "Relationship", "StartNode", "NodeID")
+    parent = _child_text(record, "Relationship", "EndNode", "NodeID")
+    kind = _child_text(record, "Relationship", "RelationshipType")
+    if not child or not parent or not kind:
+        return None
+    return (child, parent, kind, _child_text(record, "Relationship", "RelationshipStatus") or "ACTIVE")
+
+
+def iter_xml_records(stream: IO[bytes]) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    """("entity" | "relationship", row) for each LEIRecord and RelationshipRecord
+
+    Each record is removed from its parent once read, so the tree never
+    holds more than the record being parsed.
+    """
+    path: List[ET.Element] = []
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(element)
+            continue
+        path.pop()
+        tag = _local(element.tag)
+        if tag == "LEIRecord":
+            row = _entity_row(element)
+            kind = "entity"
+        elif tag == "RelationshipRecord":
+            row = _relationship_row(element)
+            kind = "relationship"
+        else:
+            continue
+        if path:
+            path[-1].remove(element)
+        if row is not None:
+            yield kind, row
+
+
+def iter_csv_records(stream: IO[bytes]) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    """("entity" | "relationship", row) for each line of a golden copy CSV file"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    fields = reader.fieldnames or []
+    if RELATIONSHIP_CSV_FIELDS[0] in fields:
+        child, parent, kind, status = RELATIONSHIP_CSV_FIELDS
+        for line in reader:
+            if line.get(child) and line.get(parent) and line.get(kind):
+                yield "relationship", (line[child], line[parent], line[kind], line.get(status) or "ACTIVE")
+    elif "LEI" in fields:
+        for line in reader:
+            lei, name = line.get("LEI"), line.get("Entity.LegalName")
+            if lei and name:
+                yield "entity", (lei, name, normalize_name(name),
+                                 *(line.get(field) or None for field in ENTITY_CSV_FIELDS))
+    else:
+        raise ValueError("CSV file is neither an LEI-CDF nor an RR-CDF golden copy")
+
+
+def iter_bulk_file(path: str) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    """Records of a golden copy file, or of every XML/CSV member of a zip archive"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                with archive.open(member) as stream:
+                    yield from _iter_stream(member.filename, stream)
+    else:
+        with open(path, "rb") as stream:
+            yield from _iter_stream(path, stream)
+
+
+def _iter_stream(name: str, stream: IO[bytes]) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    lowered = name.lower()
+    if lowered.endswith(".csv"):
+        return iter_csv_records(stream)
+    if lowered.endswith(".xml"):
+        return iter_xml_records(stream)
+    buffered = io.BufferedReader(stream) if not hasattr(stream, "peek") else stream
+    head = buffered.peek(64)[:64].lstrip(b"\xef\xbb\xbf \t\r\n")
+    return iter_xml_records(buffered) if head.startswith(b"<") else iter_csv_records(buffered)
+
+
+class GleifMirror:
+    """SQLite copy of GLEIF entities and relationships answering lei-records queries"""
+
+    def __init__(self, path: str = DEFAULT_MIRROR_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entities (
+                lei TEXT PRIMARY KEY,
+                legal_name TEXT NOT NULL,
+                normalized_name TEXT NOT NULL,
+                jurisdiction TEXT,
+                country TEXT,
+                entity_status TEXT,
+                legal_form TEXT,
+                registration_status TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entities_name ON entities (normalized_name);
+            CREATE INDEX IF NOT EXISTS entities_jurisdiction ON entities (jurisdiction);
+            CREATE TABLE IF NOT EXISTS relationships (
+                child_lei TEXT NOT NULL,
+                parent_lei TEXT NOT NULL,
+                relationship_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (child_lei, relationship_type, parent_lei)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS relationships_parent ON relationships (parent_lei, relationship_type);
+        """)
+        try:
+            self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS entity_names USING fts5("
+                              "normalized_name, content='entities', content_rowid='rowid')")
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: full-text filters fall back to LIKE scans
+            self.full_text = False
+        self.conn.commit()
+        self.counters = {"lookups": 0}
+
+    # -- import -----------------------------------------------------------------
+
+    def import_file(self, path: str, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+        """Stream one golden copy file (or zip of them) in; returns rows imported by kind"""
+        counts = {"entity": 0, "relationship": 0}
+        batches: Dict[str, List[Tuple[Any, ...]]] = {"entity": [], "relationship": []}
+        for kind, row in iter_bulk_file(path):
+            batch = batches[kind]
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self._write(kind, batch)
+                counts[kind] += len(batch)
+                batch.clear()
+        for kind, batch in batches.items():
+            if batch:
+                self._write(kind, batch)
+                counts[kind] += len(batch)
+        if counts["entity"] and self.full_text:
+            with self.lock, self.conn:
+                self.conn.execute("INSERT INTO entity_names(entity_names) VALUES ('rebuild')")
+        return counts
+
+    def _write(self, kind: str, rows: List[Tuple[Any, ...]]) -> None:
+        with self.lock, self.conn:
+            if kind == "entity":
+                self.conn.executemany(
+                    f"INSERT INTO entities ({', '.join(ENTITY_COLUMNS)}) VALUES ({', '.join('?' * len(ENTITY_COLUMNS))})"
+                    " ON CONFLICT (lei) DO UPDATE SET " +
+                    ", ".join(f"{column} = excluded.{column}" for column in ENTITY_COLUMNS[1:]),
+                    rows
+                )
+            else:
+                self.conn.executemany("INSERT OR REPLACE INTO relationships VALUES (?, ?, ?, ?)", rows)
+
+    # -- queries ----------------------------------------------------------------
+
+    def _entities(self, where: str, params: Iterable[Any], limit: int = -1, offset: int = 0,
+                  join: str = "") -> List[Dict[str, Any]]:
+        sql = (f"SELECT {', '.join('e.' + column for column in ENTITY_COLUMNS)} FROM entities e {join} "
+               f"WHERE {where} ORDER BY e.rowid LIMIT ? OFFSET ?")
+        with self.lock:
+            self.counters["lookups"] += 1
+            rows = self.conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [dict(zip(ENTITY_COLUMNS, row)) for row in rows]
+
+    def _count(self, where: str, params: Iterable[Any], join: str = "") -> int:
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM entities e {join} WHERE {where}",
+                                     tuple(params)).fetchone()[0]
+
+    def record(self, lei: str) -> Optional[Dict[str, Any]]:
+        found = self._entities("e.lei = ?", (lei,))
+        return found[0] if found else None
+
+    def find_by_name(self, name: str, limit: int = -1) -> List[Dict[str, Any]]:
+        """Entities whose normalized legal name equals the normalized name"""
+        return self._entities("e.normalized_name = ?", (normalize_name(name),), limit)
+
+    def name_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Entities whose normalized legal name starts with the normalized prefix"""
+        where, params = self._prefix_filter(prefix)
+        return self._entities(where, params, limit)
+
+    def search(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Entities whose legal name contains every word of text (the last one as a prefix)"""
+        where, params, join = self._full_text_filter(text)
+        return self._entities(where, params, limit, join=join)
+
+    def by_jurisdiction(self, jurisdiction: str, limit: int = -1) -> List[Dict[str, Any]]:
+        return self._entities("e.jurisdiction = ?", (jurisdiction.upper(),), limit)
+
+    def parents(self, lei: str, relationship_type: str = DIRECT_PARENT) -> List[Dict[str, Any]]:
+        return self._entities("r.child_lei = ? AND r.relationship_type = ? AND r.status != 'INACTIVE'",
+                              (lei, relationship_type), join="JOIN relationships r ON r.parent_lei = e.lei")
+
+    def children(self, lei: str, relationship_type: str = DIRECT_PARENT, limit: int = -1,
+                 offset: int = 0) -> List[Dict[str, Any]]:
+        return self._entities(*self._children_filter(lei, relationship_type), limit, offset,
+                              join="JOIN relationships r ON r.child_lei = e.lei")
+
+    def child_count(self, lei: str, relationship_type: str = DIRECT_PARENT) -> int:
+        return self._count(*self._children_filter(lei, relationship_type),
+                           join="JOIN relationships r ON r.child_lei = e.lei")
+
+    @staticmethod
+    def _children_filter(lei: str, relationship_type: str) -> Tuple[str, Tuple[Any, ...]]:
+        return "r.parent_lei = ? AND r.relationship_type = ? AND r.status != 'INACTIVE'", (lei, relationship_type)
+
+    @staticmethod
+    def _prefix_filter(prefix: str) -> Tuple[str, Tuple[Any, ...]]:
+        low = normalize_name(prefix)
+        if not low:
+            return "1", ()
+        # Every name starting with low sorts before low with its last character bumped
+        high = low[:-1] + chr(ord(low[-1]) + 1)
+        return "e.normalized_name >= ? AND e.normalized_name < ?", (low, high)
+
+    def _full_text_filter(self, text: str) -> Tuple[str, Tuple[Any, ...], str]:
+        words = normalize_name(text).split()
+        if not words:
+            return "1", (), ""
+        if self.full_text:
+            query = " ".join(f'"{word}"' for word in words) + "*"
+            return "entity_names MATCH ?", (query,), "JOIN entity_names ON entity_names.rowid = e.rowid"
+        clauses = " AND ".join("(' ' || e.normalized_name) LIKE ?" for _ in words)
+        return clauses, tuple(f"% {word}%" for word in words), ""
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            entities = self.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+            relationships = self.conn.execute("SELECT COUNT(*) FROM relationships").fetchone()[0]
+            return dict(self.counters, entities=entities, relationships=relationships)
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (f"{stats['entities']} entities, {stats['relationships']} relationships, "
+                f"{stats['lookups']} local lookups ({self.path})")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # -- lei-records API --------------------------------------------------------
+
+    @staticmethod
+    def api_record(entity: Dict[str, Any]) -> Dict[str, Any]:
+        """One entity in the JSON:API shape of api.gleif.org/api/v1/lei-records"""
+        return {
+            "type": "lei-records",
+            "id": entity["lei"],
+            "attributes": {
+                "lei": entity["lei"],
+                "entity": {
+                    "legalName": {"name": entity["legal_name"]},
+                    "legalAddress": {"country": entity["country"]},
+                    "jurisdiction": entity["jurisdiction"],
+                    "legalForm": {"id": entity["legal_form"]},
+                    "status": entity["entity_status"]
+                },
+                "registration": {"status": entity["registration_status"]}
+            }
+        }
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """Answer a GLEIF lei-records URL from the mirror, like requests.get would"""
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if params:
+            query.update((key, str(value)) for key, value in params.items())
+        path = unquote(parts.path).rstrip("/")
+        _, found, rest = path.partition("/lei-records")
+        if not found:
+            return self._response(url, 404, {"errors": [{"status": "404", "title": "Not Found"}]})
+        segments = [segment for segment in rest.split("/") if segment]
+
+        if not segments:
+            return self._response(url, 200, self._list(query))
+        lei = segments[0]
+        if len(segments) == 1:
+            entity = self.record(lei)
+            payload = {"data": self.api_record(entity)} if entity else None
+        elif segments[1] in ("direct-parent", "ultimate-parent"):
+            kind = DIRECT_PARENT if segments[1] == "direct-parent" else ULTIMATE_PARENT
+            parents = self.parents(lei, kind)
+            payload = {"data": self.api_record(parents[0])} if parents else None
+        elif segments[1] in ("direct-children", "ultimate-children"):
+            kind = DIRECT_PARENT if segments[1] == "direct-children" else ULTIMATE_PARENT
+            size, number = self._page_params(query)
+            children = self.children(lei, kind, size, (number - 1) * size)
+            total = len(children) if number == 1 and len(children) < size else self.child_count(lei, kind)
+            payload = self._page([self.api_record(child) for child in children], total, number, size)
+        else:
+            payload = None
+        if payload is None:
+            return self._response(url, 404, {"errors": [{"status": "404", "title": "Not Found"}]})
+        return self._response(url, 200, payload)
+
+    def _list(self, query: Dict[str, str]) -> Dict[str, Any]:
+        clauses, params, join = [], [], ""
+        if "filter[entity.legalName]" in query:
+            # Like filter[lei], a comma-separated list matches any of its names (a name with commas still matches)
+            value = query["filter[entity.legalName]"]
+            names = list(dict.fromkeys(normalize_name(name) for name in [value, *value.split(",")]))
+            clauses.append(f"e.normalized_name IN ({', '.join('?' * len(names))})")
+            params.extend(names)
+        if "filter[fulltext]" in query:
+            where, args, join = self._full_text_filter(query["filter[fulltext]"])
+            clauses.append(where)
+            params.extend(args)
+        if "filter[lei]" in query:
+            leis = [lei for lei in query["filter[lei]"].split(",") if lei]
+            clauses.append(f"e.lei IN ({', '.join('?' * len(leis))})" if leis else "0")
+            params.extend(leis)
+        if "filter[entity.jurisdiction]" in query:
+            clauses.append("e.jurisdiction = ?")
+            params.append(query["filter[entity.jurisdiction]"].upper())
+        where = " AND ".join(clauses) or "1"
+
+        size, number = self._page_params(query)
+        entities = self._entities(where, params, size, (number - 1) * size, join=join)
+        total = len(entities) if number == 1 and len(entities) < size else self._count(where, params, join)
+        return self._page([self.api_record(entity) for entity in entities], total, number, size)
+
+    @staticmethod
+    def _page_params(query: Dict[str, str]) -> Tuple[int, int]:
+        """page[size] (capped like the API's) and page[number] of a list request"""
+        size = min(max(int(query.get("page[size]", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        return size, max(int(query.get("page[number]", 1)), 1)
+
+    @staticmethod
+    def _page(records: List[Dict[str, Any]], total: int, number: int, size: int) -> Dict[str, Any]:
+        first = (number - 1) * size + 1
+        return {
+            "meta": {"pagination": {
+                "currentPage": number,
+                "perPage": size,
+                "from": first if records else None,
+                "to": first + len(records) - 1 if records else None,
+                "total": total,
+                "lastPage": max((total + size - 1) // size, 1)
+            }},
+            "data": records
+        }
+
+    @staticmethod
+    def _response(url: str, status: int, payload: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/vnd.api+json"})
+        response._content = json.dumps(payload).encode("utf-8")
+        response.url = url
+        response.encoding = "utf-8"
+        response.from_mirror = True
+        return response
+
+
+_default_mirror: Optional[GleifMirror] = None
+
+
+def default_mirror() -> Optional[GleifMirror]:
+    """Process-wide mirror at GLEIF_MIRROR_PATH, or None when that is unset or missing"""
+    global _default_mirror
+    if _default_mirror is None:
+        path = os.environ.get("GLEIF_MIRROR_PATH")
+        if path and os.path.exists(path):
+            _default_mirror = GleifMirror(path)
+    return _default_mirror
+
+
+def gleif_get(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10,
+              **kwargs) -> requests.Response:
+    """GET a GLEIF API URL from the configured mirror, else through the shared response cache"""
+    mirror = default_mirror()
+    if mirror is not None:
+        return mirror.get(url, headers=headers, timeout=timeout, **kwargs)
+    return default_cache().get(url, headers=headers, timeout=timeout, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query a local GLEIF golden copy mirror")
+    parser.add_argument("--db", default=os.environ.get("GLEIF_MIRROR_PATH", DEFAULT_MIRROR_PATH),
+                        help="Mirror database (default: GLEIF_MIRROR_PATH or output/gleif_mirror.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Import LEI-CDF/RR-CDF files (XML or CSV, optionally zipped)")
+    importer.add_argument("files", nargs="+")
+    search = commands.add_parser("search", help="Full-text legal name search")
+    search.add_argument("text")
+    search.add_argument("--limit", type=int, default=20)
+    lookup = commands.add_parser("lei", help="Show one entity with its parents and children")
+    lookup.add_argument("lei")
+    args = parser.parse_args()
+
+    mirror = GleifMirror(args.db)
+    if args.command == "import":
+        for path in args.files:
+            counts = mirror.import_file(path)
+            print(f"📥 {path}: {counts['entity']} entities, {counts['relationship']} relationships")
+        print(f"🗄️ GLEIF mirror: {mirror.summary()}")
+    elif args.command == "search":
+        for entity in mirror.search(args.text, args.limit):
+            print(f"{entity['lei']}  {entity['legal_name']}  ({entity['jurisdiction'] or entity['country']})")
+    else:
+        entity = mirror.record(args.lei)
+        if entity is None:
+            print(f"❌ {args.lei} not in the mirror")
+            return 1
+        print(f"{entity['lei']}  {entity['legal_name']}  ({entity['jurisdiction'] or entity['country']})")
+        for label, related in (("parent", mirror.parents(args.lei)), ("child", mirror.children(args.lei))):
+            for other in related:
+                print(f"  {label}: {other['lei']}  {other['legal_name']}")
+    mirror.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,104 +1,115 @@
-
-[Travis@Termux] ~ $ proot-distro login ubuntu
-root@localhost:~# python3 scrape_identifiers.py
-[*] Initiating multi-vector extraction...
-[*] Tracking Entity: Target Alpha (SEC Data) | Bypassing perimeter...
-[+] Payload secured for Target Alpha (SEC Data) | Target Title: SEC.gov | Request Rate Threshold Exceeded
-[*] Tracking Entity: Target Beta (Test Node) | Bypassing perimeter...
-[+] Payload secured for Target Beta (Test Node) | Target Title: Example Domain
-[+] Operation complete. Awaiting commit to immutable ledger.
-root@localhost:~# nano gleif_scan.py
-root@localhost:~#
-root@localhost:~# python3 gleif_scan.py
-[*] Initiating GLEIF Global Network Scan for: Equifax Inc.
-[+] Target Node Verified: EQUIFAX INC.
-    - Cryptographic LEI:  5493004MCF8JDC86VS77
-[*] Extracting Structural Overlay Data...
-    - Entity Status:      ACTIVE
-    - Legal Form Code:    MFYJ
-    - Jurisdiction ID:    US-GA
-[+] Scan complete. Data staged for GIS mapping.
-root@localhost:~# nano gleif_scan.py
-root@localhost:~# python3 gleif_scan.py
-[*] Initiating Recursive Corporate Network Hunt for: Equifax Inc.
-
-[+] BASE TARGET SECURED: EQUIFAX INC. (LEI: 5493004MCF8JDC86VS77)
-[*] Traversing corporate ownership tree...
-
-[-] No ultimate parent found. Target operates as the peak holding entity.
-
-[+] FOUND 1 SUBSIDIARY CHILD-NODE(S):
-    -> [SHIELD] EQUIFAX LUXEMBOURG (NO. 3) S.ÀR.L.
-       LEI: 213800GB3OH2VZTZ5I94 | Jurisdiction: LU
-
-[+] Recursive traversal complete. Network mapped.
-root@localhost:~# cat gleif_scan.py
-import urllib.request
-import urllib.parse
+"""
+GLEIF recursive corporate network hunt
+
+Looks up a legal entity by name, then walks its ownership tree in the
+GLEIF registry breadth-first (ownership_tree.py): direct and ultimate
+parents and every page of direct children, to --depth levels, one
+concurrent batch of requests per level. The tree is written as JSON to
+output/gleif_ownership_tree.json. Lookups go through the shared response
+cache, or the local GLEIF mirror when GLEIF_MIRROR_PATH is set.
+
+Usage:
+  python gleif_scan.py "Equifax Inc." --depth 4 --per-host 8
+"""
+import os
 import json
+import argparse
+from pathlib import Path
+from response_cache import default_cache
+from http_client import default_client
+from gleif_mirror import DIRECT_PARENT, default_mirror
+from fetch_engine import DEFAULT_PER_HOST_LIMIT
+from ownership_tree import DEFAULT_DEPTH, DEFAULT_RELATIONS, RELATIONS, OwnershipTraversal
+
+DEFAULT_TREE_PATH = str(Path(__file__).parent / "output" / "gleif_ownership_tree.json")
 
-def fetch_api(url):
-    """Helper function to execute silent API requests."""
-    req = urllib.request.Request(url, headers={'Accept': 'application/vnd.api+json'})
-    try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except Exception as e:
-        return None
 
-def execute_recursive_hunt(target_name):
+def describe(node):
+    """Display name and LEI/jurisdiction line for a tree node"""
+    return node.get("name") or "UNKNOWN", f"LEI: {node['lei']} | Jurisdiction: {node.get('jurisdiction')}"
+
+
+def execute_recursive_hunt(target_name, depth=DEFAULT_DEPTH, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                           relations=DEFAULT_RELATIONS, output_path=DEFAULT_TREE_PATH, traversal=None):
     print(f"[*] Initiating Recursive Corporate Network Hunt for: {target_name}")
+    traversal = traversal or OwnershipTraversal(per_host_limit=per_host_limit, relations=relations)
 
     # Step 1: Base Entity Extraction
-    safe_target = urllib.parse.quote(target_name)
-    base_url = f"https://api.gleif.org/api/v1/lei-records?filter[entity.legalName]={safe_target}"
-    base_payload = fetch_api(base_url)
-
-    if not base_payload or not base_payload.get('data'):
+    roots = traversal.find(target_name)
+    if not roots:
         print("[!] Target masking detected. Base LEI not found.")
-        return
-
-    node = base_payload['data'][0]
-    base_lei = node['attributes']['lei']
-    base_name = node['attributes']['entity']['legalName']['name']
-
-    print(f"\n[+] BASE TARGET SECURED: {base_name} (LEI: {base_lei})")
-    print("[*] Traversing corporate ownership tree...")
-
-    # Step 2: Extract Direct Parent (Who owns them?)
-    parent_url = f"https://api.gleif.org/api/v1/lei-records/{base_lei}/direct-parent"
-    parent_payload = fetch_api(parent_url)
-
-    if parent_payload and parent_payload.get('data'):
-        parent_data = parent_payload['data']
-        # Handle JSON array structure if multiple/single parent
-        p_node = parent_data[0] if isinstance(parent_data, list) else parent_data
-        p_name = p_node['attributes']['entity']['legalName']['name']
-        p_lei = p_node['attributes']['lei']
-        p_jur = p_node['attributes']['entity']['jurisdiction']
-        print(f"\n[+] PARENT NODE DISCOVERED:")
-        print(f"    <- [OWNER] {p_name}")
-        print(f"       LEI: {p_lei} | Jurisdiction: {p_jur}")
+        return None
+
+    for lei in roots:
+        print(f"\n[+] BASE TARGET SECURED: {traversal.nodes[lei]['name']} (LEI: {lei})")
+    print(f"[*] Traversing corporate ownership tree ({depth} levels)...")
+
+    # Step 2: Breadth-first traversal of parents and children
+    tree = traversal.traverse(roots, depth)
+    nodes = tree["nodes"]
+
+    # The direct parent is often the ultimate parent too; show it once
+    parents = {}
+    for edge in tree["edges"]:
+        if edge["child"] in roots and edge["parent"] in nodes:
+            parents.setdefault(edge["parent"], []).append(edge["relationship"])
+    if parents:
+        print("\n[+] PARENT NODE(S) DISCOVERED:")
+        for lei, relationships in parents.items():
+            name, detail = describe(nodes[lei])
+            print(f"    <- [OWNER] {name} ({', '.join(relationships)})")
+            print(f"       {detail}")
     else:
         print("\n[-] No ultimate parent found. Target operates as the peak holding entity.")
 
-    # Step 3: Extract Direct Children (Who do they own?)
-    children_url = f"https://api.gleif.org/api/v1/lei-records/{base_lei}/direct-children"
-    children_payload = fetch_api(children_url)
-
-    if children_payload and children_payload.get('data'):
-        children = children_payload['data']
+    children = [edge for edge in tree["edges"]
+                if edge["parent"] in roots and edge["relationship"] == DIRECT_PARENT]
+    if children:
         print(f"\n[+] FOUND {len(children)} SUBSIDIARY CHILD-NODE(S):")
-        for child in children:
-            c_name = child['attributes']['entity']['legalName']['name']
-            c_lei = child['attributes']['lei']
-            c_jur = child['attributes']['entity']['jurisdiction']
-            print(f"    -> [SHIELD] {c_name}")
-            print(f"       LEI: {c_lei} | Jurisdiction: {c_jur}\n")
+        for edge in children:
+            name, detail = describe(nodes[edge["child"]])
+            print(f"    -> [SHIELD] {name}")
+            print(f"       {detail}\n")
     else:
         print("\n[-] No direct subsidiary nodes exposed in the public registry.")
 
+    stats = tree["stats"]
+    print(f"[+] Ownership tree: {stats['nodes']} nodes, {stats['edges']} relationships, "
+          f"{stats['requests']} requests, {len(tree['frontier'])} unexpanded at depth {depth}")
+    for cycle in tree["cycles"]:
+        print(f"[!] Ownership cycle: {' -> '.join(cycle + cycle[:1])}")
+    if tree["errors"]:
+        print(f"[!] {len(tree['errors'])} lookups failed; their branches may be incomplete")
+
+    if output_path:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(tree, f, indent=2, ensure_ascii=False)
+        print(f"[+] Tree written to {output_path}")
+
     print("[+] Recursive traversal complete. Network mapped.")
+    print(f"[*] Response cache: {default_cache().summary()}")
+    if default_mirror() is not None:
+        print(f"[*] GLEIF mirror: {default_mirror().summary()}")
+    print(f"[*] HTTP client: {default_client().summary()}")
+    print(f"[*] Host health: {default_client().health.summary()}")
+    return tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GLEIF recursive corporate network hunt")
+    parser.add_argument("name", nargs="?", default="Equifax Inc.", help="Legal name to start from")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="Levels of parents/children to follow")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help="Concurrent GLEIF requests")
+    parser.add_argument("--relations", default=",".join(DEFAULT_RELATIONS),
+                        help=f"Comma-separated relations to follow (of {', '.join(RELATIONS)})")
+    parser.add_argument("-o", "--output", default=DEFAULT_TREE_PATH, help="JSON tree output path")
+    args = parser.parse_args()
+    execute_recursive_hunt(args.name, args.depth, args.per_host, args.relations.split(","), args.output)
+
 
 if __name__ == "__main__":
-    execute_recursive_hunt("Equifax Inc.")
\ No newline at end of file
+    main()
@@ -4,6 +4,11 @@ from datetime import datetime
 import hashlib
 import os
 import traceback
+from response_cache import default_cache
+from http_client import default_client
+from gleif_mirror import default_mirror
+from gleif_batch import GleifBatcher, NAME_BATCH_SIZE
+from query_planner import GLEIF, QueryPlanner
 
 print("📡 Modules imported successfully")
 
@@ -33,29 +38,48 @@ IDENTIFIER_PAYLOAD = [
 os.makedirs("output", exist_ok=True)
 log_path = "output/scan_log.txt"
 
+# Only identifiers whose type can match a legal name are sent to GLEIF, with the
+# same unbatched filter[entity.legalName] default as the connections bot
+plan = QueryPlanner().plan(IDENTIFIER_PAYLOAD)
+batcher = GleifBatcher(batch_size=NAME_BATCH_SIZE)
+lookups = batcher.lookup_names(plan.lookups(GLEIF))
+
 with open(log_path, "w") as log:
     for identifier in IDENTIFIER_PAYLOAD:
         print(f"🔍 Scanning external sources for: {identifier}")
         log.write(f"[{datetime.now()}] Scanning: {identifier}\n")
 
+        if identifier not in lookups:
+            print(f"⏭️ Skipped {identifier}: {plan.types[identifier]} identifiers can't match a legal name")
+            log.write(f"[SKIPPED] {identifier}: {plan.types[identifier]}\n")
+            continue
+
         try:
-            query_url = f"https://api.gleif.org/api/v1/lei-records?filter[entity.legalName]={identifier}"
-            response = requests.get(query_url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            records = lookups[identifier].result()
 
-            if data.get("data"):
+            if records:
                 print(f"✅ Match found for {identifier}")
                 log.write(f"[MATCH] {identifier}\n")
             else:
                 print(f"❌ No match for {identifier}")
                 log.write(f"[NO MATCH] {identifier}\n")
 
+        except requests.exceptions.HTTPError as e:
+            print(f"⚠️ GLEIF returned {e} for {identifier}")
+            log.write(f"[HTTP ERROR] {identifier}: {e}\n")
         except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
             print(f"⚠️ Network error scanning {identifier}: Connection failed, running in offline mode")
             log.write(f"[OFFLINE] {identifier}: Network unavailable - {type(e).__name__}\n")
         except Exception as e:
             print(f"⚠️ Error scanning {identifier}: {e}")
             log.write(f"[ERROR] {identifier}: {str(e)}\n")
+batcher.close()
 
 print(f"📄 Scan complete. Log saved to {log_path}")
+print(f"🗄️ Response cache: {default_cache().summary()}")
+print(f"🧭 Query plan: {len(plan.skipped(GLEIF))} of {len(plan.routes)} GLEIF lookups avoided")
+print(f"📦 GLEIF batching: {batcher.summary()}")
+if default_mirror() is not None:
+    print(f"🏛️ GLEIF mirror: {default_mirror().summary()}")
+print(f"🌐 HTTP client: {default_client().summary()}")
+print(f"🩺 Host health: {default_client().health.summary()}")
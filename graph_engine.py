@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Graph engine - immutable CSR adjacency for IdentifierConnectionsBot
+
+Node names are interned to integer ids and each node's neighbors are laid
+out contiguously: indices[offsets[n]:offsets[n + 1]] are the neighbors of
+node n and degree[n] is their count. Rows are deduplicated. A graph built
+from an EdgeStore exports its nodes in the order connections first reached
+them, the key order the original dict-of-sets connection_graph had, with
+the same neighbors in each row (in the store's neighbor order rather than
+set order).
+
+CSRGraph is a read-only Mapping {node: [neighbors]} over its exported
+nodes, and supports neighbor lookup, k-hop expansion, connected
+components and BFS shortest paths in time linear in nodes plus edges.
+"""
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class CSRGraph(Mapping):
+    """Compressed sparse row adjacency with interned node ids"""
+
+    def __init__(self, nodes: List[str], offsets: array, indices: array, keys: array):
+        self.nodes = nodes
+        self.node_ids: Dict[str, int] = {name: node for node, name in enumerate(nodes)}
+        self.offsets = offsets
+        self.indices = indices
+        self.degree = array('I', (offsets[n + 1] - offsets[n] for n in range(len(nodes))))
+        # Exported nodes in order; other nodes (alias targets) are reachable but have no entry
+        self.keys = keys
+        self.key_set = frozenset(keys)
+        # Whether every edge appears in both endpoints' rows
+        self.symmetric = False
+
+    @classmethod
+    def from_rows(cls, nodes: List[str], rows: Iterable[Sequence[int]], keys: Iterable[int]) -> 'CSRGraph':
+        """Build from one deduplicated neighbor-id row per node, in node id order"""
+        offsets = array('Q', [0])
+        indices = array('I')
+        for row in rows:
+            indices.extend(row)
+            offsets.append(len(indices))
+        while len(offsets) <= len(nodes):
+            offsets.append(len(indices))
+        return cls(nodes, offsets, indices, array('I', keys))
+
+    @classmethod
+    def from_edge_store(cls, store) -> 'CSRGraph':
+        """Expand an EdgeStore's explicit edges and rule products into CSR rows
+
+        Exported keys follow store.graph_node_ids(), the first-seen order.
+        """
+        graph = cls.from_rows(list(store.nodes), (store.neighbor_ids(n) for n in range(len(store.nodes))),
+                              store.graph_node_ids())
+        graph.symmetric = not any(store.rule_directed[rule] for rule in store.edge_rule)
+        return graph
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]], directed: bool = False) -> 'CSRGraph':
+        """Build from (source, target) name pairs with dict-of-sets semantics
+
+        Undirected pairs add each endpoint to the other's row; directed pairs
+        only add target to source's row. Duplicate pairs collapse and each
+        row is ordered by neighbor id.
+        """
+        node_ids: Dict[str, int] = {}
+        intern = node_ids.setdefault
+        ids = [intern(name, len(node_ids)) for pair in pairs for name in pair]
+        count = len(node_ids)
+        src, dst = ids[0::2], ids[1::2]
+        del ids
+
+        # Encode each directed edge as one integer so dedupe and row sort run in C
+        encoded = {u * count + v for u, v in zip(src, dst)}
+        if directed:
+            keys = array('I', dict.fromkeys(src))
+        else:
+            encoded.update(v * count + u for u, v in zip(src, dst))
+            keys = array('I', range(count))
+        del src, dst
+        edges = sorted(encoded)
+        del encoded
+
+        indices = array('I', [e % count for e in edges]) if count else array('I')
+        offsets = array('Q', (bisect_left(edges, node * count) for node in range(count + 1)))
+        graph = cls(list(node_ids), offsets, indices, keys)
+        graph.symmetric = not directed
+        return graph
+
+    def neighbor_ids(self, node: int) -> array:
+        return self.indices[self.offsets[node]:self.offsets[node + 1]]
+
+    def neighbors(self, name: str) -> List[str]:
+        """Neighbors of a node by name (empty for nodes with no outgoing edges)"""
+        return [self.nodes[v] for v in self.neighbor_ids(self.node_ids[name])]
+
+    def degrees(self) -> List[Tuple[str, int]]:
+        """(node, neighbor count) for every exported node, in export order"""
+        return [(self.nodes[n], self.degree[n]) for n in self.keys]
+
+    def _bfs(self, start: int, max_depth: Optional[int] = None, target: Optional[int] = None) -> Tuple[List[int], array]:
+        # Visit order and parent ids (-1 unvisited, start is its own parent)
+        parent = array('q', [-1]) * len(self.nodes)
+        parent[start] = start
+        order = [start]
+        depth = {start: 0} if max_depth is not None else None
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u == target:
+                break
+            if depth is not None and depth[u] >= max_depth:
+                continue
+            for v in self.indices[self.offsets[u]:self.offsets[u + 1]]:
+                if parent[v] == -1:
+                    parent[v] = u
+                    order.append(v)
+                    if depth is not None:
+                        depth[v] = depth[u] + 1
+                    queue.append(v)
+        return order, parent
+
+    def k_hop(self, name: str, k: int) -> List[str]:
+        """Nodes reachable from name in 1..k hops, in BFS order"""
+        order, _ = self._bfs(self.node_ids[name], max_depth=k)
+        return [self.nodes[n] for n in order[1:]]
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Fewest-hop path from source to target as node names, or None"""
+        start, goal = self.node_ids[source], self.node_ids[target]
+        _, parent = self._bfs(start, target=goal)
+        if parent[goal] == -1:
+            return None
+        path = [goal]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        return [self.nodes[n] for n in reversed(path)]
+
+    def connected_components(self) -> List[List[str]]:
+        """Weakly connected components (edge direction ignored), largest first"""
+        if self.symmetric:
+            seen = bytearray(len(self.nodes))
+            components = []
+            for start in range(len(self.nodes)):
+                if seen[start]:
+                    continue
+                seen[start] = 1
+                component = [start]
+                for u in component:
+                    for v in self.indices[self.offsets[u]:self.offsets[u + 1]]:
+                        if not seen[v]:
+                            seen[v] = 1
+                            component.append(v)
+                components.append([self.nodes[n] for n in component])
+            return sorted(components, key=len, reverse=True)
+
+        # Directed rows: union-find over every edge instead of a reverse index
+        parent = array('I', range(len(self.nodes)))
+
+        def find(n: int) -> int:
+            while parent[n] != n:
+                parent[n] = parent[parent[n]]
+                n = parent[n]
+            return n
+
+        for u in range(len(self.nodes)):
+            root_u = find(u)
+            for v in self.indices[self.offsets[u]:self.offsets[u + 1]]:
+                root_v = find(v)
+                if root_v != root_u:
+                    parent[root_v] = root_u
+
+        grouped: Dict[int, List[str]] = {}
+        for n in range(len(self.nodes)):
+            grouped.setdefault(find(n), []).append(self.nodes[n])
+        return sorted(grouped.values(), key=len, reverse=True)
+
+    def nbytes(self) -> int:
+        """Bytes held in the offsets, indices and degree arrays"""
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.indices, self.degree, self.keys))
+
+    def __getitem__(self, name: str) -> List[str]:
+        node = self.node_ids.get(name)
+        if node is None or node not in self.key_set:
+            raise KeyError(name)
+        return [self.nodes[v] for v in self.neighbor_ids(node)]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.nodes[n] for n in self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Host health - per-host circuit breakers for the shared HTTP client
+
+A host's breaker opens after a run of consecutive failed attempts
+(connection errors, timeouts and 5xx responses). While it is open, requests
+to that host fail immediately with HostUnavailable, a requests
+ConnectionError, so scanners drop straight into their offline fallback
+instead of waiting out a timeout per identifier. Once the reset timeout
+has passed the breaker goes half-open and lets a single probe through:
+success closes it, failure opens it again for another reset period.
+"""
+import time
+import threading
+from typing import Any, Callable, Dict
+from urllib.parse import urlsplit
+
+import requests
+
+# Consecutive failed attempts before a host's breaker opens
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Seconds an open breaker waits before letting a half-open probe through
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class HostUnavailable(requests.exceptions.ConnectionError):
+    """Raised instead of a request while the host's breaker is open
+
+    attempts is the number of requests already sent for the call the
+    breaker cut short (0 when nothing reached the network).
+    """
+
+    attempts = 0
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for a single host"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.trips = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Whether a request may be attempted now"""
+        if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and
+                                       self.consecutive_failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = self.clock()
+            self.probe_in_flight = False
+            self.trips += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited
+        }
+
+
+class HostHealth:
+    """Circuit breakers keyed by host"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock)
+            self.breakers[host] = breaker
+        return breaker
+
+    def check(self, url: str) -> None:
+        """Raise HostUnavailable if the URL's host breaker rejects the request"""
+        with self.lock:
+            allowed = self._breaker(url).allow()
+        if not allowed:
+            raise HostUnavailable(f"{urlsplit(url).netloc} is unavailable (circuit open)")
+
+    def record_success(self, url: str) -> None:
+        with self.lock:
+            self._breaker(url).record_success()
+
+    def record_failure(self, url: str) -> None:
+        with self.lock:
+            self._breaker(url).record_failure()
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state per host, for scan metadata"""
+        with self.lock:
+            return {host: breaker.snapshot() for host, breaker in sorted(self.breakers.items())}
+
+    def summary(self) -> str:
+        """One-line description of breaker states for script output"""
+        parts = [
+            f"{host}: {s['state']} ({s['trips']} trips, {s['short_circuited']} short-circuited)"
+            for host, s in self.state().items()
+        ]
+        return "; ".join(parts) or "no hosts"
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+HTTP client - pooled, retrying GET layer shared by all scanners
+
+Keeps one requests.Session per host so connections are reused across
+lookups instead of paying a new TCP/TLS handshake for every request.
+Connection errors, timeouts and retryable statuses (429 and 5xx gateway
+errors) are retried with exponential backoff and full jitter, waiting for
+the server's Retry-After instead when one is given. Every request records
+its status, attempts and latency so scripts can report p50/p99 per host.
+
+Each attempt is reported to a HostHealth tracker; once a host's circuit
+breaker opens, requests to it fail fast with HostUnavailable instead of
+waiting out the timeout.
+
+HttpClient.get is a drop-in for requests.get: after the last attempt it
+returns the final response or raises the final exception, so callers keep
+their existing status checks and offline handling.
+"""
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from host_health import HostHealth, HostUnavailable
+
+# Connections kept alive per host
+DEFAULT_POOL_SIZE = 10
+
+# Retries after the first attempt, and the backoff bounds in seconds
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_TIMEOUT = 10
+
+
+class HttpClient:
+    """Per-host pooled sessions with retry, backoff and request metrics"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 retry_statuses=RETRY_STATUSES, sleep: Callable[[float], None] = time.sleep,
+                 health: Optional[HostHealth] = None):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+        self.sleep = sleep
+        self.health = health or HostHealth()
+
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, requests.Session] = {}
+        self.metrics: List[Dict[str, Any]] = []
+
+    def session_for(self, url: str) -> requests.Session:
+        """Pooled session for the URL's scheme and host, created on first use"""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc.lower()}"
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[key] = session
+        return session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+        """GET url through the host's pooled session, retrying transient failures"""
+        session = self.session_for(url)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.health.check(url)
+            except HostUnavailable as e:
+                e.attempts = attempt - 1
+                if e.attempts:
+                    self._record(url, None, e.attempts, start, e)
+                raise
+
+            try:
+                response = session.get(url, headers=headers, timeout=timeout, **kwargs)
+            except Exception as e:
+                self.health.record_failure(url)
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if not retryable or attempt > self.max_retries:
+                    self._record(url, None, attempt, start, e)
+                    raise
+                self.sleep(self.backoff_delay(attempt))
+                continue
+
+            if response.status_code >= 500:
+                self.health.record_failure(url)
+            else:
+                self.health.record_success(url)
+
+            if response.status_code in self.retry_statuses and attempt <= self.max_retries:
+                delay = self.retry_after(response)
+                response.close()
+                self.sleep(self.backoff_delay(attempt) if delay is None else delay)
+                continue
+
+            self._record(url, response.status_code, attempt, start, None)
+            return response
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given attempt number"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def retry_after(self, response: requests.Response) -> Optional[float]:
+        """Seconds requested by a Retry-After header, capped at backoff_max"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return min(max(delay, 0.0), self.backoff_max)
+
+    def _record(self, url: str, status: Optional[int], attempts: int, start: float,
+                error: Optional[BaseException]) -> None:
+        metric = {
+            "host": urlsplit(url).netloc.lower(),
+            "url": url,
+            "status": status,
+            "attempts": attempts,
+            "elapsed": time.perf_counter() - start,
+            "error": type(error).__name__ if error is not None else None
+        }
+        with self.lock:
+            self.metrics.append(metric)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Request count, retries, errors and p50/p99 latency per host"""
+        with self.lock:
+            metrics = list(self.metrics)
+        by_host: Dict[str, List[Dict[str, Any]]] = {}
+        for metric in metrics:
+            by_host.setdefault(metric["host"], []).append(metric)
+
+        stats = {}
+        for host, host_metrics in sorted(by_host.items()):
+            latencies = sorted(m["elapsed"] for m in host_metrics)
+            stats[host] = {
+                "requests": len(host_metrics),
+                "retries": sum(m["attempts"] - 1 for m in host_metrics),
+                "errors": sum(1 for m in host_metrics if m["error"] is not None),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1)
+            }
+        return stats
+
+    def summary(self) -> str:
+        """One-line description of the per-host stats for script output"""
+        parts = [
+            f"{host}: {s['requests']} requests, {s['retries']} retries, {s['errors']} errors, "
+            f"p50 {s['p50_ms']}ms, p99 {s['p99_ms']}ms"
+            for host, s in self.stats().items()
+        ]
+        return "; ".join(parts) or "no requests"
+
+    def close(self) -> None:
+        """Close every pooled session"""
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    """Process-wide client shared by the scanners and the response cache"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+    return _default_client
@@ -8,23 +8,79 @@ sources and platforms, creating a comprehensive relationship map.
 import os
 import json
 import yaml
+import argparse
 import requests
 import hashlib
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Set, Optional
+from typing import Callable, Dict, List, Any, Mapping, Optional, Set, Tuple
+
+from aho_corasick import AhoCorasick
+from ngram_index import NgramIndex
+from fetch_engine import FetchEngine, DeadlineExceeded, DEFAULT_PER_HOST_LIMIT
+from response_cache import ResponseCache, default_cache
+from http_client import default_client
+from edge_store import EdgeStore, ConnectionList, ProductConnections, dump_json_lazily
+from graph_engine import CSRGraph
+from connection_metrics import ConnectionMetrics
+from connection_store import ConnectionStore
+from scan_checkpoint import ScanCheckpoint, DEFAULT_CHECKPOINT_PATH, scan_fingerprint
+from scan_snapshot import ScanSnapshot, DEFAULT_SNAPSHOT_PATH
+from gleif_mirror import GleifMirror, default_mirror
+from gleif_batch import GleifBatcher, NAME_BATCH_SIZE, records_response
+from query_planner import QueryPlan, QueryPlanner
+from connection_rules import ConnectionRule, JoinPlan, RulePlanner, DEFAULT_RULES, DEFAULT_RULES_PATH, load_rules
+
+REDDIT_SEARCH_URL = "https://www.reddit.com/search.json"
+GLEIF_LEI_RECORDS_URL = "https://api.gleif.org/api/v1/lei-records"
 
 
 class IdentifierConnectionsBot:
     """Advanced bot for discovering all connections between identifiers"""
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 fetch_deadline: Optional[float] = None, response_cache: Optional[ResponseCache] = None,
+                 connection_store: Optional[ConnectionStore] = None, rules_path: str = DEFAULT_RULES_PATH,
+                 gleif_mirror: Optional[GleifMirror] = None, gleif_batch_size: int = NAME_BATCH_SIZE,
+                 query_planner: Optional[QueryPlanner] = None):
         self.verbose = verbose
+        self.response_cache = response_cache or default_cache()
+        self.gleif_mirror = gleif_mirror
+        # Legal names per GLEIF request; 1 (NAME_BATCH_SIZE, the default) sends one request per identifier
+        self.gleif_batch_size = gleif_batch_size
+        self.gleif_batch_stats: Optional[Dict[str, int]] = None
+        self.gleif_batch_errors: List[Dict[str, str]] = []
+        # Routes each identifier to the sources that can answer for its type; None looks up everything everywhere
+        self.query_planner = query_planner
+        self.query_plan: Optional[QueryPlan] = None
+        self.connection_store = connection_store
+        self.checkpoint: Optional[ScanCheckpoint] = None
+        self.scan_snapshot: Optional[ScanSnapshot] = None
+        self.per_host_limit = per_host_limit
+        self.fetch_deadline = fetch_deadline
+        self.reddit_search_url = REDDIT_SEARCH_URL
+        self.gleif_lei_records_url = GLEIF_LEI_RECORDS_URL
         self.identifiers: List[Dict[str, Any]] = []
-        self.connections: List[Dict[str, Any]] = []
-        self.connection_graph: Dict[str, Set[str]] = {}
+        self.metrics = ConnectionMetrics()
+        self.edge_store = EdgeStore()
+        # Connections go into the edge store and metrics as they are added
+        self.connections = ConnectionList(metrics=self.metrics, edge_store=self.edge_store)
+        self.identifier_groups: Optional[Dict[str, int]] = None
+        self.rules_path = rules_path
+        self.connection_rules: Optional[List[ConnectionRule]] = None
+        self.rule_planner: Optional[RulePlanner] = None
+        self.connection_graph: Mapping[str, List[str]] = {}
         self.aliases: List[str] = []
         self.adot_numbers: List[str] = []
+        self.identifier_matcher: Optional[AhoCorasick] = None
+        self.alias_matcher: Optional[AhoCorasick] = None
+        # Alias name parts and ADOT number parts, each with the entries that contain them
+        self.alias_part_index: Optional[NgramIndex] = None
+        self.alias_part_owners: List[List[int]] = []
+        self.adot_part_index: Optional[NgramIndex] = None
+        self.adot_part_owners: List[List[int]] = []
         
     def log(self, message: str, level: str = "INFO") -> None:
         """Log message with timestamp"""
@@ -35,6 +91,9 @@ class IdentifierConnectionsBot:
     
     def load_identifiers(self) -> bool:
         """Load identifiers from JSON file"""
+        self.identifier_matcher = None
+        self.identifier_groups = None
+        self.rule_planner = None
         try:
             identifiers_file = Path(__file__).parent / "identifiers.json"
             with open(identifiers_file, 'r') as f:
@@ -55,6 +114,8 @@ class IdentifierConnectionsBot:
     
     def load_aliases(self) -> bool:
         """Load trust aliases and ADOT numbers from YAML file"""
+        self.alias_matcher = None
+        self.alias_part_index = None
         try:
             yaml_file = Path(__file__).parent / "identifiers.yaml"
             with open(yaml_file, 'r') as f:
@@ -72,14 +133,142 @@ class IdentifierConnectionsBot:
             self.log(f"Error loading aliases: {e}", "ERROR")
             return False
     
-    def find_reddit_connections(self, identifier: str) -> List[Dict[str, Any]]:
-        """Search Reddit for mentions that might indicate connections"""
+    def load_connection_rules(self) -> bool:
+        """Load cross-identifier connection rules from connection_rules.yaml"""
+        try:
+            self.connection_rules = load_rules(self.rules_path)
+            self.log(f"Loaded {len(self.connection_rules)} connection rules", "SUCCESS")
+            return True
+        except FileNotFoundError:
+            self.log(f"{Path(self.rules_path).name} not found, using default connection rules", "WARNING")
+            self.connection_rules = list(DEFAULT_RULES)
+            return False
+    
+    def build_mention_matchers(self) -> None:
+        """Build the identifier and alias matchers used to scan post text"""
+        self.identifier_matcher = AhoCorasick(ident["identifier"] for ident in self.identifiers)
+        self.alias_matcher = AhoCorasick(self.aliases, ignore_case=True)
+    
+    def find_mentions(self, identifier: str, title: str, selftext: str) -> Tuple[List[str], List[str]]:
+        """Return (other identifiers, aliases) mentioned in a post's title or selftext"""
+        if self.identifier_matcher is None or self.alias_matcher is None:
+            self.build_mention_matchers()
+        
+        identifier_hits = self.identifier_matcher.find(title) | self.identifier_matcher.find(selftext)
+        alias_hits = self.alias_matcher.find(title) | self.alias_matcher.find(selftext)
+        
+        mentioned_identifiers = [
+            self.identifiers[index]["identifier"] for index in sorted(identifier_hits)
+            if self.identifiers[index]["identifier"] != identifier
+        ]
+        mentioned_aliases = [self.aliases[index] for index in sorted(alias_hits)]
+        return mentioned_identifiers, mentioned_aliases
+    
+    def reddit_request(self, identifier: str) -> Dict[str, Any]:
+        """Build the Reddit search request for an identifier"""
+        return {
+            "key": identifier,
+            "url": f"{self.reddit_search_url}?q={identifier}&limit=20",
+            "headers": {"User-Agent": "IdentifierConnectionsBot/1.0"}
+        }
+    
+    def gleif_request(self, identifier: str) -> Dict[str, Any]:
+        """Build the GLEIF legal-name lookup request for an identifier"""
+        return {
+            "key": identifier,
+            "url": f"{self.gleif_lei_records_url}?filter[entity.legalName]={identifier}",
+            "headers": None
+        }
+    
+    def lookup_get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the response cache, answering GLEIF lookups from the local mirror when there is one"""
+        if self.gleif_mirror is not None and url.startswith(self.gleif_lei_records_url):
+            return self.gleif_mirror.get(url, **kwargs)
+        return self.response_cache.get(url, **kwargs)
+    
+    def fetch_external_lookups(self, reddit_identifiers: Optional[List[str]] = None,
+                               gleif_identifiers: Optional[List[str]] = None,
+                               on_result: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
+                               ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run the Reddit and GLEIF lookups for every identifier concurrently
+        
+        Returns the Reddit and GLEIF fetch results, each in identifier order.
+        The identifier lists limit each source's lookups (default: all), and
+        ``on_result(source, identifier, result)`` is called as each one finishes.
+        
+        GLEIF legal-name lookups are batched gleif_batch_size names per
+        request (gleif_batch.py); each identifier's result still carries a
+        response holding just the records for its name.
+        """
+        all_identifiers = [ident["identifier"] for ident in self.identifiers]
+        reddit_identifiers = all_identifiers if reddit_identifiers is None else reddit_identifiers
+        gleif_identifiers = all_identifiers if gleif_identifiers is None else gleif_identifiers
+        batched = self.gleif_batch_size > 1
+        fetch_requests = [self.reddit_request(i) for i in reddit_identifiers]
+        if not batched:
+            fetch_requests += [self.gleif_request(i) for i in gleif_identifiers]
+        
+        def finished(index: int, result: Dict[str, Any]) -> None:
+            if index < len(reddit_identifiers):
+                on_result("Reddit", reddit_identifiers[index], result)
+            else:
+                on_result("GLEIF", gleif_identifiers[index - len(reddit_identifiers)], result)
+        
+        # Queue the GLEIF batches first so they run alongside the Reddit fetch
+        start = time.perf_counter()
+        batcher = None
+        if batched:
+            batcher = GleifBatcher(get=self.lookup_get, batch_size=self.gleif_batch_size,
+                                   max_concurrent=self.per_host_limit, api=self.gleif_lei_records_url)
+            futures = [batcher.lookup_name(identifier) for identifier in gleif_identifiers]
+            batcher.flush()
+        
+        engine = FetchEngine(per_host_limit=self.per_host_limit, deadline=self.fetch_deadline,
+                             get=self.lookup_get)
+        results = engine.fetch_all(fetch_requests, on_result=finished if on_result is not None else None)
+        if batcher is None:
+            return results[:len(reddit_identifiers)], results[len(reddit_identifiers):]
+        
+        gleif_results = []
+        for identifier, future in zip(gleif_identifiers, futures):
+            request = self.gleif_request(identifier)
+            result = {'key': identifier, 'url': request["url"], 'response': None, 'error': None, 'elapsed': 0.0}
+            remaining = None if self.fetch_deadline is None else max(start + self.fetch_deadline - time.perf_counter(), 0)
+            try:
+                result['response'] = records_response(request["url"], future.result(timeout=remaining))
+            except requests.exceptions.HTTPError as e:
+                # Handled like an unbatched lookup answered with the same status
+                result['response'] = e.response
+            except FutureTimeout:
+                result['error'] = DeadlineExceeded(f"Deadline of {self.fetch_deadline}s exceeded")
+            except Exception as e:
+                result['error'] = e
+            result['elapsed'] = time.perf_counter() - start
+            gleif_results.append(result)
+            if on_result is not None:
+                on_result("GLEIF", identifier, result)
+        # Batches still running past the deadline are left to finish in the background
+        batcher.close(wait=all(result['error'] is None for result in gleif_results))
+        self.gleif_batch_stats = batcher.stats()
+        self.gleif_batch_errors = list(batcher.errors)
+        return results, gleif_results
+    
+    def find_reddit_connections(self, identifier: str, fetched: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search Reddit for mentions that might indicate connections
+        
+        ``fetched`` is a FetchEngine result for reddit_request(identifier);
+        without it the search request is made here.
+        """
         connections = []
         try:
-            headers = {"User-Agent": "IdentifierConnectionsBot/1.0"}
-            url = f"https://www.reddit.com/search.json?q={identifier}&limit=20"
+            if fetched is None:
+                request = self.reddit_request(identifier)
+                response = self.response_cache.get(request["url"], headers=request["headers"], timeout=10)
+            elif fetched["error"] is not None:
+                raise fetched["error"]
+            else:
+                response = fetched["response"]
             
-            response = requests.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 posts = data.get("data", {}).get("children", [])
@@ -89,18 +278,8 @@ class IdentifierConnectionsBot:
                     title = post_data.get("title", "")
                     selftext = post_data.get("selftext", "")
                     
-                    # Check if any other identifiers are mentioned
-                    mentioned_identifiers = []
-                    for other_ident in self.identifiers:
-                        other_id = other_ident["identifier"]
-                        if other_id != identifier and (other_id in title or other_id in selftext):
-                            mentioned_identifiers.append(other_id)
-                    
-                    # Check if any aliases are mentioned
-                    mentioned_aliases = []
-                    for alias in self.aliases:
-                        if alias.lower() in title.lower() or alias.lower() in selftext.lower():
-                            mentioned_aliases.append(alias)
+                    # Check if any other identifiers or aliases are mentioned
+                    mentioned_identifiers, mentioned_aliases = self.find_mentions(identifier, title, selftext)
                     
                     if mentioned_identifiers or mentioned_aliases:
                         connections.append({
@@ -135,14 +314,22 @@ class IdentifierConnectionsBot:
         
         return connections
     
-    def find_gleif_connections(self, identifier: str) -> List[Dict[str, Any]]:
-        """Search GLEIF for entity connections"""
+    def find_gleif_connections(self, identifier: str, fetched: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search GLEIF for entity connections
+        
+        ``fetched`` is a FetchEngine result for gleif_request(identifier);
+        without it the lookup request is made here.
+        """
         connections = []
         try:
             # Try searching by identifier
-            url = f"https://api.gleif.org/api/v1/lei-records?filter[entity.legalName]={identifier}"
+            if fetched is None:
+                response = self.lookup_get(self.gleif_request(identifier)["url"], timeout=10)
+            elif fetched["error"] is not None:
+                raise fetched["error"]
+            else:
+                response = fetched["response"]
             
-            response = requests.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 records = data.get("data", [])
@@ -150,6 +337,9 @@ class IdentifierConnectionsBot:
                 for record in records:
                     entity = record.get("attributes", {}).get("entity", {})
                     legal_name = entity.get("legalName", "")
+                    if isinstance(legal_name, dict):
+                        # api.gleif.org and the mirror nest the name as {"name": ...}
+                        legal_name = legal_name.get("name", "")
                     lei = record.get("id", "")
                     
                     # Check if this entity mentions any aliases
@@ -187,162 +377,238 @@ class IdentifierConnectionsBot:
         
         return connections
     
-    def find_cross_identifier_connections(self) -> List[Dict[str, Any]]:
-        """Find connections between identifiers based on patterns and relationships"""
-        connections = []
-        
-        # Group identifiers by type
-        identifier_groups = {}
-        for ident in self.identifiers:
-            source = ident.get("source", "Unknown")
-            if source not in identifier_groups:
-                identifier_groups[source] = []
-            identifier_groups[source].append(ident["identifier"])
-        
-        # Create connections between related types
-        connection_rules = [
-            ("EIN", "EntityName", "Entity-Tax_ID_Relationship"),
-            ("SSN", "BirthRegNum", "Person-Birth_Record_Relationship"),
-            ("Address", "PropertyRecord", "Location-Property_Relationship"),
-            ("ADOTCust", "Address", "Customer-Location_Relationship"),
-            ("CSECase", "SSN", "Case-Person_Relationship"),
-            ("IRSTrack", "EIN", "Tax_Tracking-Entity_Relationship")
-        ]
-        
-        for source1, source2, relationship_type in connection_rules:
-            if source1 in identifier_groups and source2 in identifier_groups:
-                for ident1 in identifier_groups[source1]:
-                    for ident2 in identifier_groups[source2]:
-                        connections.append({
-                            "source": "Cross-Identifier_Analysis",
-                            "identifier_1": ident1,
-                            "identifier_2": ident2,
-                            "relationship_type": relationship_type,
-                            "confidence": "high",
-                            "timestamp": datetime.now(timezone.utc).isoformat()
-                        })
-        
+    def build_identifier_groups(self) -> Dict[str, int]:
+        """Register one edge-store group per identifier source, once per load"""
+        if self.identifier_groups is None:
+            members: Dict[str, List[str]] = {}
+            for ident in self.identifiers:
+                members.setdefault(ident.get("source", "Unknown"), []).append(ident["identifier"])
+            self.identifier_groups = {
+                source: self.edge_store.add_group(source, group) for source, group in members.items()
+            }
+            self.rule_planner = RulePlanner(members, self.identifier_groups)
+        return self.identifier_groups
+    
+    def plan_cross_identifier_connections(self) -> List[JoinPlan]:
+        """Compile the connection rules into joins and count their edges, adding nothing yet"""
+        if self.connection_rules is None:
+            self.load_connection_rules()
+        self.build_identifier_groups()
+        return self.rule_planner.plan_all(self.connection_rules)
+    
+    def find_cross_identifier_connections(self) -> ProductConnections:
+        """Find connections between identifiers based on patterns and relationships
+        
+        Rules come from connection_rules.yaml. An unkeyed rule is stored once
+        in the edge store as a product of two source groups; a keyed rule is
+        planned as a hash join and stored as one product per group of
+        identifiers sharing the same keys. The returned sequence expands the
+        pairs only when iterated.
+        """
+        timestamp = datetime.now(timezone.utc).isoformat()
+        products = []
+        for plan in self.plan_cross_identifier_connections():
+            products.extend(self.rule_planner.materialize(
+                self.edge_store, plan, source="Cross-Identifier_Analysis", confidence="high", timestamp=timestamp
+            ))
+        
+        connections = self.edge_store.product_connections(products)
         self.log(f"Found {len(connections)} cross-identifier connections", "SUCCESS")
         return connections
     
+    @staticmethod
+    def index_parts(entries: List[List[str]], ignore_case: bool) -> Tuple[NgramIndex, List[List[int]]]:
+        """N-gram index over the distinct parts of entries, with the entry indices owning each part"""
+        owners: Dict[str, List[int]] = {}
+        for index, parts in enumerate(entries):
+            for part in parts:
+                owned = owners.setdefault(part.lower() if ignore_case else part, [])
+                if not owned or owned[-1] != index:
+                    owned.append(index)
+        return NgramIndex(owners, ignore_case=ignore_case), list(owners.values())
+    
+    def build_alias_index(self) -> None:
+        """Index alias name parts and ADOT number parts for alias connection matching"""
+        self.alias_part_index, self.alias_part_owners = self.index_parts(
+            [alias.split() for alias in self.aliases], ignore_case=True)
+        self.adot_part_index, self.adot_part_owners = self.index_parts(
+            [adot.split("-") for adot in self.adot_numbers], ignore_case=False)
+    
     def find_alias_connections(self) -> List[Dict[str, Any]]:
         """Find connections between identifiers and aliases"""
+        self.build_alias_index()
         connections = []
-        
         for ident in self.identifiers:
-            identifier = ident["identifier"]
-            
-            # Check if identifier contains any alias text
-            for alias in self.aliases:
-                if any(part.lower() in identifier.lower() for part in alias.split()):
-                    connections.append({
-                        "source": "Alias_Match",
-                        "identifier": identifier,
-                        "alias": alias,
-                        "match_type": "name_component",
-                        "confidence": "high",
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
-            
-            # Check ADOT number connections
-            for adot in self.adot_numbers:
-                if "ADOT" in identifier and any(part in identifier for part in adot.split("-")):
-                    connections.append({
-                        "source": "ADOT_Reference",
-                        "identifier": identifier,
-                        "adot_number": adot,
-                        "match_type": "reference_number",
-                        "confidence": "medium",
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
+            connections.extend(self.find_identifier_alias_connections(ident["identifier"]))
         
         self.log(f"Found {len(connections)} alias-based connections", "SUCCESS")
         return connections
     
-    def build_connection_graph(self):
-        """Build a graph representation of all connections"""
-        for connection in self.connections:
-            # Add nodes and edges based on connection type
-            if "identifier_1" in connection and "identifier_2" in connection:
-                id1 = connection["identifier_1"]
-                id2 = connection["identifier_2"]
-                
-                if id1 not in self.connection_graph:
-                    self.connection_graph[id1] = set()
-                if id2 not in self.connection_graph:
-                    self.connection_graph[id2] = set()
-                
-                self.connection_graph[id1].add(id2)
-                self.connection_graph[id2].add(id1)
-            
-            elif "identifier" in connection:
-                identifier = connection["identifier"]
-                if identifier not in self.connection_graph:
-                    self.connection_graph[identifier] = set()
-                
-                # Add alias connections
-                if "alias" in connection:
-                    self.connection_graph[identifier].add(connection["alias"])
+    def find_identifier_alias_connections(self, identifier: str) -> List[Dict[str, Any]]:
+        """Alias and ADOT number connections for one identifier
+        
+        An alias matches when any of its words occurs in the identifier
+        (ignoring case); an ADOT number matches an identifier containing
+        "ADOT" and any of the number's dash-separated parts. Only entries
+        owning a part the n-gram indexes find in the identifier are visited,
+        in list order.
+        """
+        if self.alias_part_index is None:
+            self.build_alias_index()
+        connections = []
+        
+        # Check if identifier contains any alias text
+        matched = set()
+        for part in self.alias_part_index.find(identifier):
+            matched.update(self.alias_part_owners[part])
+        for index in sorted(matched):
+            connections.append({
+                "source": "Alias_Match",
+                "identifier": identifier,
+                "alias": self.aliases[index],
+                "match_type": "name_component",
+                "confidence": "high",
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            })
         
+        # Check ADOT number connections
+        if "ADOT" in identifier:
+            matched = set()
+            for part in self.adot_part_index.find(identifier):
+                matched.update(self.adot_part_owners[part])
+            for index in sorted(matched):
+                connections.append({
+                    "source": "ADOT_Reference",
+                    "identifier": identifier,
+                    "adot_number": self.adot_numbers[index],
+                    "match_type": "reference_number",
+                    "confidence": "medium",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                })
+        
+        return connections
+    
+    def find_checkpointed_connections(self, checkpoint: ScanCheckpoint) -> None:
+        """Collect Reddit, GLEIF, cross-identifier and alias connections, skipping checkpointed lookups
+        
+        With a query planner, each identifier is only looked up in the
+        sources its type can match (query_planner.py).
+        """
+        identifiers = [ident["identifier"] for ident in self.identifiers]
+        reddit_done = checkpoint.completed("Reddit")
+        gleif_done = checkpoint.completed("GLEIF")
+        
+        # Failed lookups keep their offline fallback connections but are retried on resume
+        failed: Dict[str, Dict[str, List[Dict[str, Any]]]] = {"Reddit": {}, "GLEIF": {}}
+        # Lookups the query plan skips for their identifier type add no connections
+        skipped: Dict[str, Set[str]] = {"Reddit": set(), "GLEIF": set()}
+        finders = {"Reddit": self.find_reddit_connections, "GLEIF": self.find_gleif_connections}
+        
+        def finished(source: str, identifier: str, fetched: Dict[str, Any]) -> None:
+            connections = finders[source](identifier, fetched)
+            if fetched["error"] is None:
+                checkpoint.record(source, identifier, connections)
+            else:
+                failed[source][identifier] = connections
+        
+        self.build_mention_matchers()
+        self.log("Searching for Reddit and GLEIF connections concurrently...", "INFO")
+        unique = list(dict.fromkeys(identifiers))
+        reddit_lookups, gleif_lookups = unique, unique
+        self.query_plan = None
+        if self.query_planner is not None:
+            self.query_plan = self.query_planner.plan(unique)
+            reddit_lookups, gleif_lookups = self.query_plan.lookups("Reddit"), self.query_plan.lookups("GLEIF")
+            skipped = {source: set(self.query_plan.skipped(source)) for source in skipped}
+            self.log(f"Query plan: {self.query_plan.summary()}", "INFO")
+        self.fetch_external_lookups([i for i in reddit_lookups if i not in reddit_done],
+                                    [i for i in gleif_lookups if i not in gleif_done], on_result=finished)
+        
+        for source, done in (("Reddit", reddit_done), ("GLEIF", gleif_done)):
+            for identifier in identifiers:
+                if identifier in done:
+                    self.connections.extend(done[identifier])
+                elif identifier not in skipped[source]:
+                    self.connections.extend(failed[source][identifier])
+        
+        self.log("Analyzing cross-identifier connections...", "INFO")
+        cross_conns = self.find_cross_identifier_connections()
+        self.connections.extend(cross_conns)
+        
+        self.log("Analyzing alias connections...", "INFO")
+        self.build_alias_index()
+        alias_done = checkpoint.completed("Alias")
+        alias_count = 0
+        for identifier in identifiers:
+            if identifier not in alias_done:
+                checkpoint.record("Alias", identifier, self.find_identifier_alias_connections(identifier))
+            self.connections.extend(alias_done[identifier])
+            alias_count += len(alias_done[identifier])
+        self.log(f"Found {alias_count} alias-based connections", "SUCCESS")
+    
+    def build_connection_graph(self):
+        """Build a graph representation of all connections
+        
+        Every connection is already in the edge store, added as it joined
+        self.connections with its nodes in first-seen order, so the graph
+        keys (and ties among the most connected identifiers) follow the
+        order connections were found. This freezes the store into a CSR
+        graph.
+        """
+        self.connection_graph = CSRGraph.from_edge_store(self.edge_store)
         self.log(f"Built connection graph with {len(self.connection_graph)} nodes", "SUCCESS")
     
     def calculate_connection_metrics(self) -> Dict[str, Any]:
-        """Calculate metrics about the connection network"""
-        metrics = {
-            "total_connections": len(self.connections),
-            "connection_types": {},
-            "most_connected_identifiers": [],
-            "connection_sources": {},
-            "relationship_types": {}
-        }
-        
-        # Count connections by type
-        for conn in self.connections:
-            source = conn.get("source", "Unknown")
-            metrics["connection_sources"][source] = metrics["connection_sources"].get(source, 0) + 1
-            
-            if "relationship_type" in conn:
-                rel_type = conn["relationship_type"]
-                metrics["relationship_types"][rel_type] = metrics["relationship_types"].get(rel_type, 0) + 1
-        
-        # Find most connected identifiers
-        connection_counts = [(node, len(connections)) for node, connections in self.connection_graph.items()]
-        connection_counts.sort(key=lambda x: x[1], reverse=True)
-        metrics["most_connected_identifiers"] = [
-            {"identifier": node, "connection_count": count}
-            for node, count in connection_counts[:5]
-        ]
+        """Calculate metrics about the connection network
         
-        return metrics
+        Source and relationship counts and node degrees are kept up to date
+        as connections are added, so this only reads the running aggregator
+        and can be called at any point of a scan.
+        """
+        return self.metrics.snapshot()
     
-    def run_comprehensive_scan(self) -> Dict[str, Any]:
-        """Run comprehensive connection discovery scan"""
+    def dry_run_connection_rules(self) -> List[JoinPlan]:
+        """Load identifiers and rules and report the edges each rule would add, without scanning"""
+        self.load_identifiers()
+        self.load_connection_rules()
+        plans = self.plan_cross_identifier_connections()
+        for plan in plans:
+            self.log(f"{plan.rule.relationship_type}: {plan.edge_count} edges "
+                     f"in {len(plan.blocks)} blocks ({plan.rule.describe()})", "INFO")
+        return plans
+    
+    def run_comprehensive_scan(self, checkpoint: Optional[ScanCheckpoint] = None,
+                               resume: bool = False, snapshot: Optional[ScanSnapshot] = None) -> Dict[str, Any]:
+        """Run comprehensive connection discovery scan
+        
+        With a checkpoint, every Reddit, GLEIF and alias lookup is recorded as
+        it completes; with resume, lookups it already holds for the same
+        identifiers and aliases are skipped and their connections merged back
+        in order. With a snapshot, lookups stored by the last incremental run
+        are reused the same way, so only added identifiers are looked up, and
+        save_results updates the snapshot. Cross-identifier rules are always
+        rebuilt, as they are group products made in one pass over the
+        identifiers.
+        """
         self.log("Starting Identifier Connections Bot comprehensive scan...", "INFO")
         
         # Load data
         self.load_identifiers()
         self.load_aliases()
-        
-        # Find connections from all sources
-        self.log("Searching for Reddit connections...", "INFO")
-        for ident in self.identifiers:
-            identifier = ident["identifier"]
-            reddit_conns = self.find_reddit_connections(identifier)
-            self.connections.extend(reddit_conns)
-        
-        self.log("Searching for GLEIF connections...", "INFO")
-        for ident in self.identifiers:
-            identifier = ident["identifier"]
-            gleif_conns = self.find_gleif_connections(identifier)
-            self.connections.extend(gleif_conns)
-        
-        self.log("Analyzing cross-identifier connections...", "INFO")
-        cross_conns = self.find_cross_identifier_connections()
-        self.connections.extend(cross_conns)
-        
-        self.log("Analyzing alias connections...", "INFO")
-        alias_conns = self.find_alias_connections()
-        self.connections.extend(alias_conns)
+        self.load_connection_rules()
+        
+        checkpoint = checkpoint or ScanCheckpoint(path=None)
+        self.checkpoint = checkpoint
+        self.scan_snapshot = snapshot
+        if checkpoint.open(scan_fingerprint(self.identifiers, self.aliases, self.adot_numbers), resume):
+            self.log(f"Checkpoint: {checkpoint.summary()}", "SUCCESS")
+        if snapshot is not None:
+            snapshot.seed(checkpoint, self.identifiers, self.aliases, self.adot_numbers)
+            self.log(f"Snapshot: {snapshot.summary()}", "SUCCESS")
+        try:
+            self.find_checkpointed_connections(checkpoint)
+        finally:
+            checkpoint.close()
         
         # Build connection graph
         self.log("Building connection graph...", "INFO")
@@ -358,15 +624,17 @@ class IdentifierConnectionsBot:
                 "version": "1.0",
                 "scan_timestamp": datetime.now(timezone.utc).isoformat(),
                 "total_identifiers_scanned": len(self.identifiers),
-                "total_connections_found": len(self.connections)
+                "total_connections_found": len(self.connections),
+                "response_cache": self.response_cache.stats(),
+                "http_client": default_client().stats(),
+                "host_health": default_client().health.state(),
+                "query_plan": self.query_plan.stats() if self.query_plan is not None else None
             },
             "identifiers": [ident["identifier"] for ident in self.identifiers],
             "aliases": self.aliases,
             "adot_numbers": self.adot_numbers,
             "connections": self.connections,
-            "connection_graph": {
-                node: list(connections) for node, connections in self.connection_graph.items()
-            },
+            "connection_graph": self.connection_graph,
             "metrics": metrics
         }
         
@@ -374,16 +642,24 @@ class IdentifierConnectionsBot:
         return results
     
     def save_results(self, results: Dict[str, Any], filename: str = "identifier_connections.json") -> str:
-        """Save results to JSON file"""
+        """Save results to JSON file, then update the connection store and scan snapshot if set"""
         output_dir = Path(__file__).parent / "output"
         output_dir.mkdir(exist_ok=True)
         
         output_file = output_dir / filename
         
         with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+            dump_json_lazily(results, f)
         
         self.log(f"Results saved to {output_file}", "SUCCESS")
+        
+        if self.connection_store is not None:
+            self.connection_store.save_scan(self.identifiers, self.aliases, self.connections, self.edge_store)
+            self.log(f"Connection store updated: {self.connection_store.summary()}", "SUCCESS")
+        
+        if self.scan_snapshot is not None:
+            self.scan_snapshot.commit(self.checkpoint)
+            self.log(f"Scan snapshot updated: {self.scan_snapshot.path}", "SUCCESS")
         return str(output_file)
     
     def print_summary(self, results: Dict[str, Any]) -> None:
@@ -395,6 +671,20 @@ class IdentifierConnectionsBot:
         metadata = results["scan_metadata"]
         print(f"\n🔍 Scanned {metadata['total_identifiers_scanned']} identifiers")
         print(f"🔗 Found {metadata['total_connections_found']} total connections")
+        print(f"🗄️ Response cache: {self.response_cache.summary()}")
+        if self.gleif_mirror is not None:
+            print(f"🏛️ GLEIF mirror: {self.gleif_mirror.summary()}")
+        if self.query_plan is not None:
+            print(f"🧭 Query plan: {self.query_plan.summary()}")
+        if self.gleif_batch_stats is not None:
+            stats = self.gleif_batch_stats
+            print(f"📦 GLEIF batching: {stats['lookups']} lookups in {stats['requests']} requests")
+            for error in self.gleif_batch_errors:
+                print(f"   ⚠️ {error['error']}: {error['url']}")
+        print(f"🌐 HTTP client: {default_client().summary()}")
+        print(f"🩺 Host health: {default_client().health.summary()}")
+        if self.connection_store is not None:
+            print(f"🗃️ Connection store: {self.connection_store.summary()}")
         
         metrics = results["metrics"]
         print(f"\n📊 CONNECTION SOURCES:")
@@ -416,18 +706,62 @@ class IdentifierConnectionsBot:
 
 def main():
     """Main entry point for Identifier Connections Bot"""
+    parser = argparse.ArgumentParser(
+        description="Identifier Connections Bot: connection discovery across all trust identifiers",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python identifier_connections_bot.py                 # Full scan, checkpointing progress
+  python identifier_connections_bot.py --resume        # Continue an interrupted scan
+  python identifier_connections_bot.py --incremental   # Only look up identifiers added since the last run
+  python identifier_connections_bot.py --dry-run       # Edges each connection rule would produce
+  python identifier_connections_bot.py --all-sources   # Skip query planning; look everything up everywhere
+        """
+    )
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip lookups already recorded in --checkpoint and merge their results')
+    parser.add_argument('--checkpoint', type=str, default=DEFAULT_CHECKPOINT_PATH,
+                        help='Checkpoint file for completed lookups (removed after a successful save)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse lookups from --snapshot for unchanged identifiers and update it')
+    parser.add_argument('--snapshot', type=str, default=DEFAULT_SNAPSHOT_PATH,
+                        help='Snapshot database of the last incremental run')
+    parser.add_argument('--rules', type=str, default=DEFAULT_RULES_PATH,
+                        help='Cross-identifier connection rules file')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report how many edges each connection rule would produce, then exit without scanning')
+    parser.add_argument('--gleif-batch-size', type=int, default=NAME_BATCH_SIZE,
+                        help='Legal names per GLEIF request (default 1: each identifier looked up separately)')
+    parser.add_argument('--all-sources', action='store_true',
+                        help='Look every identifier up in every source instead of routing by identifier type')
+    args = parser.parse_args()
+    
     print("🔗 IDENTIFIER CONNECTIONS BOT")
     print("Comprehensive connection discovery across all trust identifiers")
     print("-" * 60)
     
-    bot = IdentifierConnectionsBot(verbose=True)
+    # Set CONNECTION_STORE_PATH to also keep results in a queryable SQLite store
+    store_path = os.environ.get("CONNECTION_STORE_PATH")
+    if args.dry_run:
+        bot = IdentifierConnectionsBot(verbose=True, rules_path=args.rules)
+        plans = bot.dry_run_connection_rules()
+        print(f"\n📐 {sum(plan.edge_count for plan in plans)} cross-identifier edges from {len(plans)} rules")
+        return 0
+    # Set GLEIF_MIRROR_PATH to answer GLEIF lookups from a gleif_mirror.py import
+    bot = IdentifierConnectionsBot(verbose=True, rules_path=args.rules, gleif_mirror=default_mirror(),
+                                   connection_store=ConnectionStore(store_path) if store_path else None,
+                                   gleif_batch_size=args.gleif_batch_size,
+                                   query_planner=None if args.all_sources else QueryPlanner())
     
     try:
         # Run comprehensive scan
-        results = bot.run_comprehensive_scan()
+        checkpoint = ScanCheckpoint(args.checkpoint)
+        snapshot = ScanSnapshot(args.snapshot) if args.incremental else None
+        results = bot.run_comprehensive_scan(checkpoint, resume=args.resume, snapshot=snapshot)
         
         # Save results
         output_file = bot.save_results(results)
+        checkpoint.remove()
         
         # Print summary
         bot.print_summary(results)
@@ -437,6 +771,7 @@ def main():
         
     except KeyboardInterrupt:
         print("\n⚠️  Scan interrupted by user")
+        print(f"💾 Completed lookups are kept in {args.checkpoint}; rerun with --resume to continue")
         return 1
     except Exception as e:
         print(f"\n❌ Error during scan: {e}")
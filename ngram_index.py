@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+N-gram blocking index for substring matching
+
+Files each pattern under one of its character n-grams (the one shared by
+the fewest other patterns), so a text only has to be checked against the
+patterns filed under n-grams it contains. Patterns shorter than n are
+matched exactly against the text's short substrings and empty patterns
+occur in every text. Like AhoCorasick, find() reports pattern indices; the
+candidates are verified with ``in`` so results equal a substring test per
+pattern.
+
+Patterns made only of ASCII letters (or only of digits) can only occur
+inside one maximal run of letters (digits) in the text, so those are
+matched run by run and each run's matches are memoized: identifiers share
+most of their words, and a repeated run costs one dict lookup.
+"""
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+DEFAULT_GRAM_SIZE = 3
+
+# Memoized runs per class before the memo is reset
+MAX_MEMO_RUNS = 100_000
+
+LETTER_RUN = re.compile(r"[A-Za-z]+")
+DIGIT_RUN = re.compile(r"[0-9]+")
+
+
+class _GramTable:
+    """Blocking n-gram buckets over a subset of the patterns"""
+
+    def __init__(self, patterns: List[str], indices: List[int], n: int):
+        self.n = n
+        self.patterns = patterns
+        # Whole patterns shorter than n, keyed by the pattern itself
+        self.short: Dict[str, List[int]] = {}
+        # Longer patterns, keyed by their blocking n-gram
+        self.buckets: Dict[str, List[int]] = {}
+
+        grams_of: Dict[int, Set[str]] = {}
+        frequency: Dict[str, int] = {}
+        for index in indices:
+            pattern = patterns[index]
+            if len(pattern) < n:
+                self.short.setdefault(pattern, []).append(index)
+            else:
+                grams = {pattern[i:i + n] for i in range(len(pattern) - n + 1)}
+                grams_of[index] = grams
+                for gram in grams:
+                    frequency[gram] = frequency.get(gram, 0) + 1
+
+        for index, grams in grams_of.items():
+            key = min(grams, key=lambda gram: (frequency[gram], gram))
+            self.buckets.setdefault(key, []).append(index)
+        self.short_lengths = sorted({len(pattern) for pattern in self.short})
+        # Frozen key sets so intersections iterate the (much smaller) text side
+        self.bucket_keys = frozenset(self.buckets)
+        self.short_keys = frozenset(self.short)
+
+    def __bool__(self) -> bool:
+        return bool(self.buckets or self.short)
+
+    def find(self, text: str) -> List[int]:
+        found = []
+        patterns = self.patterns
+        buckets = self.buckets
+        if buckets and len(text) >= self.n:
+            for gram in NgramIndex.substrings(text, self.n) & self.bucket_keys:
+                for index in buckets[gram]:
+                    if patterns[index] in text:
+                        found.append(index)
+
+        short = self.short
+        for length in self.short_lengths:
+            for part in NgramIndex.substrings(text, length) & self.short_keys:
+                found.extend(short[part])
+        return found
+
+
+class NgramIndex:
+    """Inverted n-gram index reporting which patterns occur in a text
+
+    With ``ignore_case`` both patterns and text are compared lowercased,
+    like ``pattern.lower() in text.lower()``.
+    """
+
+    def __init__(self, patterns: Iterable[str], n: int = DEFAULT_GRAM_SIZE, ignore_case: bool = False):
+        self.n = n
+        self.ignore_case = ignore_case
+        self.patterns: List[str] = [p.lower() if ignore_case else p for p in patterns]
+        self.always: List[int] = []
+
+        letters, digits, mixed = [], [], []
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                self.always.append(index)
+            elif pattern.isascii() and pattern.isalpha():
+                letters.append(index)
+            elif pattern.isascii() and pattern.isdigit():
+                digits.append(index)
+            else:
+                mixed.append(index)
+
+        # (run pattern, table, memo) per class of single-run patterns
+        self.run_tables: List[Tuple[re.Pattern, _GramTable, Dict[str, Tuple[int, ...]]]] = [
+            (run, table, {})
+            for run, table in ((LETTER_RUN, _GramTable(self.patterns, letters, n)),
+                               (DIGIT_RUN, _GramTable(self.patterns, digits, n)))
+            if table
+        ]
+        self.mixed = _GramTable(self.patterns, mixed, n)
+
+    @staticmethod
+    def substrings(text: str, length: int) -> Set[str]:
+        """Distinct substrings of text with the given length"""
+        return {text[i:i + length] for i in range(len(text) - length + 1)}
+
+    def find(self, text: str) -> Set[int]:
+        """Return the indices of all patterns occurring in text"""
+        if self.ignore_case:
+            text = text.lower()
+        found = set(self.always)
+
+        for run_pattern, table, memo in self.run_tables:
+            for run in set(run_pattern.findall(text)):
+                matches = memo.get(run)
+                if matches is None:
+                    if len(memo) >= MAX_MEMO_RUNS:
+                        memo.clear()
+                    matches = memo[run] = tuple(table.find(run))
+                found.update(matches)
+
+        if self.mixed:
+            found.update(self.mixed.find(text))
+        return found
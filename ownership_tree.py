@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Ownership tree - breadth-first traversal of GLEIF parent/child relationships
+
+Starting from one or more LEIs, each level's frontier is expanded through
+the direct/ultimate parent and paged children endpoints of the lei-records
+API in one concurrent FetchEngine batch (per-host limit), so a traversal
+costs one round of requests per level rather than one per node. Children
+pages after the first are requested together once the first page gives
+the page count. Node records are loaded with batched filter[lei] lookups
+(gleif_batch.GleifBatcher).
+
+Entities seen in any response are memoized by LEI, and so is each
+(LEI, relation) expansion: a node reached again, in the same traversal or
+a later one on the same OwnershipTraversal, is neither re-fetched nor
+re-expanded. A node is expanded at most once per traversal however many
+paths reach it, so cyclic relationship data terminates; cycles among the
+direct-parent edges are reported.
+
+The result is a JSON-serializable dict: the nodes with their BFS depth,
+every relationship edge found, a nested spanning tree from the roots, the
+unexpanded frontier at the depth limit, cycles and failed requests.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from fetch_engine import DEFAULT_PER_HOST_LIMIT, FetchEngine
+from gleif_batch import GleifBatcher
+from gleif_mirror import DIRECT_PARENT, ULTIMATE_PARENT, MAX_PAGE_SIZE, gleif_get
+
+GLEIF_API = "https://api.gleif.org/api/v1/lei-records"
+
+DEFAULT_DEPTH = 3
+
+# Relation endpoint -> (which side of the edge the related entity is, relationship type)
+RELATIONS: Dict[str, Tuple[str, str]] = {
+    "direct-parent": ("parent", DIRECT_PARENT),
+    "ultimate-parent": ("parent", ULTIMATE_PARENT),
+    "direct-children": ("child", DIRECT_PARENT),
+    "ultimate-children": ("child", ULTIMATE_PARENT),
+}
+
+# An ultimate parent's ultimate children can be the whole group, so that
+# relation is only followed when asked for
+DEFAULT_RELATIONS = ("direct-parent", "ultimate-parent", "direct-children")
+
+HEADERS = {"Accept": "application/vnd.api+json"}
+
+# Cycles reported per traversal
+MAX_CYCLES = 100
+
+
+class OwnershipTraversal:
+    """Breadth-first ownership traversal with memoized nodes and expansions"""
+
+    def __init__(self, get: Optional[Callable[..., Any]] = None, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 relations: Iterable[str] = DEFAULT_RELATIONS, page_size: int = MAX_PAGE_SIZE,
+                 api: str = GLEIF_API):
+        self.relations = tuple(relations)
+        unknown = [relation for relation in self.relations if relation not in RELATIONS]
+        if unknown:
+            raise ValueError(f"unknown relations {unknown} (expected some of {', '.join(RELATIONS)})")
+        self.get = get or gleif_get
+        self.engine = FetchEngine(per_host_limit, get=self.get)
+        self.page_size = page_size
+        self.api = api.rstrip("/")
+        # LEI -> entity summary from any response that included it
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        # (LEI, relation) -> related LEIs, for expansions that completed
+        self.expansions: Dict[Tuple[str, str], List[str]] = {}
+        self.requests = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    # -- fetching ---------------------------------------------------------------
+
+    def remember(self, record: Dict[str, Any]) -> Optional[str]:
+        """Memoize one lei-records entry; returns its LEI"""
+        attributes = record.get("attributes", {})
+        lei = attributes.get("lei") or record.get("id")
+        if not lei:
+            return None
+        entity = attributes.get("entity", {})
+        legal_name = entity.get("legalName", "")
+        self.nodes[lei] = {
+            "lei": lei,
+            "name": legal_name.get("name", "") if isinstance(legal_name, dict) else legal_name,
+            "jurisdiction": entity.get("jurisdiction"),
+            "country": entity.get("legalAddress", {}).get("country"),
+            "status": entity.get("status"),
+        }
+        return lei
+
+    def _fetch(self, fetch_requests: List[Dict[str, Any]]) -> List[Tuple[Any, Any]]:
+        """(key, JSON payload) per request: None for a 404, False for a failure (recorded in errors)"""
+        if not fetch_requests:
+            return []
+        self.requests += len(fetch_requests)
+        payloads = []
+        for result in self.engine.fetch_all(fetch_requests):
+            response, error = result["response"], result["error"]
+            payload = None
+            if error is None and response.status_code == 404:
+                pass
+            elif error is None and response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+            elif error is None:
+                try:
+                    payload = response.json()
+                except ValueError as e:
+                    error = e
+            if error is not None:
+                self.errors.append({"url": result["url"], "error": str(error)})
+            payloads.append((result["key"], payload if error is None else False))
+        return payloads
+
+    def find(self, legal_name: str) -> List[str]:
+        """LEIs of the entities whose legal name matches, from the first page of results"""
+        url = f"{self.api}?filter[entity.legalName]={quote(legal_name)}&page[size]={self.page_size}"
+        leis = []
+        for _, payload in self._fetch([{"url": url, "key": None, "headers": HEADERS}]):
+            for record in (payload or {}).get("data") or []:
+                lei = self.remember(record)
+                if lei:
+                    leis.append(lei)
+        return leis
+
+    def load(self, leis: Iterable[str]) -> None:
+        """Fetch the records of LEIs not already memoized"""
+        missing = [lei for lei in dict.fromkeys(leis) if lei not in self.nodes]
+        if not missing:
+            return
+        # filter[lei] lists: one request per batch of LEIs rather than one per LEI
+        batcher = GleifBatcher(get=self.get, max_concurrent=self.engine.per_host_limit, api=self.api)
+        lookups = batcher.lookup_leis(missing)
+        for lei, future in lookups.items():
+            try:
+                records = future.result()
+            except Exception as e:
+                self.errors.append({"url": batcher.batch_url("lei", [lei]), "error": str(e)})
+                continue
+            for record in records:
+                self.remember(record)
+        batcher.close()
+        self.requests += batcher.stats()["requests"]
+
+    def _url(self, lei: str, relation: str, page: int = 1) -> str:
+        url = f"{self.api}/{lei}/{relation}"
+        if RELATIONS[relation][0] == "child":
+            url += f"?page[size]={self.page_size}&page[number]={page}"
+        return url
+
+    def expand(self, leis: Iterable[str]) -> Dict[Tuple[str, str], List[str]]:
+        """Related LEIs for each (LEI, relation), fetching the ones not memoized concurrently"""
+        wanted = [(lei, relation) for lei in leis for relation in self.relations]
+        fetch_requests = [{"url": self._url(lei, relation), "key": (lei, relation, 1), "headers": HEADERS}
+                          for lei, relation in wanted if (lei, relation) not in self.expansions]
+        collected: Dict[Tuple[str, str], Dict[int, List[str]]] = {}
+        failed: Set[Tuple[str, str]] = set()
+        while fetch_requests:
+            more = []
+            for (lei, relation, page), payload in self._fetch(fetch_requests):
+                pages = collected.setdefault((lei, relation), {})
+                if payload is False:
+                    failed.add((lei, relation))
+                    continue
+                payload = payload or {}
+                data = payload.get("data") or []
+                records = data if isinstance(data, list) else [data]
+                pages[page] = [related for related in map(self.remember, records) if related]
+                if page == 1 and RELATIONS[relation][0] == "child":
+                    last_page = int(payload.get("meta", {}).get("pagination", {}).get("lastPage") or 1)
+                    more.extend({"url": self._url(lei, relation, number), "key": (lei, relation, number),
+                                 "headers": HEADERS} for number in range(2, last_page + 1))
+            fetch_requests = more
+
+        # Failed expansions keep what they got but are not memoized, so a later traversal retries them
+        partial: Dict[Tuple[str, str], List[str]] = {}
+        for key, pages in collected.items():
+            related = [lei for number in sorted(pages) for lei in pages[number]]
+            if key in failed:
+                partial[key] = related
+            else:
+                self.expansions[key] = related
+        return {key: self.expansions.get(key, partial.get(key, [])) for key in wanted}
+
+    # -- traversal --------------------------------------------------------------
+
+    def traverse(self, roots: Iterable[str], depth: int = DEFAULT_DEPTH) -> Dict[str, Any]:
+        """Breadth-first ownership traversal to `depth` levels from the roots"""
+        roots = list(dict.fromkeys(roots))
+        requests_before = self.requests
+        errors_before = len(self.errors)
+        self.load(roots)
+
+        levels: Dict[str, int] = {lei: 0 for lei in roots}
+        # LEI -> (LEI it was reached from, relation) for the spanning tree
+        reached_from: Dict[str, Tuple[str, str]] = {}
+        edges: Dict[Tuple[str, str, str], None] = {}
+        frontier = roots
+        for level in range(depth):
+            if not frontier:
+                break
+            expansions = self.expand(frontier)
+            next_frontier = []
+            for lei in frontier:
+                for relation in self.relations:
+                    side, relationship_type = RELATIONS[relation]
+                    for other in expansions[(lei, relation)]:
+                        child, parent = (lei, other) if side == "parent" else (other, lei)
+                        edges[(child, parent, relationship_type)] = None
+                        if other not in levels:
+                            levels[other] = level + 1
+                            reached_from[other] = (lei, relation)
+                            next_frontier.append(other)
+            frontier = next_frontier
+
+        direct_edges = [(child, parent) for child, parent, kind in edges if kind == DIRECT_PARENT]
+        return {
+            "roots": roots,
+            "depth": depth,
+            "relations": list(self.relations),
+            "nodes": {lei: {**self.nodes.get(lei, {"lei": lei}), "depth": level} for lei, level in levels.items()},
+            "edges": [{"child": child, "parent": parent, "relationship": kind} for child, parent, kind in edges],
+            "tree": self._spanning_tree(roots, levels, reached_from),
+            "frontier": frontier,
+            "cycles": find_cycles(direct_edges),
+            "errors": self.errors[errors_before:],
+            "stats": {"nodes": len(levels), "edges": len(edges), "requests": self.requests - requests_before},
+        }
+
+    def _spanning_tree(self, roots: List[str], levels: Dict[str, int],
+                       reached_from: Dict[str, Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Nested {lei, name, via, branches} from each root along the BFS discovery edges"""
+        branches: Dict[str, Dict[str, Any]] = {}
+        for lei in levels:
+            node = self.nodes.get(lei, {})
+            branches[lei] = {"lei": lei, "name": node.get("name"), "jurisdiction": node.get("jurisdiction"),
+                             "via": None, "branches": []}
+        for lei, (source, relation) in reached_from.items():
+            branches[lei]["via"] = relation
+            branches[source]["branches"].append(branches[lei])
+        return [branches[lei] for lei in roots]
+
+
+def find_cycles(edges: Iterable[Tuple[str, str]], limit: int = MAX_CYCLES) -> List[List[str]]:
+    """Cycles in child -> parent edges, each as the LEIs around it (iterative DFS)"""
+    graph: Dict[str, List[str]] = {}
+    for child, parent in edges:
+        graph.setdefault(child, []).append(parent)
+    # 1 while on the current DFS path, 2 once finished
+    state: Dict[str, int] = {}
+    cycles: List[List[str]] = []
+    for start in graph:
+        if start in state:
+            continue
+        path = [start]
+        state[start] = 1
+        stack = [iter(graph.get(start, ()))]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                state[path.pop()] = 2
+                stack.pop()
+            elif state.get(node) == 1:
+                if len(cycles) < limit:
+                    cycles.append(path[path.index(node):])
+            elif node not in state:
+                state[node] = 1
+                path.append(node)
+                stack.append(iter(graph.get(node, ())))
+    return cycles
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Query planner - route identifiers only to the external sources that can answer them
+
+Every identifier is classified with STORM-BREAKER's compiled classifier
+(StormBreaker.analyze_many) before any lookup is made, and its pattern type
+decides which sources it is sent to: entity names and EINs to GLEIF,
+entity names, addresses and free text to Reddit search. Record numbers such
+as SSNs, dates of birth, phone numbers and account numbers can never match
+a GLEIF legal name or turn up in a search, so they are sent nowhere.
+
+STORM-BREAKER's pattern table only knows some of those record numbers, so
+the planner's own StormBreaker has RECORD_PATTERNS appended to it; they are
+checked after the built-in patterns. Identifiers that match neither are
+treated as free text.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from storm_breaker import StormBreaker
+
+GLEIF = "GLEIF"
+SEARCH = "Reddit"
+SOURCES = (SEARCH, GLEIF)
+
+# Record numbers STORM-BREAKER's pattern table does not cover
+RECORD_PATTERNS = {
+    'date_of_birth': r'^DOB-\d{4}-\d{2}-\d{2}(-\d+)?$',
+    'phone_number': r'^PHONE-\+?\d{7,15}$',
+    'email_address': r'^EMAIL-[^@\s]+@[^@\s]+$',
+    'account_number': r'^ACCT-\d+$',
+    'irs_tracking_number': r'^IRS-TRACK-\d+$',
+    'birth_registry_number': r'^BIRTH-REGISTRY-[\d-]+$',
+    'vehicle_identification': r'^VIN-[A-Z0-9]+$',
+    'lexisnexis_record': r'^(LEXID-[\dX]+|LN-(CONSUMER|CASE)-\d+)$',
+}
+
+# Pattern type -> sources that can answer for it
+ROUTES: Dict[str, Tuple[str, ...]] = {
+    'entity_name': (SEARCH, GLEIF),
+    'employer_identification': (GLEIF,),
+    'address': (SEARCH,),
+    'property_record': (SEARCH,),
+    'social_security': (),
+    'irs_tracking': (),
+    'child_support_enforcement': (),
+    'arizona_dot_customer': (),
+    'birth_registry': (),
+    **{pattern_type: () for pattern_type in RECORD_PATTERNS},
+}
+
+# Identifiers no pattern recognises may be names or aliases: search only
+DEFAULT_ROUTE: Tuple[str, ...] = (SEARCH,)
+
+
+class QueryPlan:
+    """The sources each identifier is looked up in, in identifier order"""
+
+    def __init__(self, types: Dict[str, str], routes: Dict[str, Tuple[str, ...]]):
+        self.types = types
+        self.routes = routes
+
+    def lookups(self, source: str) -> List[str]:
+        """Identifiers to look up in source"""
+        return [identifier for identifier, sources in self.routes.items() if source in sources]
+
+    def skipped(self, source: str) -> List[str]:
+        """Identifiers not worth looking up in source"""
+        return [identifier for identifier, sources in self.routes.items() if source not in sources]
+
+    def stats(self) -> Dict[str, object]:
+        avoided_by_type: Dict[str, int] = {}
+        for identifier, sources in self.routes.items():
+            missing = len(SOURCES) - len(sources)
+            if missing:
+                pattern_type = self.types[identifier]
+                avoided_by_type[pattern_type] = avoided_by_type.get(pattern_type, 0) + missing
+        avoided = {source: len(self.skipped(source)) for source in SOURCES}
+        return {
+            "identifiers": len(self.routes),
+            "lookups": {source: len(self.lookups(source)) for source in SOURCES},
+            "avoided": avoided,
+            "requests_avoided": sum(avoided.values()),
+            "avoided_by_type": avoided_by_type,
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        planned = ", ".join(f"{count} {source}" for source, count in stats["lookups"].items())
+        return (f"{planned} lookups for {stats['identifiers']} identifiers, "
+                f"{stats['requests_avoided']} avoided by identifier type")
+
+
+class QueryPlanner:
+    """Classify identifiers and route each to the sources that can answer for its type"""
+
+    def __init__(self, routes: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 default_route: Tuple[str, ...] = DEFAULT_ROUTE,
+                 record_patterns: Optional[Dict[str, str]] = None):
+        self.routes = dict(ROUTES if routes is None else routes)
+        self.default_route = default_route
+        self.storm_breaker = StormBreaker()
+        for pattern_type, regex in (RECORD_PATTERNS if record_patterns is None else record_patterns).items():
+            self.storm_breaker.patterns.setdefault(pattern_type, regex)
+
+    def route(self, pattern_type: str) -> Tuple[str, ...]:
+        return self.routes.get(pattern_type, self.default_route)
+
+    def plan(self, identifiers: Iterable[str]) -> QueryPlan:
+        """Plan the lookups for identifiers (duplicates are planned once)"""
+        unique = list(dict.fromkeys(identifiers))
+        types = {analysis['identifier']: analysis['pattern_type']
+                 for analysis in self.storm_breaker.analyze_many(unique)}
+        return QueryPlan(types, {identifier: self.route(types[identifier]) for identifier in unique})
@@ -1,4 +1,5 @@
 import requests
+from response_cache import default_cache
 
 def query_reddit_threads(identifier):
     """Query Reddit threads for a given identifier with error handling"""
@@ -6,7 +7,7 @@ def query_reddit_threads(identifier):
     url = f"https://www.reddit.com/search.json?q={identifier}&limit=5"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = default_cache().get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             data = response.json()
             return [post["data"]["title"] for post in data["data"]["children"]]
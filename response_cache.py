@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Response cache - shared persistent HTTP cache for GLEIF and Reddit lookups
+
+Stores GET responses in a SQLite file keyed by URL. Fresh entries (younger
+than the TTL for their source host) are served without a request; stale
+entries are revalidated with If-None-Match/If-Modified-Since when the server
+gave an ETag or Last-Modified, and a 304 refreshes the entry in place. With
+a stale-while-revalidate window, entries that expired less than that many
+seconds ago are served immediately and refreshed on a background thread.
+The file is bounded in size by evicting least recently used entries.
+
+ResponseCache.get is a drop-in for requests.get: it returns a
+requests.Response and lets network exceptions propagate, so callers keep
+their existing offline handling. Cache misses go through the shared
+pooled HttpClient unless another getter is given.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_client import default_client
+from host_health import HostUnavailable
+
+DEFAULT_CACHE_PATH = str(Path(__file__).parent / "output" / "http_cache.db")
+
+# Seconds a response stays fresh, per source host
+SOURCE_TTLS = {
+    "api.gleif.org": 24 * 3600,
+    "www.reddit.com": 3600
+}
+DEFAULT_TTL = 3600
+
+# Cache file size bound before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_TIMEOUT = 10
+
+
+class ResponseCache:
+    """Persistent URL-keyed response cache with TTLs, revalidation and LRU eviction"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES,
+                 stale_while_revalidate: float = 0, session_get=None):
+        self.path = path
+        self.ttls = dict(SOURCE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self.session_get = session_get or default_client().get
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " size INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.conn.commit()
+        # Running total of stored body sizes, kept up to date on every insert and eviction
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        self.revalidating: Dict[str, threading.Thread] = {}
+        self.counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "network_requests": 0,
+            "evictions": 0
+        }
+
+    def ttl_for(self, url: str) -> float:
+        """Freshness lifetime in seconds for a URL's source host"""
+        return self.ttls.get(urlsplit(url).netloc.lower(), self.default_ttl)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+        """Return the response for url, from the cache when it is fresh"""
+        entry = self._load(url)
+        now = time.time()
+
+        if entry is not None:
+            age = now - entry["stored_at"]
+            ttl = self.ttl_for(url)
+            if age < ttl:
+                self._count("hits")
+                self._touch(url, now)
+                return self._response(url, entry)
+            if age < ttl + self.stale_while_revalidate:
+                self._count("stale_hits")
+                self._touch(url, now)
+                self._revalidate_in_background(url, headers, timeout, entry, kwargs)
+                return self._response(url, entry)
+
+        return self._fetch(url, headers, timeout, entry, kwargs)
+
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]], timeout: float,
+               entry: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> requests.Response:
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session_get(url, headers=request_headers or None, timeout=timeout, **kwargs)
+        except HostUnavailable as e:
+            # A breaker that rejected the call before anything was sent is not a network request
+            if e.attempts:
+                self._count("network_requests")
+            raise
+        except Exception:
+            self._count("network_requests")
+            raise
+        self._count("network_requests")
+
+        if entry is not None and response.status_code == 304:
+            self._count("revalidated")
+            now = time.time()
+            with self.lock:
+                self.conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                                  (now, now, url))
+                self.conn.commit()
+            return self._response(url, entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def _revalidate_in_background(self, url: str, headers: Optional[Dict[str, str]], timeout: float,
+                                  entry: Dict[str, Any], kwargs: Dict[str, Any]) -> None:
+        with self.lock:
+            if url in self.revalidating:
+                return
+            thread = threading.Thread(target=self._revalidate, args=(url, headers, timeout, entry, kwargs))
+            self.revalidating[url] = thread
+        thread.start()
+
+    def _revalidate(self, url: str, headers: Optional[Dict[str, str]], timeout: float,
+                    entry: Dict[str, Any], kwargs: Dict[str, Any]) -> None:
+        try:
+            self._fetch(url, headers, timeout, entry, kwargs)
+        except requests.exceptions.RequestException:
+            # Keep serving the stale entry; the next request past its window retries
+            pass
+        finally:
+            with self.lock:
+                self.revalidating.pop(url, None)
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row[0],
+            "headers": json.loads(row[1]),
+            "body": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "stored_at": row[5]
+        }
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        body = response.content
+        headers = dict(response.headers)
+        now = time.time()
+        with self.lock:
+            replaced = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), body,
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now, now, len(body))
+            )
+            self.total_bytes += len(body) - (replaced[0] if replaced else 0)
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+        evicted = []
+        for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if self.total_bytes <= self.max_bytes:
+                break
+            evicted.append((url,))
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self.counters["evictions"] += len(evicted)
+
+    def _touch(self, url: str, now: float) -> None:
+        with self.lock:
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self.conn.commit()
+
+    def _count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def _response(url: str, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = bytes(entry["body"])
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process plus the current entry count"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return dict(self.counters, entries=entries)
+
+    def summary(self) -> str:
+        """One-line description of the counters for script output"""
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['stale_hits']} stale, {stats['revalidated']} revalidated, "
+                f"{stats['misses']} misses, {stats['network_requests']} network requests")
+
+    def close(self) -> None:
+        """Wait for background revalidations and close the database"""
+        while True:
+            with self.lock:
+                threads = list(self.revalidating.values())
+            if not threads:
+                break
+            for thread in threads:
+                thread.join()
+        self.conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> ResponseCache:
+    """Process-wide cache shared by the scanners
+
+    RESPONSE_CACHE_PATH overrides the file location and
+    RESPONSE_CACHE_STALE_WHILE_REVALIDATE sets the stale window in seconds.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                path=os.environ.get("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                stale_while_revalidate=float(os.environ.get("RESPONSE_CACHE_STALE_WHILE_REVALIDATE", 0))
+            )
+    return _default_cache
+
+
+def cached_get(url: str, headers: Optional[Dict[str, str]] = None,
+               timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """requests.get through the shared cache"""
+    return default_cache().get(url, headers=headers, timeout=timeout, **kwargs)
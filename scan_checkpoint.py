@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Scan checkpoint - resumable progress for IdentifierConnectionsBot
+
+Completed per-identifier work (the connections one Reddit, GLEIF or alias
+lookup produced) is appended to a JSON Lines file as soon as it finishes,
+so an interrupted scan loses at most the lookups still in flight. The first
+line records a fingerprint of the scan inputs; a resume against different
+identifiers or aliases starts over instead of merging stale results. A line
+cut short by a kill is ignored on load.
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CHECKPOINT_PATH = str(Path(__file__).parent / "output" / "identifier_connections_checkpoint.jsonl")
+
+CHECKPOINT_VERSION = 1
+
+
+def scan_fingerprint(*inputs: Any) -> str:
+    """Digest of the inputs a checkpoint's results depend on"""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+class ScanCheckpoint:
+    """Append-only record of completed (source, identifier) lookups
+
+    With no path, completed work is only kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self.completed_work: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self.resumed: Dict[str, int] = {}
+        self.file = None
+
+    def open(self, fingerprint: str, resume: bool = False) -> int:
+        """Start recording, keeping matching earlier progress when resuming
+
+        Returns the number of completed lookups restored.
+        """
+        self.completed_work = {}
+        self.resumed = {}
+        if self.path is None:
+            return 0
+        if resume and self._load(fingerprint):
+            self.file = open(self.path, 'a')
+            return sum(self.resumed.values())
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, 'w')
+        self._write({"checkpoint_version": CHECKPOINT_VERSION, "fingerprint": fingerprint})
+        return 0
+
+    def _load(self, fingerprint: str) -> bool:
+        try:
+            with open(self.path) as f:
+                lines = f.read().split('\n')
+        except FileNotFoundError:
+            return False
+
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        if header.get("checkpoint_version") != CHECKPOINT_VERSION or header.get("fingerprint") != fingerprint:
+            return False
+
+        # Every complete line ends in a newline, so the last piece is empty or cut short
+        for line in lines[1:-1]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.completed_work.setdefault(entry["source"], {})[entry["identifier"]] = entry["connections"]
+        self.resumed = {source: len(done) for source, done in self.completed_work.items()}
+
+        if lines[-1]:
+            with open(self.path, 'w') as f:
+                f.write('\n'.join(lines[:-1]) + '\n')
+        return True
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self.file.write(json.dumps(entry) + '\n')
+        self.file.flush()
+
+    def completed(self, source: str) -> Dict[str, List[Dict[str, Any]]]:
+        """identifier -> connections for the lookups of one source already done"""
+        return self.completed_work.setdefault(source, {})
+
+    def record(self, source: str, identifier: str, connections: List[Dict[str, Any]]) -> None:
+        """Mark one lookup complete with the connections it found"""
+        self.completed(source)[identifier] = connections
+        if self.file is not None:
+            self._write({"source": source, "identifier": identifier, "connections": connections})
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def remove(self) -> None:
+        """Delete the checkpoint once its scan's results are saved"""
+        self.close()
+        if self.path is None:
+            return
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def summary(self) -> Optional[str]:
+        """Description of the progress restored by open(), if any"""
+        if not self.resumed:
+            return None
+        counts = ", ".join(f"{source} {count}" for source, count in self.resumed.items())
+        return f"resumed {sum(self.resumed.values())} completed lookups ({counts}) from {self.path}"
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Scan snapshot - incremental connection discovery for IdentifierConnectionsBot
+
+Keeps the last incremental run's identifiers, aliases and ADOT numbers and
+the connections each identifier's Reddit, GLEIF and alias lookups produced,
+in a SQLite file. The next run diffs identifiers.json and identifiers.yaml
+against it and seeds the scan checkpoint with every stored lookup that is
+still valid, so only added identifiers are queried; removed identifiers'
+lookups are retired and their mentions dropped from other Reddit results.
+
+Alias matches are part of every lookup's result, so a change to the aliases
+or ADOT numbers invalidates all stored lookups (the response cache still
+spares the network for fresh responses). Posts stored for unchanged
+identifiers are not rescanned for mentions of newly added identifiers; a
+full run refreshes them.
+"""
+import os
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+DEFAULT_SNAPSHOT_PATH = str(Path(__file__).parent / "output" / "identifier_connections_snapshot.db")
+
+SNAPSHOT_SOURCES = ("Reddit", "GLEIF", "Alias")
+
+
+def strip_mentions(connections: List[Dict[str, Any]], removed: Set[str]) -> Optional[List[Dict[str, Any]]]:
+    """Reddit connections without mentions of removed identifiers, or None if unaffected
+
+    Posts left mentioning nothing are dropped, as find_reddit_connections
+    would not have recorded them.
+    """
+    if not any(removed.intersection(c.get("connected_identifiers", ())) for c in connections):
+        return None
+    kept = []
+    for connection in connections:
+        mentioned = [i for i in connection.get("connected_identifiers", []) if i not in removed]
+        if mentioned or connection.get("connected_aliases") or connection.get("offline_mode"):
+            kept.append(dict(connection, connected_identifiers=mentioned))
+    return kept
+
+
+class ScanSnapshot:
+    """Last run's scan inputs and per-identifier lookup results"""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS identifiers (
+                identifier TEXT PRIMARY KEY,
+                source TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS inputs (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS lookups (
+                source TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                connections TEXT NOT NULL,
+                PRIMARY KEY (source, identifier)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+        self.identifiers: Dict[str, str] = {}
+        self.inputs = ""
+        self.inputs_changed = True
+        self.changes = {"added": 0, "removed": 0, "regrouped": 0, "reused": 0}
+        self.removed: Set[str] = set()
+        self.changed: List[Any] = []
+        self.reused: Dict[str, Set[str]] = {}
+
+    def seed(self, checkpoint, identifiers: List[Dict[str, Any]], aliases: List[str],
+             adot_numbers: List[str]) -> Dict[str, int]:
+        """Diff the current inputs against the snapshot and restore still-valid lookups
+
+        Restored lookups go into checkpoint.completed(source) unless the
+        checkpoint already holds them. Returns counts of added, removed and
+        regrouped (source changed) identifiers and reused lookups.
+        """
+        self.identifiers = {}
+        for ident in identifiers:
+            self.identifiers.setdefault(ident["identifier"], ident.get("source", "Unknown"))
+        previous = dict(self.conn.execute("SELECT identifier, source FROM identifiers"))
+
+        self.removed = set(previous).difference(self.identifiers)
+        self.changed = [(identifier, source) for identifier, source in self.identifiers.items()
+                        if previous.get(identifier) != source]
+        self.changes = {
+            "added": sum(1 for identifier in self.identifiers if identifier not in previous),
+            "removed": len(self.removed),
+            "regrouped": sum(1 for identifier, source in self.identifiers.items()
+                             if previous.get(identifier, source) != source),
+            "reused": 0
+        }
+
+        self.inputs = json.dumps({"aliases": aliases, "adot_numbers": adot_numbers})
+        stored = self.conn.execute("SELECT value FROM inputs WHERE name = 'aliases'").fetchone()
+        self.inputs_changed = stored is None or stored[0] != self.inputs
+
+        self.reused = {source: set() for source in SNAPSHOT_SOURCES}
+        if self.inputs_changed:
+            return self.changes
+
+        keys, blobs = [], []
+        for source, identifier, encoded in self.conn.execute("SELECT source, identifier, connections FROM lookups"):
+            if identifier in self.identifiers and identifier not in checkpoint.completed(source):
+                keys.append((source, identifier))
+                blobs.append(encoded)
+
+        # Decode every restored lookup with one parser call
+        for (source, identifier), connections in zip(keys, json.loads('[' + ','.join(blobs) + ']')):
+            stripped = strip_mentions(connections, self.removed) if source == "Reddit" and self.removed else None
+            if stripped is None:
+                self.reused[source].add(identifier)
+            else:
+                connections = stripped
+            checkpoint.completed(source)[identifier] = connections
+            self.changes["reused"] += 1
+        return self.changes
+
+    def commit(self, checkpoint) -> None:
+        """Store this run's inputs and the lookups it did not reuse"""
+        with self.conn:
+            if self.inputs_changed:
+                self.conn.execute("DELETE FROM lookups")
+            self.conn.executemany("DELETE FROM lookups WHERE source = ? AND identifier = ?",
+                                  ((source, i) for source in SNAPSHOT_SOURCES for i in self.removed))
+            self.conn.executemany("DELETE FROM identifiers WHERE identifier = ?", ((i,) for i in self.removed))
+            self.conn.executemany("INSERT OR REPLACE INTO identifiers VALUES (?, ?)", self.changed)
+            self.conn.execute("INSERT OR REPLACE INTO inputs VALUES ('aliases', ?)", (self.inputs,))
+            for source in SNAPSHOT_SOURCES:
+                reused = self.reused.get(source, set())
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)",
+                    ((source, identifier, json.dumps(connections))
+                     for identifier, connections in checkpoint.completed(source).items()
+                     if identifier not in reused and identifier in self.identifiers)
+                )
+
+    def summary(self) -> str:
+        """One-line description of the last seed()"""
+        changes = self.changes
+        inputs = "aliases changed, lookups redone" if self.inputs_changed else f"{changes['reused']} lookups reused"
+        return (f"{changes['added']} added, {changes['removed']} removed, "
+                f"{changes['regrouped']} regrouped identifiers; {inputs}")
+
+    def close(self) -> None:
+        self.conn.close()
@@ -7,19 +7,507 @@ identifier scanning with advanced pattern recognition and validation.
 """
 import os
 import re
+import sys
 import json
 import hashlib
+import sqlite3
 import argparse
+import tempfile
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Set, Tuple
+
+
+# Metadata labels, checked in order against the raw identifier text
+METADATA_TYPES = [
+    ('EIN-', 'Employer Identification Number'),
+    ('SSN-', 'Social Security Number'),
+    ('IRS-TRACK-', 'IRS Tracking Number'),
+    ('CSE-CASE-', 'Child Support Enforcement Case'),
+    ('ADOT-CUST-', 'Arizona DOT Customer ID'),
+    ('ADDR-', 'Address Record'),
+    ('ENTITY-', 'Entity Name'),
+    ('BIRTH-REGISTRY', 'Birth Registry Record'),
+    ('DEED-DOC', 'Property Deed Document')
+]
+
+# Keywords that raise a valid identifier from low to medium risk
+RISK_KEYWORDS = ['SSN', 'BIRTH', 'ADOT']
+
+# Shards handed to each worker process by --workers, for load balancing
+SHARDS_PER_WORKER = 4
+
+# Default location of the incremental scan state database
+DEFAULT_STATE_PATH = "output/storm_breaker_state.db"
+
+# SQLite page cache for the state database, in KiB
+STATE_CACHE_KIB = 256 * 1024
+
+# Identifiers classified per analyze_many call during a scan
+ANALYZE_BATCH_SIZE = 4096
+
+# Read size used when parsing identifier files incrementally
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(f, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading it whole"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    
+    while True:
+        # Skip whitespace, the opening bracket and element separators
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,[':
+            if buffer[pos] == '[':
+                if started:
+                    break
+                started = True
+            pos += 1
+        
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        
+        if pos < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number cut off by the chunk boundary may continue in the next chunk
+                if eof or (end < len(buffer) and buffer[end] in ' \t\r\n,]'):
+                    yield value
+                    pos = end
+                    continue
+        elif eof:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+        
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_ndjson(f) -> Iterator[Any]:
+    """Yield one decoded JSON value per non-blank line"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_identifiers(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream identifier records from an NDJSON file or a JSON array file
+    
+    The format is detected from the first non-whitespace character, so
+    ``identifiers.json`` and ``identifiers.ndjson`` are both accepted.
+    """
+    with open(file_path, 'r') as f:
+        first = ''
+        while True:
+            char = f.read(1)
+            if not char or not char.isspace():
+                first = char
+                break
+        f.seek(0)
+        
+        records = iter_json_array(f) if first == '[' else iter_ndjson(f)
+        for record in records:
+            if isinstance(record, str):
+                record = {'identifier': record}
+            yield record
+
+
+class IdentifierClassifier:
+    """Compiled single-pass classifier for STORM-BREAKER pattern tables
+    
+    All patterns are folded into one alternation of named groups, so the
+    first matching pattern (in table order) is found with a single regex
+    call instead of one ``re.match`` per pattern.
+    """
+    
+    def __init__(self, patterns: Dict[str, str]):
+        self.group_names: Dict[str, str] = {}
+        alternatives = []
+        for index, (pattern_name, pattern_regex) in enumerate(patterns.items()):
+            group = f"p{index}"
+            self.group_names[group] = pattern_name
+            alternatives.append(f"(?P<{group}>{pattern_regex})")
+        self.pattern_regex = re.compile('|'.join(alternatives)) if alternatives else None
+        self.risk_regex = re.compile('|'.join(re.escape(k) for k in RISK_KEYWORDS))
+        self.metadata_types = list(METADATA_TYPES)
+    
+    def classify(self, identifier: str) -> Tuple[Optional[str], str, Optional[str]]:
+        """Return (pattern_type, risk_level, metadata_type) for an identifier
+        
+        ``pattern_type`` and ``metadata_type`` are None when nothing matches.
+        """
+        match = self.pattern_regex.match(identifier) if self.pattern_regex else None
+        
+        if match is None:
+            pattern_type = None
+            risk_level = 'unknown'
+        else:
+            pattern_type = self.group_names[match.lastgroup]
+            risk_level = 'medium' if self.risk_regex.search(identifier.upper()) else 'low'
+        
+        metadata_type = None
+        for marker, label in self.metadata_types:
+            if marker in identifier:
+                metadata_type = label
+                break
+        
+        return pattern_type, risk_level, metadata_type
+
+
+class ScanStateStore:
+    """SQLite cache of analyses keyed by identifier hash, source and analyzer version
+    
+    Call load_current() with the identifier records of this run first; the
+    records go into a temporary table so lookup() and sync() are single
+    indexed joins instead of per-identifier queries. An identifier listed
+    under two sources keeps an analysis for each, as in a full scan.
+    """
+    
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute(f"PRAGMA cache_size=-{STATE_CACHE_KIB}")
+        # State files from before source joined the key are rebuilt on this run
+        key = [row[1] for row in self.conn.execute("PRAGMA table_info(analyses)") if row[5]]
+        if key and 'source' not in key:
+            self.conn.execute("DROP TABLE analyses")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                identifier_hash TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                source TEXT NOT NULL,
+                analyzer_version TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                PRIMARY KEY (identifier_hash, source)
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS current (
+                identifier_hash TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                source TEXT NOT NULL,
+                PRIMARY KEY (identifier_hash, source)
+            ) WITHOUT ROWID
+        """)
+    
+    @staticmethod
+    def identifier_hash(identifier: str) -> str:
+        """Stable key for an identifier"""
+        return hashlib.sha256(identifier.encode()).hexdigest()
+    
+    def load_current(self, items: List[Dict[str, Any]]) -> None:
+        """Register the identifier records of the current run"""
+        identifier_hash = self.identifier_hash
+        with self.conn:
+            self.conn.execute("DELETE FROM current")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO current VALUES (?, ?, ?)",
+                ((identifier_hash(item['identifier']), item['identifier'], item.get('source', 'Unknown'))
+                 for item in items)
+            )
+    
+    def lookup(self, version: str) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], Set[Tuple[str, str]]]:
+        """Return (cached analyses, records known to the store) for the current run
+        
+        Both are keyed by (identifier, source). An analysis is only cached
+        when it was produced by ``version``; any other stored record is
+        merely known.
+        """
+        known: Set[Tuple[str, str]] = set()
+        cached_keys = []
+        cached_blobs = []
+        
+        rows = self.conn.execute("""
+            SELECT c.identifier, c.source, a.analyzer_version = ?, a.analysis
+            FROM current c JOIN analyses a
+              ON a.identifier_hash = c.identifier_hash AND a.source = c.source
+        """, (version,))
+        for identifier, source, reusable, analysis in rows:
+            known.add((identifier, source))
+            if reusable:
+                cached_keys.append((identifier, source))
+                cached_blobs.append(analysis)
+        
+        # Decode all cached analyses with one parser call
+        analyses = json.loads('[' + ','.join(cached_blobs) + ']')
+        return dict(zip(cached_keys, analyses)), known
+    
+    def sync(self, analyses: List[Dict[str, Any]], version: str) -> List[str]:
+        """Store fresh analyses and drop records missing from the current run
+        
+        Returns the identifiers of the removed records.
+        """
+        identifier_hash = self.identifier_hash
+        missing = ("NOT EXISTS (SELECT 1 FROM current c "
+                   "WHERE c.identifier_hash = analyses.identifier_hash AND c.source = analyses.source)")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                ((identifier_hash(a['identifier']), a['identifier'], a.get('source', 'Unknown'),
+                  version, json.dumps(a)) for a in analyses)
+            )
+            removed = [row[0] for row in self.conn.execute(f"SELECT identifier FROM analyses WHERE {missing}")]
+            self.conn.execute(f"DELETE FROM analyses WHERE {missing}")
+        
+        return removed
+    
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ColumnarResults(Sequence):
+    """Compact column store for analyses, read back as lazy dict views
+    
+    Identifiers live in one UTF-8 blob with an offsets array, and every other
+    field is an interned category code in an ``array``. All views share the
+    scan-level timestamp instead of carrying one string per identifier.
+    """
+    
+    # Categorical analysis fields, in the key order of an analysis dict
+    COLUMNS = ['pattern_type', 'format_valid', 'confidence_score', 'risk_level',
+               'metadata_type', 'source']
+    MAGIC = b'SBCOL1\n'
+    
+    def __init__(self, scan_timestamp: Optional[str] = None):
+        self.scan_timestamp = scan_timestamp
+        self.identifier_bytes = bytearray()
+        self.identifier_offsets = array('I', [0])
+        self.categories: Dict[str, List[Any]] = {name: [] for name in self.COLUMNS}
+        self.codes: Dict[str, array] = {name: array('B') for name in self.COLUMNS}
+        self._lookup: Dict[str, Dict[Any, int]] = {name: {} for name in self.COLUMNS}
+    
+    def _code(self, column: str, value: Any) -> int:
+        """Intern value in column and return its code"""
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.categories[column])
+            self.categories[column].append(value)
+            lookup[value] = code
+            # Widen the code array once a column outgrows its code width
+            if code == 0x100 or code == 0x10000:
+                self.codes[column] = array('H' if code == 0x100 else 'I', self.codes[column])
+        return code
+    
+    def _add_offset(self, offset: int) -> None:
+        """Append an identifier end offset, widening past 4 GiB of identifier text"""
+        if offset > 0xFFFFFFFF and self.identifier_offsets.typecode == 'I':
+            self.identifier_offsets = array('Q', self.identifier_offsets)
+        self.identifier_offsets.append(offset)
+    
+    def append(self, analysis: Dict[str, Any]) -> None:
+        """Store one analysis dict; its per-identifier timestamp is dropped"""
+        self.identifier_bytes += analysis['identifier'].encode()
+        self._add_offset(len(self.identifier_bytes))
+        values = (
+            analysis['pattern_type'],
+            analysis['format_valid'],
+            analysis['confidence_score'],
+            analysis['risk_level'],
+            analysis['metadata'].get('type'),
+            analysis.get('source', 'Unknown')
+        )
+        for column, value in zip(self.COLUMNS, values):
+            # Intern first: interning may widen the column's code array
+            code = self._code(column, value)
+            self.codes[column].append(code)
+    
+    def extend(self, analyses: Iterable[Dict[str, Any]]) -> None:
+        """Append analyses, merging category tables when given another ColumnarResults"""
+        if not isinstance(analyses, ColumnarResults):
+            for analysis in analyses:
+                self.append(analysis)
+            return
+        
+        base = len(self.identifier_bytes)
+        self.identifier_bytes += analyses.identifier_bytes
+        for offset in analyses.identifier_offsets[1:]:
+            self._add_offset(base + offset)
+        for column in self.COLUMNS:
+            remap = [self._code(column, value) for value in analyses.categories[column]]
+            self.codes[column].extend(remap[c] for c in analyses.codes[column])
+    
+    def __len__(self) -> int:
+        return len(self.identifier_offsets) - 1
+    
+    def identifier(self, index: int) -> str:
+        """Decode the identifier at index"""
+        start, end = self.identifier_offsets[index], self.identifier_offsets[index + 1]
+        return self.identifier_bytes[start:end].decode()
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ColumnarResults index out of range")
+        
+        value = {column: self.categories[column][self.codes[column][index]] for column in self.COLUMNS}
+        metadata_type = value['metadata_type']
+        return {
+            'identifier': self.identifier(index),
+            'pattern_type': value['pattern_type'],
+            'format_valid': value['format_valid'],
+            'confidence_score': value['confidence_score'],
+            'risk_level': value['risk_level'],
+            'metadata': {} if metadata_type is None else {'type': metadata_type},
+            'timestamp': self.scan_timestamp,
+            'source': value['source']
+        }
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, excluding category tables"""
+        return (len(self.identifier_bytes)
+                + self.identifier_offsets.itemsize * len(self.identifier_offsets)
+                + sum(codes.itemsize * len(codes) for codes in self.codes.values()))
+    
+    def save(self, path: str) -> str:
+        """Write the columns to a compact binary file"""
+        columns = [('identifier_offsets', self.identifier_offsets)]
+        columns += [(name, self.codes[name]) for name in self.COLUMNS]
+        header = {
+            'scan_timestamp': self.scan_timestamp,
+            'count': len(self),
+            'byteorder': sys.byteorder,
+            'identifier_bytes': len(self.identifier_bytes),
+            'categories': self.categories,
+            'columns': [
+                {'name': name, 'typecode': codes.typecode, 'nbytes': codes.itemsize * len(codes)}
+                for name, codes in columns
+            ]
+        }
+        header_bytes = json.dumps(header).encode()
+        
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(len(header_bytes).to_bytes(8, 'little'))
+            f.write(header_bytes)
+            f.write(self.identifier_bytes)
+            for _, codes in columns:
+                codes.tofile(f)
+        return path
+    
+    @classmethod
+    def load(cls, path: str) -> 'ColumnarResults':
+        """Read a file written by save()"""
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a STORM-BREAKER columnar file")
+            header_length = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_length))
+            
+            results = cls(header['scan_timestamp'])
+            results.identifier_bytes = bytearray(f.read(header['identifier_bytes']))
+            for column in header['columns']:
+                codes = array(column['typecode'])
+                codes.frombytes(f.read(column['nbytes']))
+                if header['byteorder'] != sys.byteorder:
+                    codes.byteswap()
+                if column['name'] == 'identifier_offsets':
+                    results.identifier_offsets = codes
+                else:
+                    results.codes[column['name']] = codes
+        
+        for column, values in header['categories'].items():
+            results.categories[column] = values
+            results._lookup[column] = {value: code for code, value in enumerate(values)}
+        return results
+
+
+class OverlayWriter:
+    """Atomic overlay writer that skips overlays whose content hash is unchanged
+    
+    An overlay is only rewritten when the ``overlay_hash`` recorded in the
+    existing file differs from the new one; the target file is opened directly
+    so memory stays flat however many overlays a stream writes. Writes go to a
+    temporary file that replaces the overlay.
+    """
+    
+    def __init__(self, directory: str = "overlays"):
+        self.directory = Path(directory)
+        self.written = 0
+        self.skipped = 0
+        self._directory_ready = False
+        # mkstemp creates files 0600; overlays get the mode open(..., 'w') would give them
+        umask = os.umask(0)
+        os.umask(umask)
+        self._file_mode = 0o666 & ~umask
+    
+    def recorded_hash(self, filename: str) -> Optional[str]:
+        """Read the overlay_hash field from an existing overlay file"""
+        try:
+            with open(self.directory / filename, 'r') as f:
+                for line in f:
+                    if line.startswith('overlay_hash:'):
+                        return line.split(':', 1)[1].strip()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            pass
+        return None
+    
+    def write(self, filename: str, render: Callable[[], str], overlay_hash: str) -> bool:
+        """Write an overlay unless the file already records overlay_hash"""
+        if self.recorded_hash(filename) == overlay_hash:
+            self.skipped += 1
+            return False
+        
+        if not self._directory_ready:
+            self.directory.mkdir(exist_ok=True)
+            self._directory_ready = True
+        target = self.directory / filename
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{filename}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(render())
+            os.chmod(tmp_path, self._file_mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        self.written += 1
+        return True
+    
+    def reset_stats(self) -> None:
+        """Zero the written/skipped counters"""
+        self.written = 0
+        self.skipped = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the written/skipped counters"""
+        return {'written': self.written, 'skipped': self.skipped}
 
 
 class StormBreaker:
     """Advanced trust identifier scanning and analysis engine"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, columnar: bool = False):
         self.verbose = verbose
+        self.columnar = columnar
         self.identifiers: List[Dict[str, Any]] = []
         self.results: List[Dict[str, Any]] = []
         self.patterns = {
@@ -33,6 +521,10 @@ class StormBreaker:
             'birth_registry': r'^.+-BIRTH-REGISTRY-.+$',
             'property_record': r'^.+-DEED-DOC-.+$'
         }
+        self._classifier: Optional[IdentifierClassifier] = None
+        self._classifier_key: Optional[tuple] = None
+        self.overlay_writer = OverlayWriter()
+        self.delta: Dict[str, Any] = {}
     
     def log(self, message: str) -> None:
         """Log message if verbose mode is enabled"""
@@ -64,68 +556,61 @@ class StormBreaker:
             self.log(f"Error loading identifiers: {e}")
             return False
     
+    def analyzer_version(self) -> str:
+        """Fingerprint of everything that shapes an analysis
+        
+        Cached analyses are only reused when this matches, so editing the
+        pattern table or marker lists invalidates the incremental state.
+        """
+        fingerprint = json.dumps([
+            '1.0', list(self.patterns.items()), METADATA_TYPES, RISK_KEYWORDS
+        ])
+        return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+    
+    def classifier(self) -> 'IdentifierClassifier':
+        """Return the compiled classifier for the current pattern table"""
+        key = tuple(self.patterns.items())
+        if self._classifier is None or self._classifier_key != key:
+            self._classifier = IdentifierClassifier(self.patterns)
+            self._classifier_key = key
+        return self._classifier
+    
     def analyze_identifier(self, identifier: str) -> Dict[str, Any]:
         """Perform comprehensive analysis of a single identifier"""
-        analysis = {
-            'identifier': identifier,
-            'pattern_type': 'unknown',
-            'format_valid': False,
-            'confidence_score': 0.0,
-            'risk_level': 'unknown',
-            'metadata': {},
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        }
+        return self.analyze_many([identifier])[0]
+    
+    def analyze_many(self, identifiers: Iterable[str]) -> List[Dict[str, Any]]:
+        """Analyze a batch of identifiers with a single compiled classifier"""
+        classify = self.classifier().classify
+        analyses = []
         
-        # Pattern recognition
-        for pattern_name, pattern_regex in self.patterns.items():
-            if re.match(pattern_regex, identifier):
-                analysis['pattern_type'] = pattern_name
-                analysis['format_valid'] = True
-                analysis['confidence_score'] = 0.95
-                break
+        for identifier in identifiers:
+            pattern_type, risk_level, metadata_type = classify(identifier)
+            format_valid = pattern_type is not None
+            analyses.append({
+                'identifier': identifier,
+                'pattern_type': pattern_type if format_valid else 'unknown',
+                'format_valid': format_valid,
+                'confidence_score': 0.95 if format_valid else 0.0,
+                'risk_level': risk_level,
+                'metadata': {} if metadata_type is None else {'type': metadata_type},
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
         
-        # Risk assessment
-        if analysis['format_valid']:
-            if any(keyword in identifier.upper() for keyword in ['SSN', 'BIRTH', 'ADOT']):
-                analysis['risk_level'] = 'medium'
-            else:
-                analysis['risk_level'] = 'low'
-        else:
-            analysis['risk_level'] = 'unknown'
-        
-        # Extract metadata
-        if 'EIN-' in identifier:
-            analysis['metadata']['type'] = 'Employer Identification Number'
-        elif 'SSN-' in identifier:
-            analysis['metadata']['type'] = 'Social Security Number'
-        elif 'IRS-TRACK-' in identifier:
-            analysis['metadata']['type'] = 'IRS Tracking Number'
-        elif 'CSE-CASE-' in identifier:
-            analysis['metadata']['type'] = 'Child Support Enforcement Case'
-        elif 'ADOT-CUST-' in identifier:
-            analysis['metadata']['type'] = 'Arizona DOT Customer ID'
-        elif 'ADDR-' in identifier:
-            analysis['metadata']['type'] = 'Address Record'
-        elif 'ENTITY-' in identifier:
-            analysis['metadata']['type'] = 'Entity Name'
-        elif 'BIRTH-REGISTRY' in identifier:
-            analysis['metadata']['type'] = 'Birth Registry Record'
-        elif 'DEED-DOC' in identifier:
-            analysis['metadata']['type'] = 'Property Deed Document'
-        
-        return analysis
+        return analyses
     
-    def create_overlay(self, identifier: str, analysis: Dict[str, Any]) -> str:
-        """Create YAML overlay file for identifier"""
-        overlay_content = f"""# STORM-BREAKER Overlay for {identifier}
+    def render_overlay(self, identifier: str, analysis: Dict[str, Any],
+                       timestamp: str, overlay_hash: str) -> str:
+        """Render the YAML overlay text for identifier"""
+        return f"""# STORM-BREAKER Overlay for {identifier}
 identifier: {identifier}
 pattern_type: {analysis['pattern_type']}
 format_valid: {analysis['format_valid']}
 confidence_score: {analysis['confidence_score']}
 risk_level: {analysis['risk_level']}
-timestamp: {analysis['timestamp']}
+timestamp: {timestamp}
 storm_breaker_version: "1.0"
-overlay_hash: {hashlib.sha256(identifier.encode()).hexdigest()[:16]}
+overlay_hash: {overlay_hash}
 
 metadata:
   type: {analysis['metadata'].get('type', 'Unknown')}
@@ -137,75 +622,265 @@ technical_trace:
   analysis_engine: "pattern_recognition_v1.0"
   validation_rules: "format_compliance_check"
 """
-        return overlay_content
     
-    def save_overlay(self, identifier: str, analysis: Dict[str, Any]) -> None:
-        """Save overlay file for identifier"""
-        overlays_dir = Path("overlays")
-        overlays_dir.mkdir(exist_ok=True)
-        
+    def overlay_hash(self, identifier: str, analysis: Dict[str, Any]) -> str:
+        """Hash the overlay content with its volatile fields (timestamp, hash) blanked"""
+        stable_content = self.render_overlay(identifier, analysis, timestamp='', overlay_hash='')
+        return hashlib.sha256(stable_content.encode()).hexdigest()[:16]
+    
+    def create_overlay(self, identifier: str, analysis: Dict[str, Any]) -> str:
+        """Create YAML overlay file for identifier"""
+        return self.render_overlay(identifier, analysis, analysis['timestamp'],
+                                   self.overlay_hash(identifier, analysis))
+    
+    def save_overlay(self, identifier: str, analysis: Dict[str, Any]) -> bool:
+        """Save overlay file for identifier, skipping it when its content is unchanged"""
         # Generate safe filename
         safe_name = re.sub(r'[^\w\-_]', '_', identifier.lower())
-        overlay_file = overlays_dir / f"{safe_name}_storm_overlay.yml"
-        
-        overlay_content = self.create_overlay(identifier, analysis)
+        filename = f"{safe_name}_storm_overlay.yml"
         
-        with open(overlay_file, 'w') as f:
-            f.write(overlay_content)
+        overlay_hash = self.overlay_hash(identifier, analysis)
+        written = self.overlay_writer.write(
+            filename,
+            lambda: self.render_overlay(identifier, analysis, analysis['timestamp'], overlay_hash),
+            overlay_hash
+        )
         
-        self.log(f"Created overlay: {overlay_file}")
+        if written:
+            self.log(f"Created overlay: {self.overlay_writer.directory / filename}")
+        return written
     
-    def run_scan(self) -> Dict[str, Any]:
-        """Execute comprehensive identifier scan"""
-        self.log("Starting STORM-BREAKER scan...")
-        
-        if not self.load_identifiers():
-            self.log("Using fallback identifier data")
-        
-        scan_results = {
+    def new_summary(self) -> Dict[str, Any]:
+        """Create zeroed summary counters"""
+        return {
+            'valid_format': 0,
+            'invalid_format': 0,
+            'pattern_distribution': {},
+            'risk_levels': {}
+        }
+    
+    def new_scan_results(self, total_identifiers: int = 0) -> Dict[str, Any]:
+        """Create an empty scan result document with zeroed summary counters"""
+        return {
             'scan_timestamp': datetime.now(timezone.utc).isoformat(),
             'storm_breaker_version': '1.0',
-            'total_identifiers': len(self.identifiers),
+            'total_identifiers': total_identifiers,
             'identifiers_analyzed': [],
-            'summary': {
-                'valid_format': 0,
-                'invalid_format': 0,
-                'pattern_distribution': {},
-                'risk_levels': {}
-            }
+            'summary': self.new_summary()
         }
+    
+    def update_summary(self, summary: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        """Fold one analysis into the summary counters"""
+        if analysis['format_valid']:
+            summary['valid_format'] += 1
+        else:
+            summary['invalid_format'] += 1
         
-        for item in self.identifiers:
-            identifier = item['identifier']
-            self.log(f"Analyzing: {identifier}")
-            
-            analysis = self.analyze_identifier(identifier)
-            analysis['source'] = item.get('source', 'Unknown')
+        # Pattern distribution
+        pattern = analysis['pattern_type']
+        summary['pattern_distribution'][pattern] = \
+            summary['pattern_distribution'].get(pattern, 0) + 1
+        
+        # Risk level distribution
+        risk = analysis['risk_level']
+        summary['risk_levels'][risk] = summary['risk_levels'].get(risk, 0) + 1
+    
+    def merge_summaries(self, summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge partial summaries in order
+        
+        Distribution keys keep first-seen order, so merging shard summaries in
+        shard order gives the same summary as a serial scan.
+        """
+        merged = self.new_summary()
+        for summary in summaries:
+            merged['valid_format'] += summary['valid_format']
+            merged['invalid_format'] += summary['invalid_format']
+            for key in ('pattern_distribution', 'risk_levels'):
+                for name, count in summary[key].items():
+                    merged[key][name] = merged[key].get(name, 0) + count
+        return merged
+    
+    def new_analyses(self) -> List[Dict[str, Any]]:
+        """Create the container analyses are collected in (a list or ColumnarResults)"""
+        if self.columnar:
+            return ColumnarResults(datetime.now(timezone.utc).isoformat())
+        return []
+    
+    def scan_items(self, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Analyze identifier records, write their overlays and summarize them"""
+        summary = self.new_summary()
+        analyses = self.new_analyses()
+        
+        # Classify in batches so columnar scans never hold every analysis dict at once
+        for start in range(0, len(items), ANALYZE_BATCH_SIZE):
+            batch = items[start:start + ANALYZE_BATCH_SIZE]
+            batch_analyses = self.analyze_many(item['identifier'] for item in batch)
             
-            scan_results['identifiers_analyzed'].append(analysis)
+            for item, analysis in zip(batch, batch_analyses):
+                identifier = item['identifier']
+                self.log(f"Analyzing: {identifier}")
+                
+                analysis['source'] = item.get('source', 'Unknown')
+                analyses.append(analysis)
+                
+                # Update summary statistics
+                self.update_summary(summary, analysis)
+                
+                # Create overlay file
+                self.save_overlay(identifier, analysis)
+        
+        return analyses, summary
+    
+    def scan_sharded(self, items: List[Dict[str, Any]], workers: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Scan identifier records across a process pool
+        
+        Records are split into contiguous shards; shard results are collected
+        in submission order, so analyses and summary match a serial scan.
+        """
+        shard_count = min(len(items), workers * SHARDS_PER_WORKER)
+        shard_size = -(-len(items) // shard_count)
+        shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+        self.log(f"Scanning {len(items)} identifiers in {len(shards)} shards on {workers} workers")
+        
+        analyses = self.new_analyses()
+        summaries = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                                 initargs=(dict(self.patterns), self.verbose, self.columnar)) as executor:
+            for shard_analyses, shard_summary, shard_writes in executor.map(_scan_shard, shards):
+                analyses.extend(shard_analyses)
+                summaries.append(shard_summary)
+                self.overlay_writer.written += shard_writes['written']
+                self.overlay_writer.skipped += shard_writes['skipped']
+        
+        return analyses, self.merge_summaries(summaries)
+    
+    def scan_incremental(self, items: List[Dict[str, Any]], state_path: str,
+                         workers: int = 1) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Scan only new or changed identifier records, reusing cached analyses
+        
+        Analyses are cached in a ScanStateStore keyed by identifier hash,
+        source and analyzer version. Cached analyses still pass through the
+        OverlayWriter, so a missing or altered overlay file is written again.
+        The added/changed/removed records are kept in ``self.delta`` for
+        save_delta().
+        """
+        version = self.analyzer_version()
+        store = ScanStateStore(state_path)
+        try:
+            store.load_current(items)
+            cached, known = store.lookup(version)
+            pending = [item for item in items
+                       if (item['identifier'], item.get('source', 'Unknown')) not in cached]
+            self.log(f"Reusing {len(items) - len(pending)} cached analyses, "
+                     f"analyzing {len(pending)} new or changed identifiers")
             
-            # Update summary statistics
-            if analysis['format_valid']:
-                scan_results['summary']['valid_format'] += 1
+            if workers > 1 and len(pending) > 1:
+                fresh, _ = self.scan_sharded(pending, workers)
             else:
-                scan_results['summary']['invalid_format'] += 1
-            
-            # Pattern distribution
-            pattern = analysis['pattern_type']
-            scan_results['summary']['pattern_distribution'][pattern] = \
-                scan_results['summary']['pattern_distribution'].get(pattern, 0) + 1
+                fresh, _ = self.scan_items(pending)
             
-            # Risk level distribution
-            risk = analysis['risk_level']
-            scan_results['summary']['risk_levels'][risk] = \
-                scan_results['summary']['risk_levels'].get(risk, 0) + 1
-            
-            # Create overlay file
-            self.save_overlay(identifier, analysis)
+            removed = store.sync(fresh, version)
+        finally:
+            store.close()
+        
+        fresh_by_key = {(analysis['identifier'], analysis['source']): analysis for analysis in fresh}
+        analyses = self.new_analyses()
+        summary = self.new_summary()
+        for item in items:
+            key = (item['identifier'], item.get('source', 'Unknown'))
+            analysis = cached.get(key)
+            if analysis is None:
+                analysis = fresh_by_key[key]
+            else:
+                # Rewrites an overlay deleted or edited on disk; unchanged ones are skipped
+                self.save_overlay(item['identifier'], analysis)
+            analyses.append(analysis)
+            self.update_summary(summary, analysis)
+        
+        self.delta = {
+            'scan_timestamp': datetime.now(timezone.utc).isoformat(),
+            'storm_breaker_version': '1.0',
+            'analyzer_version': version,
+            'added': [a for a in fresh if (a['identifier'], a['source']) not in known],
+            'changed': [a for a in fresh if (a['identifier'], a['source']) in known],
+            'removed': removed,
+            'unchanged': len(items) - len(pending),
+            'summary': summary
+        }
+        return analyses, summary
+    
+    def run_scan(self, file_path: str = "identifiers.json", workers: int = 1,
+                 state_path: Optional[str] = None) -> Dict[str, Any]:
+        """Execute comprehensive identifier scan"""
+        self.log("Starting STORM-BREAKER scan...")
+        
+        if not self.load_identifiers(file_path):
+            self.log("Using fallback identifier data")
+        
+        scan_results = self.new_scan_results(len(self.identifiers))
+        self.overlay_writer.reset_stats()
+        
+        if state_path:
+            analyses, summary = self.scan_incremental(self.identifiers, state_path, workers)
+            scan_results['incremental'] = {
+                'state_file': state_path,
+                'analyzer_version': self.delta['analyzer_version'],
+                'added': len(self.delta['added']),
+                'changed': len(self.delta['changed']),
+                'removed': len(self.delta['removed']),
+                'unchanged': self.delta['unchanged']
+            }
+        elif workers > 1 and len(self.identifiers) > 1:
+            analyses, summary = self.scan_sharded(self.identifiers, workers)
+        else:
+            analyses, summary = self.scan_items(self.identifiers)
+        
+        if isinstance(analyses, ColumnarResults):
+            analyses.scan_timestamp = scan_results['scan_timestamp']
+        scan_results['identifiers_analyzed'] = analyses
+        scan_results['summary'] = summary
+        scan_results['overlay_writes'] = self.overlay_writer.stats()
         
         self.results = scan_results
         return scan_results
     
+    def run_stream_scan(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        """Scan identifiers from a file and write analyses as NDJSON while reading
+        
+        Only the summary counters are kept in memory, so peak memory does not
+        grow with the number of identifiers. The returned scan results carry an
+        empty ``identifiers_analyzed`` list; the analyses live in ``output_path``.
+        """
+        self.log(f"Starting STORM-BREAKER streaming scan of {input_path}...")
+        
+        scan_results = self.new_scan_results()
+        scan_results['results_file'] = output_path
+        summary = scan_results['summary']
+        self.overlay_writer.reset_stats()
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as out:
+            for item in iter_identifiers(input_path):
+                identifier = item['identifier']
+                self.log(f"Analyzing: {identifier}")
+                
+                analysis = self.analyze_identifier(identifier)
+                analysis['source'] = item.get('source', 'Unknown')
+                
+                out.write(json.dumps(analysis))
+                out.write('\n')
+                
+                scan_results['total_identifiers'] += 1
+                self.update_summary(summary, analysis)
+                
+                # Create overlay file
+                self.save_overlay(identifier, analysis)
+        
+        scan_results['overlay_writes'] = self.overlay_writer.stats()
+        self.log(f"Streamed {scan_results['total_identifiers']} analyses to: {output_path}")
+        self.results = scan_results
+        return scan_results
+    
     def save_results(self, filename: Optional[str] = None) -> str:
         """Save scan results to JSON file"""
         if not filename:
@@ -217,12 +892,44 @@ technical_trace:
         
         output_file = output_dir / filename
         
-        with open(output_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        analyses = self.results.get('identifiers_analyzed')
+        if isinstance(analyses, ColumnarResults):
+            # Columnar scans are written view by view and also kept in binary form
+            with open(output_file, 'w') as f:
+                write_json_lazily(f, self.results, 'identifiers_analyzed')
+            columnar_file = analyses.save(str(output_file.with_suffix('.sbcol')))
+            self.log(f"Columnar results saved to: {columnar_file}")
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(self.results, f, indent=2)
         
         self.log(f"Results saved to: {output_file}")
         return str(output_file)
     
+    def save_delta(self, filename: Optional[str] = None) -> Optional[str]:
+        """Save the added/changed/removed analyses of an incremental scan
+        
+        Nothing is written when the scan found no changes.
+        """
+        if not self.delta or not (self.delta['added'] or self.delta['changed'] or self.delta['removed']):
+            self.log("No identifier changes since the last scan, delta not written")
+            return None
+        
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"storm_breaker_delta_{timestamp}.json"
+        
+        output_dir = Path("output")
+        output_dir.mkdir(exist_ok=True)
+        
+        output_file = output_dir / filename
+        
+        with open(output_file, 'w') as f:
+            json.dump(self.delta, f, indent=2)
+        
+        self.log(f"Delta saved to: {output_file}")
+        return str(output_file)
+    
     def print_summary(self) -> None:
         """Print scan summary report"""
         if not self.results:
@@ -235,7 +942,9 @@ technical_trace:
         print("\nSTORM-BREAKER SCAN REPORT")
         print("=" * 25)
         print(f"Total Identifiers: {total}")
-        print(f"Valid Format: {summary['valid_format']}/{total} ({summary['valid_format']/total*100:.1f}%)")
+        # An empty or all-blank stream scans no identifiers
+        valid_percent = summary['valid_format'] / total * 100 if total else 0.0
+        print(f"Valid Format: {summary['valid_format']}/{total} ({valid_percent:.1f}%)")
         
         print("\nPATTERN ANALYSIS:")
         for pattern, count in summary['pattern_distribution'].items():
@@ -245,9 +954,62 @@ technical_trace:
         for risk, count in summary['risk_levels'].items():
             print(f"  {risk}: {count}")
         
+        overlay_writes = self.results.get('overlay_writes')
+        if overlay_writes:
+            print("\nOVERLAY FILES:")
+            print(f"  written: {overlay_writes['written']}")
+            print(f"  unchanged (skipped): {overlay_writes['skipped']}")
+        
+        incremental = self.results.get('incremental')
+        if incremental:
+            print("\nINCREMENTAL STATE:")
+            for key in ('added', 'changed', 'removed', 'unchanged'):
+                print(f"  {key}: {incremental[key]}")
+        
         print(f"\nScan completed: {self.results['scan_timestamp']}")
 
 
+def write_json_lazily(f, document: Dict[str, Any], sequence_key: str) -> None:
+    """json.dump(document, f, indent=2) without materializing document[sequence_key]
+    
+    The sequence is encoded one element at a time, producing the same text
+    as json.dump would for an equivalent list.
+    """
+    placeholder = dict(document)
+    placeholder[sequence_key] = []
+    marker = json.dumps(sequence_key) + ': []'
+    head, tail = json.dumps(placeholder, indent=2).split(marker, 1)
+    indent = head[head.rindex('\n') + 1:] + '  '
+    
+    f.write(head)
+    f.write(json.dumps(sequence_key) + ': [')
+    count = 0
+    for element in document[sequence_key]:
+        f.write(',\n' if count else '\n')
+        f.write(indent + json.dumps(element, indent=2).replace('\n', '\n' + indent))
+        count += 1
+    f.write('\n' + indent[:-2] + ']' if count else ']')
+    f.write(tail)
+
+
+# Per-process scanner used by StormBreaker.scan_sharded workers
+_shard_breaker: Optional[StormBreaker] = None
+
+
+def _init_shard_worker(patterns: Dict[str, str], verbose: bool, columnar: bool) -> None:
+    """Build the scanner once per worker process"""
+    global _shard_breaker
+    _shard_breaker = StormBreaker(verbose=verbose, columnar=columnar)
+    _shard_breaker.patterns = patterns
+
+
+def _scan_shard(items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, int]]:
+    """Scan one shard of identifier records in a worker process"""
+    _shard_breaker.overlay_writer.reset_stats()
+    analyses, summary = _shard_breaker.scan_items(items)
+    return analyses, summary, _shard_breaker.overlay_writer.stats()
+
+
 def main():
     """Main entry point for STORM-BREAKER"""
     parser = argparse.ArgumentParser(
@@ -258,6 +1020,10 @@ Examples:
   python storm_breaker.py                    # Basic scan
   python storm_breaker.py -v                # Verbose output
   python storm_breaker.py -v -o my_scan.json # Custom output file
+  python storm_breaker.py --stream -i identifiers.ndjson  # Streaming NDJSON scan
+  python storm_breaker.py --workers 4        # Sharded scan on 4 processes
+  python storm_breaker.py --incremental      # Only analyze new/changed identifiers
+  python storm_breaker.py --columnar         # Compact in-memory results + .sbcol file
         """
     )
     
@@ -265,26 +1031,55 @@ Examples:
                        help='Enable verbose output')
     parser.add_argument('-o', '--output', type=str,
                        help='Output filename for results')
+    parser.add_argument('-i', '--input', type=str, default='identifiers.json',
+                       help='Identifier file (JSON array or NDJSON)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream identifiers from --input and write analyses as NDJSON')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for sharded scanning')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Reuse cached analyses from --state and save a delta file')
+    parser.add_argument('--state', type=str, default=DEFAULT_STATE_PATH,
+                       help='Incremental scan state database')
+    parser.add_argument('--columnar', action='store_true',
+                       help='Keep results in columnar form and also save them as a .sbcol file')
     
     args = parser.parse_args()
+    if args.workers > 1 and args.stream:
+        parser.error("--workers cannot be combined with --stream")
+    if args.incremental and args.stream:
+        parser.error("--incremental cannot be combined with --stream")
     
     # Create and run STORM-BREAKER
-    storm_breaker = StormBreaker(verbose=args.verbose)
+    storm_breaker = StormBreaker(verbose=args.verbose, columnar=args.columnar)
     
     try:
         print("🌪️  STORM-BREAKER: Advanced Trust Identifier Analysis")
         print("=" * 50)
         
-        # Run comprehensive scan
-        results = storm_breaker.run_scan()
-        
-        # Save results
-        output_file = storm_breaker.save_results(args.output)
+        if args.stream:
+            # Stream analyses straight to NDJSON; only the summary stays in memory
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_name = args.output or f"storm_breaker_results_{timestamp}.ndjson"
+            output_file = str(Path("output") / output_name)
+            storm_breaker.run_stream_scan(args.input, output_file)
+            storm_breaker.save_results(f"{Path(output_name).stem}_summary.json")
+        elif args.incremental:
+            # Analyze only what changed and save a delta instead of a full copy
+            storm_breaker.run_scan(args.input, workers=args.workers, state_path=args.state)
+            output_file = storm_breaker.save_delta(args.output) or "(no changes, nothing written)"
+        else:
+            # Run comprehensive scan
+            results = storm_breaker.run_scan(args.input, workers=args.workers)
+            
+            # Save results
+            output_file = storm_breaker.save_results(args.output)
         
         # Print summary
         storm_breaker.print_summary()
         
-        print(f"\n📄 Full results saved to: {output_file}")
+        label = "Delta" if args.incremental else "Full results"
+        print(f"\n📄 {label} saved to: {output_file}")
         print("✅ STORM-BREAKER scan completed successfully")
         
     except KeyboardInterrupt:
@@ -4,6 +4,8 @@ import requests
 from datetime import datetime, timezone
 from pathlib import Path
 from reddit_trace import query_reddit_threads
+from response_cache import default_cache
+from http_client import default_client
 
 BASE_URL = "https://raw.githubusercontent.com/lawfullyillegal-droid/Trust-identifier-trace/main/overlays/"
 IDENTIFIERS_FILE = Path(__file__).parent / "identifiers.json"
@@ -60,5 +62,9 @@ def run_scan():
     with open(OUTPUT_FILE, "w") as f:
         json.dump(results, f, indent=2)
 
+    print(f"🗄️ Response cache: {default_cache().summary()}")
+    print(f"🌐 HTTP client: {default_client().summary()}")
+    print(f"🩺 Host health: {default_client().health.summary()}")
+
 if __name__ == "__main__":
     run_scan()